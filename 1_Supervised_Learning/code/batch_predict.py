@@ -0,0 +1,202 @@
+# -------------------------------------------------------
+# STREAMING BATCH PREDICTION
+# -------------------------------------------------------
+# Scores a passenger file (CSV or Parquet) of any size with a
+# ModelBundle persisted by classification.py or main.py:
+#   1. The file is read chunk by chunk (only the columns the model
+#      features need, plus PassengerId)
+#   2. Chunks are preprocessed with the bundle's frozen feature
+#      engine and scored in a process pool; every worker loads
+#      the bundle once at start-up
+#   3. Predictions are written as a stream, in input order, to
+#      CSV or Parquet (chosen by the output file extension)
+#
+# Only a bounded number of chunks is in flight at any time, so
+# memory stays flat however large the input is. Tree bundles can
+# also write per-passenger feature attributions (--explain).
+#
+# How to run (after classification.py):
+#   python batch_predict.py --bundle ../results/models/RandomForestClassifier.joblib \
+#       --input passengers.csv --output ../results/batch_predictions.csv --workers 4
+# -------------------------------------------------------
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from features import required_columns
+from model_bundle import ModelBundle
+from utils import TITANIC_DTYPES
+
+ID_COLUMN = "PassengerId"
+
+# -------------------------------------------------------
+# INPUT & OUTPUT
+# -------------------------------------------------------
+
+def is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+def read_chunks(input_path, columns, chunksize):
+    """
+    Yields the requested columns of a CSV or Parquet file in chunks of `chunksize` rows.
+    PassengerId is read too when the file has it.
+    """
+    if is_parquet(input_path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(input_path)
+        if ID_COLUMN in parquet_file.schema_arrow.names:
+            columns = [ID_COLUMN] + columns
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        if ID_COLUMN in pd.read_csv(input_path, nrows=0).columns:
+            columns = [ID_COLUMN] + columns
+        yield from pd.read_csv(input_path, usecols=columns, dtype=TITANIC_DTYPES, chunksize=chunksize)
+
+
+class PredictionWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file (by extension), in the order they are written.
+    """
+
+    def __init__(self, output_path):
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self.output_path = output_path
+        self._parquet_writer = None
+        self._csv_file = None
+
+    def write(self, df):
+        if is_parquet(self.output_path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            header = self._csv_file is None
+            if header:
+                self._csv_file = open(self.output_path, "w", newline="")
+            df.to_csv(self._csv_file, header=header, index=False)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._csv_file is not None:
+            self._csv_file.close()
+
+# -------------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------------
+
+# Bundle of the current process, loaded once by _init_worker
+_bundle = None
+
+def _init_worker(bundle_path):
+    global _bundle
+    _bundle = ModelBundle.load(bundle_path)
+
+def _score_chunk(chunk, explain):
+    """Preprocesses and scores one chunk of raw passengers with the process's bundle."""
+    y_pred, y_proba = _bundle.predict(chunk)
+
+    scored = {}
+    if ID_COLUMN in chunk.columns:
+        scored[ID_COLUMN] = chunk[ID_COLUMN].to_numpy()
+    scored["PredictedSurvived"] = y_pred
+    if y_proba is not None:
+        scored["ProbabilitySurvived"] = y_proba
+    if explain:
+        base_value, attributions = _bundle.explain(chunk)
+        scored["BaseValue"] = base_value
+        for j, feature in enumerate(_bundle.features):
+            scored[f"Attribution_{feature}"] = attributions[:, j]
+    return pd.DataFrame(scored)
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+def predict_file(bundle_path, input_path, output_path, chunksize=100_000, workers=None, explain=False):
+    """
+    Scores a passenger file chunk by chunk and streams the predictions to output_path.
+
+    Parameters:
+    - bundle_path (str): ModelBundle saved with ModelBundle.save().
+    - input_path (str): Passenger CSV or Parquet file (titanic.csv columns; Survived is not needed).
+    - output_path (str): Prediction file; .parquet/.pq writes Parquet, anything else CSV.
+    - chunksize (int): Passengers per chunk.
+    - workers (int, optional): Scoring processes (default: CPU count; 1 scores in-process).
+    - explain (bool): Also write per-feature attributions (tree bundles only).
+
+    Returns:
+    - int: Number of scored passengers.
+
+    Raises:
+    - ValueError: With explain=True for a bundle without a tree model.
+    """
+    workers = workers or os.cpu_count() or 1
+    bundle = ModelBundle.load(bundle_path)
+    # Fail before any worker starts or the output file is created
+    if explain and bundle.flat_model is None:
+        raise ValueError(f"--explain needs a tree model bundle; {bundle.model_name} in {bundle_path} is not a tree model.")
+    features = bundle.features
+    del bundle
+    chunks = read_chunks(input_path, required_columns(features), chunksize)
+    writer = PredictionWriter(output_path)
+    n_rows = 0
+
+    try:
+        if workers == 1:
+            _init_worker(bundle_path)
+            for chunk in chunks:
+                scored = _score_chunk(chunk, explain)
+                writer.write(scored)
+                n_rows += len(scored)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(bundle_path,)) as pool:
+                # Chunks are written strictly in submission order; at most 2 per worker are in flight
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_score_chunk, chunk, explain))
+                    if len(pending) >= 2 * workers:
+                        scored = pending.popleft().result()
+                        writer.write(scored)
+                        n_rows += len(scored)
+                while pending:
+                    scored = pending.popleft().result()
+                    writer.write(scored)
+                    n_rows += len(scored)
+    finally:
+        writer.close()
+    return n_rows
+
+# -------------------------------------------------------
+# EXECUTION
+# -------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a passenger CSV/Parquet file with a persisted model bundle.")
+    parser.add_argument("--bundle", required=True, help="Path to a ModelBundle .joblib file.")
+    parser.add_argument("--input", required=True, help="Passenger CSV or Parquet file.")
+    parser.add_argument("--output", required=True, help="Prediction file (.csv, or .parquet for Parquet).")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Passengers per scored chunk.")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: CPU count).")
+    parser.add_argument("--explain", action="store_true",
+                        help="Also write per-feature attributions (Decision Tree / Random Forest bundles).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_rows = predict_file(args.bundle, args.input, args.output, chunksize=args.chunksize,
+                          workers=args.workers, explain=args.explain)
+    seconds = time.perf_counter() - start
+    print(f"✅ Scored {n_rows:,} passengers in {seconds:.1f}s ({n_rows / seconds:,.0f} rows/s)")
+    print(f"📂 Predictions saved at: {args.output}")
@@ -0,0 +1,79 @@
+# -------------------------------------------------------
+# FEATURE ENGINE BENCHMARK
+# -------------------------------------------------------
+# Measures preprocessing throughput on a synthetic passenger
+# table (10M rows by default, see synthetic_data.py) and compares:
+#   1. Legacy preprocessing – statistics re-computed on every call
+#   2. TitanicFeatureEngine – fit once, transform many batches
+#
+# How to run:
+#   python benchmark_features.py --rows 10000000 --batches 5
+# -------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURES, TARGET, TitanicFeatureEngine
+from synthetic_data import make_passengers
+
+# -------------------------------------------------------
+# PREPROCESSING VARIANTS
+# -------------------------------------------------------
+
+def legacy_preprocess(df):
+    """Previous per-call preprocessing: re-computes median/mode and re-encodes on every call."""
+    df = df.copy()
+    df["Age"] = df["Age"].fillna(df["Age"].median())
+    df["Embarked"] = df["Embarked"].fillna(df["Embarked"].mode()[0])
+    df = df.drop(columns=["Cabin"], errors="ignore")
+    df["FamilySize"] = df["SibSp"] + df["Parch"] + 1
+    df["Sex"] = df["Sex"].map({"male": 0, "female": 1})
+    df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)
+    return df[FEATURES + [TARGET]]
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+# -------------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------------
+
+def run_benchmark(n_rows, n_batches):
+    print(f"\n🔄 Generating synthetic passenger table ({n_rows:,} rows)...")
+    df, gen_seconds = time_call(make_passengers, n_rows, include_text=False)
+    print(f"✅ Generated in {gen_seconds:.2f}s")
+
+    # Legacy path: every batch pays for re-fitting the statistics
+    legacy_seconds = 0.0
+    for _ in range(n_batches):
+        _, seconds = time_call(legacy_preprocess, df)
+        legacy_seconds += seconds
+
+    # Engine path: fit once, then transform every batch with the frozen statistics
+    engine, fit_seconds = time_call(TitanicFeatureEngine().fit, df)
+    transform_seconds = 0.0
+    for _ in range(n_batches):
+        _, seconds = time_call(engine.transform, df, columns=FEATURES + [TARGET])
+        transform_seconds += seconds
+    engine_seconds = fit_seconds + transform_seconds
+
+    total_rows = n_rows * n_batches
+    print("\n📊 Preprocessing Throughput:")
+    print(f"Legacy preprocessing : {legacy_seconds:8.2f}s  ({total_rows / legacy_seconds:,.0f} rows/s)")
+    print(f"Engine fit (once)    : {fit_seconds:8.2f}s")
+    print(f"Engine transform     : {transform_seconds:8.2f}s  ({total_rows / transform_seconds:,.0f} rows/s)")
+    print(f"Engine total         : {engine_seconds:8.2f}s  ({total_rows / engine_seconds:,.0f} rows/s)")
+    print(f"Speed-up             : {legacy_seconds / engine_seconds:8.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Titanic preprocessing throughput.")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows in the synthetic passenger table.")
+    parser.add_argument("--batches", type=int, default=5, help="Number of batches to preprocess.")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.batches)
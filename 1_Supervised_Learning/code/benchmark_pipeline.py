@@ -0,0 +1,230 @@
+# -------------------------------------------------------
+# END-TO-END PIPELINE BENCHMARK
+# -------------------------------------------------------
+# Runs the main.py pipeline stages on synthetic passenger
+# tables of increasing size (see synthetic_data.py) and records,
+# per stage and size:
+#   - wall-clock time and throughput (rows/s)
+#   - peak memory allocated during the stage (tracemalloc)
+# tracemalloc slows allocation-heavy stages down noticeably, so
+# compare timings of runs made with the same --no-memory setting.
+#
+# Tables up to IN_MEMORY_MAX_ROWS rows (1M) run the
+# in-memory pipeline:
+#   generate → preprocess_data → split_data → train_model → evaluate_model
+# Larger tables (or every size with --chunked) run the chunked
+# path of main.py --stream, so memory is bounded by the chunk
+# size instead of the table size:
+#   write_csv (synthetic_data.write_csv, chunk by chunk)
+#   → load_transform (utils.load_data with chunksize, every chunk
+#     transformed by an engine fitted on the first chunk)
+#   → train_streaming (main.train_model_streaming) → evaluate_model
+# The chunked path writes the table to a temporary CSV (about
+# 35 bytes per row, i.e. ~3.5 GB for 100M rows) that is deleted
+# after the size has been benchmarked.
+#
+# Results are written as JSON to ../results/benchmarks/ with the
+# library versions and machine details, and can be compared
+# against an earlier run with --compare.
+#
+# How to run:
+#   python benchmark_pipeline.py --sizes 1000 10000 100000 1000000
+#   python benchmark_pipeline.py --sizes 10000000 100000000 --no-memory
+#   python benchmark_pipeline.py --compare ../results/benchmarks/pipeline_<timestamp>.json
+# -------------------------------------------------------
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+import main
+from features import FEATURES, TitanicFeatureEngine
+from synthetic_data import make_passengers, write_csv
+from utils import load_data, preprocess_data
+
+# -------------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------------
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OUTPUT_DIR = "../results/benchmarks"
+
+# Largest table benchmarked in memory; bigger tables take the chunked path
+IN_MEMORY_MAX_ROWS = 1_000_000
+
+# Rows per chunk of the chunked path (bounds its peak memory)
+CHUNKSIZE = 100_000
+
+# -------------------------------------------------------
+# MEASUREMENT
+# -------------------------------------------------------
+
+def measure(func, *args, track_memory=True, **kwargs):
+    """
+    Runs func once with its console output suppressed.
+
+    Returns:
+    - tuple: (result, seconds, peak MB allocated during the call or None).
+    """
+    if track_memory:
+        tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2 if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return result, seconds, peak_mb
+
+def load_transform(file_path, chunksize=CHUNKSIZE):
+    """
+    Chunked load + transform pass: reads the CSV chunk by chunk and transforms
+    every chunk with a feature engine fitted on the first one.
+
+    Returns:
+    - int: Number of transformed rows.
+    """
+    engine, n_rows = None, 0
+    for chunk in load_data(file_path, features=FEATURES, chunksize=chunksize):
+        if engine is None:
+            engine = TitanicFeatureEngine().fit(chunk)
+        n_rows += len(engine.transform(chunk))
+    return n_rows
+
+def benchmark_size(n_rows, seed=42, track_memory=True, chunked=None, chunksize=CHUNKSIZE, work_dir=None):
+    """
+    Benchmarks every pipeline stage on one synthetic table.
+
+    Parameters:
+    - n_rows (int): Table size.
+    - chunked (bool, optional): Use the chunked path (default: only above IN_MEMORY_MAX_ROWS rows).
+    - chunksize (int): Rows per chunk of the chunked path.
+    - work_dir (str, optional): Directory for the temporary CSV of the chunked path.
+
+    Returns:
+    - list: One result dict per stage.
+    """
+    if chunked is None:
+        chunked = n_rows > IN_MEMORY_MAX_ROWS
+    stages = []
+
+    def record(stage, func, *args):
+        result, seconds, peak_mb = measure(func, *args, track_memory=track_memory)
+        stages.append({
+            "rows": n_rows,
+            "path": "chunked" if chunked else "in_memory",
+            "stage": stage,
+            "seconds": seconds,
+            "rows_per_second": n_rows / seconds if seconds > 0 else None,
+            "peak_memory_mb": peak_mb,
+        })
+        memory = f"{peak_mb:10.1f} MB" if peak_mb is not None else ""
+        print(f"  {stage:<16} {seconds:9.3f}s {memory}")
+        return result
+
+    print(f"\n🔄 {n_rows:,} rows ({'chunked' if chunked else 'in memory'})")
+    if chunked:
+        fd, csv_path = tempfile.mkstemp(suffix=".csv", dir=work_dir)
+        os.close(fd)
+        try:
+            record("write_csv", write_csv, csv_path, n_rows, seed, chunksize, False)
+            record("load_transform", load_transform, csv_path, chunksize)
+            model, X_test, y_test = record("train_streaming", main.train_model_streaming, csv_path, chunksize)
+            record("evaluate_model", main.evaluate_model, model, X_test, y_test)
+        finally:
+            os.remove(csv_path)
+        return stages
+
+    df = record("generate", make_passengers, n_rows, seed, 1_000_000, False)
+    df = record("preprocess_data", preprocess_data, df)
+    X_train, X_test, y_train, y_test = record("split_data", main.split_data, df)
+    del df
+    model = record("train_model", main.train_model, X_train, y_train)
+    record("evaluate_model", main.evaluate_model, model, X_test, y_test)
+    return stages
+
+def environment():
+    """Machine and library details stored with every result file."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+# -------------------------------------------------------
+# COMPARISON
+# -------------------------------------------------------
+
+def compare_runs(baseline, current):
+    """
+    Joins two benchmark result dicts on (rows, stage).
+
+    Returns:
+    - pd.DataFrame: Times, peak memory and current/baseline ratios.
+    """
+    keys = ["rows", "stage"]
+    columns = keys + ["seconds", "peak_memory_mb"]
+    merged = pd.DataFrame(baseline["results"])[columns].merge(
+        pd.DataFrame(current["results"])[columns], on=keys, suffixes=("_baseline", "_current"))
+    merged["time_ratio"] = merged["seconds_current"] / merged["seconds_baseline"]
+    merged["memory_ratio"] = merged["peak_memory_mb_current"] / merged["peak_memory_mb_baseline"]
+    return merged
+
+# -------------------------------------------------------
+# EXECUTION
+# -------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Titanic pipeline on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Table sizes to benchmark (1k to 100M rows; above {IN_MEMORY_MAX_ROWS:,} rows "
+                             "the chunked path is used).")
+    parser.add_argument("--chunked", action="store_true", help="Use the chunked path for every size.")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="Rows per chunk of the chunked path.")
+    parser.add_argument("--work-dir", help="Directory for the temporary CSV of the chunked path (default: system temp).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc (removes its overhead from the timings).")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--compare", help="Earlier result JSON to compare this run against.")
+    args = parser.parse_args()
+
+    print("\n🚀 Benchmarking pipeline stages (time, peak memory)...")
+    results = []
+    for n_rows in args.sizes:
+        results.extend(benchmark_size(n_rows, seed=args.seed, track_memory=not args.no_memory,
+                                      chunked=args.chunked or None, chunksize=args.chunksize,
+                                      work_dir=args.work_dir))
+
+    run = {"environment": environment(), "seed": args.seed, "features": FEATURES, "results": results}
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"pipeline_{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output_path, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\n✅ Benchmark results saved to {output_path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Comparison with {args.compare} (ratio < 1 = faster / smaller now):")
+        print(compare_runs(baseline, run).to_string(index=False, float_format="{:.3f}".format))
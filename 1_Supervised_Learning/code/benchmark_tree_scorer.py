@@ -0,0 +1,62 @@
+# -------------------------------------------------------
+# TREE SCORER LATENCY BENCHMARK
+# -------------------------------------------------------
+# Compares sklearn's predict_proba with the flattened array
+# scorer (tree_scorer.py) for the Decision Tree and Random
+# Forest bundles saved by classification.py:
+#   1. Checks that both return identical probabilities
+#   2. Measures per-call latency for 1-row and 100-row batches
+#
+# How to run (after classification.py):
+#   python benchmark_tree_scorer.py --repeats 500
+# -------------------------------------------------------
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from model_bundle import ModelBundle
+from synthetic_data import make_passengers
+from tree_scorer import FlatTreeEnsemble
+
+MODELS_DIR = "../results/models"
+MODEL_NAMES = ["DecisionTreeClassifier", "RandomForestClassifier"]
+
+def time_per_call(func, X, repeats):
+    func(X)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def run_benchmark(models_dir, batch_sizes, repeats):
+    passengers = make_passengers(max(batch_sizes), include_text=False)
+
+    print("\n📊 predict_proba latency per call (ms):")
+    print(f"{'Model':<24} {'Rows':>6} {'sklearn':>10} {'flat':>10} {'speed-up':>9}")
+    for model_name in MODEL_NAMES:
+        bundle = ModelBundle.load(os.path.join(models_dir, f"{model_name}.joblib"))
+        flat = FlatTreeEnsemble.from_model(bundle.model)
+        X_all = bundle.engine.transform(passengers, columns=bundle.features)
+
+        if not np.array_equal(bundle.model.predict_proba(X_all), flat.predict_proba(X_all)):
+            raise AssertionError(f"Flattened {model_name} does not reproduce sklearn's probabilities")
+
+        for n_rows in batch_sizes:
+            X = X_all.iloc[:n_rows]
+            sklearn_ms = time_per_call(bundle.model.predict_proba, X, repeats)
+            flat_ms = time_per_call(flat.predict_proba, X, repeats)
+            print(f"{model_name:<24} {n_rows:>6} {sklearn_ms:>10.3f} {flat_ms:>10.3f} {sklearn_ms / flat_ms:>8.1f}x")
+
+    print("\n✅ Flattened scorer outputs identical to sklearn.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the flattened tree scorer against sklearn.")
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--repeats", type=int, default=500)
+    args = parser.parse_args()
+
+    run_benchmark(args.models_dir, args.batch_sizes, args.repeats)
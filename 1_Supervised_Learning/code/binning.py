@@ -0,0 +1,171 @@
+# -------------------------------------------------------
+# PRE-BINNED FEATURE CACHE
+# -------------------------------------------------------
+# Discretises the feature matrix into at most 255 bins per
+# feature and stores the bin codes as a compact uint8 matrix
+# (8x smaller than float64). Features with few distinct values
+# get one bin per value; continuous features (Age, Fare) get
+# quantile bins. Missing values are stored under a reserved
+# code and handed on as NaN (those columns become float32), so
+# HistGradientBoostingClassifier keeps its native missing-value
+# handling (a learned direction per split) instead of treating
+# them as the largest bin.
+#
+# FeatureBinner is a scikit-learn transformer, used in front of
+# HistGradientBoostingClassifier in classification.py. The edge
+# computation (quantiles) and the code matrix of a given training
+# matrix are computed once: the result is memoised in-process and,
+# with a cache_dir, stored on disk, keyed by a content hash of the
+# matrix. Only identical matrices share an entry: repeated runs on
+# the same training set, and the candidates of one successive-
+# halving round on the same CV fold. Different folds and rounds
+# are different row subsets and are binned separately. Cache
+# files are written atomically and the directory is kept under
+# cache_max_mb by evicting the least recently used entries.
+#
+# The saving is limited to this transformer: the estimator still
+# converts the uint8 codes to float64 and maps them to its own
+# bins (one bin per code, so the model is the same), and that
+# copy is not avoided.
+# -------------------------------------------------------
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+from model_cache import evict_lru, hash_data
+
+# In-process memo of recently binned matrices: key → (bin edges, codes)
+_memo = OrderedDict()
+_MEMO_SIZE = 32
+
+# -------------------------------------------------------
+# BINNING
+# -------------------------------------------------------
+
+def compute_bin_edges(values, max_bins=255):
+    """
+    Computes the bin edges of one feature.
+
+    Returns:
+    - np.ndarray: Sorted thresholds; a value goes to bin i when edges[i-1] < value <= edges[i].
+    """
+    values = values[~np.isnan(values)]
+    distinct = np.unique(values)
+    if len(distinct) <= max_bins:
+        return (distinct[:-1] + distinct[1:]) / 2  # One bin per distinct value
+    quantiles = np.quantile(values, np.linspace(0, 1, max_bins + 1)[1:-1])
+    return np.unique(quantiles)
+
+def bin_values(values, edges, missing_bin):
+    """Maps raw values to uint8 bin codes (missing values → missing_bin)."""
+    codes = np.searchsorted(edges, values, side="left").astype(np.uint8)
+    codes[np.isnan(values)] = missing_bin
+    return codes
+
+
+class FeatureBinner(TransformerMixin, BaseEstimator):
+    """
+    Transforms a feature matrix into uint8 bin codes.
+
+    Parameters:
+    - max_bins (int): Bins per feature for non-missing values (at most 255; code
+      `max_bins` is reserved for missing values, which are output as NaN).
+    - cache_dir (str, optional): Directory for binned matrices reused across runs.
+    - cache_max_mb (float): Size limit of cache_dir; least-recently-used entries are evicted above it.
+    """
+
+    def __init__(self, max_bins=255, cache_dir=None, cache_max_mb=200):
+        self.max_bins = max_bins
+        self.cache_dir = cache_dir
+        self.cache_max_mb = cache_max_mb
+
+    def _bin(self, X):
+        X = pd.DataFrame(X).astype(np.float64)
+        edges = [compute_bin_edges(X[column].to_numpy(), self.max_bins) for column in X.columns]
+        codes = np.column_stack([bin_values(X[column].to_numpy(), e, self.max_bins)
+                                 for column, e in zip(X.columns, edges)])
+        return edges, codes
+
+    def _cached_bin(self, X):
+        """Returns (edges, codes) from the memo, the disk cache or a fresh binning pass."""
+        key = hashlib.sha256(f"{hash_data(pd.DataFrame(X))}:{self.max_bins}".encode()).hexdigest()
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+
+        path = os.path.join(self.cache_dir, f"{key}.joblib") if self.cache_dir else None
+        if path and os.path.exists(path):
+            state = joblib.load(path, mmap_mode="r")  # Codes are memory-mapped, not read
+            entry = (state["edges"], state["codes"])
+            os.utime(path)  # Mark as recently used
+        else:
+            entry = self._bin(X)
+            if path:
+                self._store(path, entry)
+
+        _memo[key] = entry
+        if len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+        return entry
+
+    def _store(self, path, entry):
+        """
+        Writes a cache entry atomically (parallel search workers may bin the same
+        matrix at once and must never load a half-written file), then evicts old entries.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump({"edges": entry[0], "codes": entry[1]}, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        evict_lru(self.cache_dir, self.cache_max_mb * 1024 ** 2)
+
+    def fit(self, X, y=None):
+        self.fit_transform(X)
+        return self
+
+    def fit_transform(self, X, y=None):
+        """Learns the bin edges and returns the binned training matrix (cached)."""
+        if not 2 <= self.max_bins <= 255:
+            raise ValueError(f"max_bins must be between 2 and 255, got {self.max_bins}.")
+        self.bin_edges_, codes = self._cached_bin(X)
+        self.n_features_in_ = codes.shape[1]
+        if hasattr(X, "columns"):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        return self._as_frame(codes)
+
+    def transform(self, X):
+        """Bins new rows with the learned edges."""
+        check_is_fitted(self, "bin_edges_")
+        if hasattr(X, "columns") and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float64)
+        codes = np.column_stack([bin_values(X[:, j], edges, self.max_bins) for j, edges in enumerate(self.bin_edges_)])
+        return self._as_frame(codes)
+
+    def _as_frame(self, codes):
+        """Wraps the codes in a DataFrame; columns with missing values become float32 with NaN."""
+        columns = self.feature_names_in_ if hasattr(self, "feature_names_in_") else range(codes.shape[1])
+        missing = codes == self.max_bins
+        if not missing.any():
+            return pd.DataFrame(codes, columns=columns, copy=False)
+
+        output = {}
+        for j, column in enumerate(columns):
+            output[column] = codes[:, j]
+            if missing[:, j].any():
+                output[column] = codes[:, j].astype(np.float32)
+                output[column][missing[:, j]] = np.nan
+        return pd.DataFrame(output, copy=False)
@@ -1,70 +1,163 @@
 # Import required libraries for data processing, visualization, and model evaluation
+import argparse
+import os
+import time
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import (
     classification_report,
     accuracy_score,
-    confusion_matrix,
-    roc_curve,
-    auc,
-    precision_recall_curve
+    confusion_matrix
 )
 
-# Load the dataset from the specified file path
+from binning import FeatureBinner
+from distillation import build_transfer_set, distill_forest
+from features import FEATURES, TARGET, TEXT_FEATURES, TitanicFeatureEngine
+from forest_growth import grow_models
+from hyperparameter_search import tune_models
+from learning_curves import learning_curves, save_learning_curves
+from model_bundle import ModelBundle
+from model_cache import ModelCache, cache_key, hash_data
+from parallel_training import results_table, train_models_parallel
+from plot_renderer import PlotRenderer
+from tree_scorer import FlatTreeEnsemble
+from tree_shap import TreeShapExplainer
+from utils import build_attributions_table, build_predictions_table, load_data, preprocess_and_save, save_predictions
+
+# ---------------------------
+# FILE PATH CONFIGURATION
+# ---------------------------
+
+# Define the dataset location (Ensure the correct path before execution)
 file_path = "C:/Users/antho/Documents/AI and ML Internship Projects/1_Supervised_Learning/data/titanic.csv"
-df = pd.read_csv(file_path)
-print("\nDataset loaded successfully.")
+engine_path = "../data/Processed/titanic_feature_engine.json"
+models_dir = "../results/models"
+model_cache_dir = "../results/model_cache"
+search_dir = "../results/hyperparameter_search"
+growth_dir = "../results/forest_growth"
+binned_cache_dir = "../results/binned_features"
+distillation_dir = "../results/distillation"
+learning_curves_dir = "../results/learning_curves"
 
 # ---------------------------
 # DATA PREPROCESSING
 # ---------------------------
 
-# Handle missing values to ensure dataset integrity
-df["Age"].fillna(df["Age"].median(), inplace=True)  # Fill missing Age values with the median
-df["Embarked"].fillna(df["Embarked"].mode()[0], inplace=True)  # Fill missing Embarked values with the most frequent value
-df.drop(columns=["Cabin"], inplace=True)  # Drop Cabin column due to excessive missing values
+def load_and_preprocess(file_path, features=FEATURES):
+    """
+    Loads the Titanic dataset, fits the shared feature engine and returns
+    the predictor matrix X, the target y and the fitted engine.
+    """
+    df = load_data(file_path, features=features)  # Read only the columns the model features need
+    print("\nDataset loaded successfully.")
 
-# Feature Engineering: Create FamilySize to capture the effect of traveling with family
-df["FamilySize"] = df["SibSp"] + df["Parch"] + 1  
+    # Learn imputation statistics (Age median, Embarked mode) and the Embarked vocabulary once,
+    # then drop Cabin, create FamilySize and encode Sex / Embarked in a single columnar pass
+    engine = TitanicFeatureEngine().fit(df)
+    df = engine.transform(df, columns=features + [TARGET])
 
-# Convert categorical variables into numerical values
-df["Sex"] = df["Sex"].map({"male": 0, "female": 1})  # Encode Sex (0 = Male, 1 = Female)
-df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)  # Apply one-hot encoding to Embarked column
+    # Persist the fitted statistics so later batches are transformed without re-fitting
+    engine.save(engine_path)
 
-# Define input features (X) and target variable (y)
-features = ["Pclass", "Sex", "Age", "Fare", "FamilySize", "Embarked_Q", "Embarked_S"]
-X = df[features]  # Predictor variables
-y = df["Survived"]  # Target variable (0 = Not Survived, 1 = Survived)
-
-# ---------------------------
-# TRAIN-TEST SPLIT
-# ---------------------------
-
-# Split dataset into training (80%) and testing (20%) sets
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # Define input features (X) and target variable (y)
+    X = df[features]  # Predictor variables
+    y = df[TARGET]  # Target variable (0 = Not Survived, 1 = Survived)
+    return X, y, engine
 
 # ---------------------------
 # MODEL TRAINING & EVALUATION
 # ---------------------------
 
-# Define classification models to train
-models = {
-    "LogisticRegression": LogisticRegression(max_iter=200),
-    "DecisionTreeClassifier": DecisionTreeClassifier(random_state=42),
-    "RandomForestClassifier": RandomForestClassifier(random_state=42)
-}
-
-# Iterate through each model, train, and evaluate
-for model_name, model in models.items():
-    model.fit(X_train, y_train)  # Train the model
+def build_models():
+    """
+    Returns the registry of classification models to train (unfitted).
+    """
+    return {
+        "LogisticRegression": LogisticRegression(max_iter=200),
+        "DecisionTreeClassifier": DecisionTreeClassifier(random_state=42),
+        "RandomForestClassifier": RandomForestClassifier(random_state=42),
+        # Bin edges and codes are computed once per training matrix and cached (memory + disk)
+        "HistGradientBoostingClassifier": make_pipeline(
+            FeatureBinner(cache_dir=binned_cache_dir),
+            HistGradientBoostingClassifier(random_state=42)
+        )
+    }
+
+def predict_test_set(model, X_test):
+    """
+    Returns the predicted labels and survival probabilities (None if unsupported) of a fitted model.
+    """
     y_pred = model.predict(X_test)  # Generate predictions on the test set
-
+    y_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+    return y_pred, y_proba
+
+def train_models(models, X_train, y_train, X_test, parallel=False, cache=None, prefitted=None):
+    """
+    Trains every model and predicts the test set.
+    With parallel=True all models are fitted at once in a process pool
+    that shares the training data through shared memory.
+    With a ModelCache, models already fitted on identical data and
+    hyperparameters are loaded from disk instead of being refitted.
+    Models in `prefitted` (name → estimator already fitted on X_train,
+    e.g. forests grown by grow_models()) are used as they are.
+
+    Returns:
+    - dict: Model name → {"model", "y_pred", "y_proba", "fit_seconds", "cached"}.
+    """
+    results = {}
+    to_fit = dict(models)
+
+    # Use models that were already fitted on this training set (not refitted, not re-cached)
+    for model_name, model in (prefitted or {}).items():
+        if model_name in to_fit:
+            y_pred, y_proba = predict_test_set(model, X_test)
+            results[model_name] = {"model": model, "y_pred": y_pred, "y_proba": y_proba,
+                                   "fit_seconds": 0.0, "cached": False}
+            del to_fit[model_name]
+
+    # Load previously fitted models from the content-addressed cache
+    if cache is not None:
+        data_hash = hash_data(X_train, y_train)
+        keys = {model_name: cache_key(model, data_hash, X_train.columns) for model_name, model in to_fit.items()}
+        for model_name, key in keys.items():
+            cached_model = cache.get(key)
+            if cached_model is not None:
+                y_pred, y_proba = predict_test_set(cached_model, X_test)
+                results[model_name] = {"model": cached_model, "y_pred": y_pred, "y_proba": y_proba,
+                                       "fit_seconds": 0.0, "cached": True}
+                del to_fit[model_name]
+
+    if parallel and to_fit:
+        results.update(train_models_parallel(to_fit, X_train, y_train, X_test))
+    else:
+        for model_name, model in to_fit.items():
+            start = time.perf_counter()
+            model.fit(X_train, y_train)  # Train the model
+            fit_seconds = time.perf_counter() - start
+
+            y_pred, y_proba = predict_test_set(model, X_test)
+            results[model_name] = {"model": model, "y_pred": y_pred, "y_proba": y_proba, "fit_seconds": fit_seconds}
+
+    # Store the newly fitted models for the next identical run
+    for model_name in to_fit:
+        results[model_name]["cached"] = False
+        if cache is not None:
+            cache.put(keys[model_name], results[model_name]["model"])
+
+    return {model_name: results[model_name] for model_name in models}
+
+def report_model(model_name, model, y_test, y_pred, y_proba, features, renderer):
+    """
+    Prints evaluation metrics for one trained model and queues its
+    ROC, precision-recall, confusion-matrix and feature-importance plots
+    on the background renderer.
+    """
     # Compute model performance metrics
     acc = accuracy_score(y_test, y_pred)  # Calculate accuracy
     conf_matrix = confusion_matrix(y_test, y_pred)  # Generate confusion matrix
@@ -81,101 +174,165 @@ for model_name, model in models.items():
     # VISUALIZATION & METRICS
     # ---------------------------
 
-    # Compute ROC Curve (if model supports probability predictions)
-    y_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+    # ROC and Precision-Recall Curves (if model supports probability predictions)
     if y_proba is not None:
-        fpr, tpr, _ = roc_curve(y_test, y_proba)
-        roc_auc = auc(fpr, tpr)
-
-        plt.figure(figsize=(6, 6))
-        plt.plot(fpr, tpr, label=f"AUC = {roc_auc:.2f}")
-        plt.plot([0, 1], [0, 1], linestyle="--", color="gray")  # Reference diagonal
-        plt.xlabel("False Positive Rate")
-        plt.ylabel("True Positive Rate")
-        plt.title(f"{model_name} - ROC Curve")
-        plt.legend(loc="lower right")
-        plt.savefig(f"../results/plots/{model_name}_roc_curve.png")  # Save plot
-        plt.close()
-
-    # Compute Precision-Recall Curve (if model supports probability predictions)
-    if y_proba is not None:
-        precision, recall, _ = precision_recall_curve(y_test, y_proba)
-
-        plt.figure(figsize=(6, 6))
-        plt.plot(recall, precision, label="Precision-Recall Curve")
-        plt.xlabel("Recall")
-        plt.ylabel("Precision")
-        plt.title(f"{model_name} - Precision-Recall Curve")
-        plt.legend()
-        plt.savefig(f"../results/plots/{model_name}_precision_recall_curve.png")  # Save plot
-        plt.close()
-
-    # Generate Confusion Matrix Heatmap
-    plt.figure(figsize=(6, 6))
-    sns.heatmap(conf_matrix, annot=True, fmt="d", cmap="Blues",
-                xticklabels=["Not Survived", "Survived"],
-                yticklabels=["Not Survived", "Survived"])
-    plt.xlabel("Predicted Label")
-    plt.ylabel("True Label")
-    plt.title(f"{model_name} - Confusion Matrix")
-    plt.savefig(f"../results/plots/{model_name}_confusion_matrix.png")  # Save plot
-    plt.close()
-
-    # Generate Feature Importance Plot (only for tree-based models)
-    if hasattr(model, "feature_importances_"):
-        feature_importances = model.feature_importances_
-        plt.figure(figsize=(8, 6))
-        sns.barplot(x=feature_importances, y=features)
-        plt.xlabel("Feature Importance")
-        plt.ylabel("Feature Names")
-        plt.title(f"{model_name} - Feature Importance")
-        plt.savefig(f"../results/plots/{model_name}_feature_importance.png")  # Save plot
-        plt.close()
+        renderer.submit("roc_curve", model_name, y_test=y_test.to_numpy(), y_proba=y_proba)
+        renderer.submit("precision_recall_curve", model_name, y_test=y_test.to_numpy(), y_proba=y_proba)
+
+    # Confusion Matrix Heatmap
+    renderer.submit("confusion_matrix", model_name, conf_matrix=conf_matrix)
 
-print("\nAll models have been trained and evaluated. Results are saved in the results/plots directory.")
+    # Feature Importance Plot (only for tree-based models)
+    if hasattr(model, "feature_importances_"):
+        renderer.submit("feature_importance", model_name,
+                        feature_importances=model.feature_importances_, features=features)
+
+def explain_models(results, X_test, n_jobs=1):
+    """
+    Computes per-passenger TreeSHAP attributions of the survival probability
+    for every tree model (DecisionTree, RandomForest).
+
+    Returns:
+    - dict: Model name → (expected value, rows × features attribution matrix).
+    """
+    attributions = {}
+    for model_name, result in results.items():
+        if not FlatTreeEnsemble.supports(result["model"]):
+            continue
+        start = time.perf_counter()
+        explainer = TreeShapExplainer(result["model"])
+        attributions[model_name] = (explainer.expected_value, explainer.explain(X_test, n_jobs=n_jobs))
+        print(f"🔎 {model_name}: attributions for {len(X_test)} passengers in {time.perf_counter() - start:.2f}s")
+    return attributions
 
 # ---------------------------
-# SAVE PREDICTIONS
+# EXECUTION PIPELINE
 # ---------------------------
 
-# Prepare a DataFrame to store predictions
-predictions_data = []
-
-for model_name, model in models.items():
-    y_pred = model.predict(X_test)
-    y_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and compare Titanic classification models.")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Fit all registered models at once in a process pool with shared-memory training data.")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="Disable diagnostic plot rendering (e.g. for benchmark runs).")
+    parser.add_argument("--search", action="store_true",
+                        help="Tune the tree models with successive-halving search before training.")
+    parser.add_argument("--grow-forest", action="store_true",
+                        help="Grow the Random Forest with warm_start until its OOB score plateaus.")
+    parser.add_argument("--no-explain", action="store_true",
+                        help="Skip the per-passenger attributions of the tree models.")
+    parser.add_argument("--explain-jobs", type=int, default=1,
+                        help="Worker processes used to compute the attributions.")
+    parser.add_argument("--distill", action="store_true",
+                        help="Distill the Random Forest into a shallow tree and an interaction-feature logistic regression.")
+    parser.add_argument("--distill-rows", type=int, default=20_000,
+                        help="Synthetic passengers labelled by the forest and added to the distillation transfer set.")
+    parser.add_argument("--learning-curves", action="store_true",
+                        help="Train every model on nested 1%%-100%% subsamples in parallel and record the learning curves.")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Do not trace fit memory in the learning curves (faster, comparable fit times).")
+    parser.add_argument("--text-features", action="store_true",
+                        help="Also train on Title, SurnameGroupSize, TicketPrefix and TicketGroupSize (from Name / Ticket).")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always refit models instead of loading identical fits from the model cache.")
+    parser.add_argument("--cache-max-mb", type=float, default=500,
+                        help="Size limit of the model cache; least-recently-used models are evicted above it.")
+    args = parser.parse_args()
+
+    features = FEATURES + TEXT_FEATURES if args.text_features else FEATURES
+    X, y, engine = load_and_preprocess(file_path, features)
+
+    # Split dataset into training (80%) and testing (20%) sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Diagnostic plots are rendered in the background
+    renderer = PlotRenderer("../results/plots", enabled=not args.no_plots)
+    cache = None if args.no_cache else ModelCache(model_cache_dir, max_bytes=int(args.cache_max_mb * 1024 ** 2))
+
+    # Train every registered model (sequentially or all at once)
+    # Optionally tune the tree models (depth, leaf size, n_estimators) with successive halving
+    models = build_models()
+    if args.search:
+        models = tune_models(models, X_train, y_train, search_dir)
+
+    # Optionally size the Random Forest by OOB early stopping (the grown forest is reused, not refitted)
+    prefitted = None
+    if args.grow_forest:
+        models, prefitted = grow_models(models, X_train, y_train, growth_dir, cache=cache, renderer=renderer)
+
+    # Optionally measure how accuracy grows with the training-set size
+    if args.learning_curves:
+        print("\n📈 Computing learning curves...")
+        curves = learning_curves(models, X_train, y_train, X_test, y_test, track_memory=not args.no_memory)
+        save_learning_curves(curves, learning_curves_dir, renderer=renderer)
+
+    start = time.perf_counter()
+    results = train_models(models, X_train, y_train, X_test, parallel=args.parallel, cache=cache,
+                           prefitted=prefitted)
+    sweep_seconds = time.perf_counter() - start
+
+    # Iterate through each trained model and evaluate
+    for model_name, result in results.items():
+        report_model(model_name, result["model"], y_test, result["y_pred"], result["y_proba"], features, renderer)
+
+    print("\n📊 Model Comparison:")
+    print(results_table(results, y_test).to_string(index=False))
+    print(f"Model sweep wall-clock: {sweep_seconds:.2f}s")
+
+    print("\nAll models have been trained and evaluated.")
+
+    # Persist preprocessing + model bundles for the scoring service
+    os.makedirs(models_dir, exist_ok=True)
+    for model_name, result in results.items():
+        ModelBundle(engine, result["model"], features, model_name).save(os.path.join(models_dir, f"{model_name}.joblib"))
+        # Tree models are also exported as packed node arrays for the fast scorer
+        if FlatTreeEnsemble.supports(result["model"]):
+            FlatTreeEnsemble.from_model(result["model"]).save(os.path.join(models_dir, f"{model_name}_flat.npz"))
+    print(f"📦 Model bundles saved to {models_dir}")
+
+    # Optionally compress the Random Forest into compact students trained on its soft predictions
+    if args.distill:
+        print("\n🎓 Distilling RandomForestClassifier...")
+        X_transfer = build_transfer_set(X_train, engine, synthetic_rows=args.distill_rows)
+        students, distillation_report = distill_forest(results["RandomForestClassifier"]["model"], X_transfer,
+                                                       X_test, y_test, output_dir=distillation_dir)
+        print(distillation_report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        for student_name, student in students.items():
+            ModelBundle(engine, student, features, student_name).save(os.path.join(models_dir, f"{student_name}.joblib"))
+        print(f"📦 Student bundles saved to {models_dir}; report saved to {distillation_dir}")
 
-    for idx, (actual, predicted) in zip(X_test.index, zip(y_test, y_pred)):
-        probability = y_proba[idx] if y_proba is not None else "N/A"
-        predictions_data.append({
-            "PassengerIndex": X_test.index[idx],
-            "ActualSurvived": actual,
-            "PredictedSurvived": predicted,
-            "ProbabilitySurvived": probability,
-            "Model": model_name
-        })
+    # ---------------------------
+    # SAVE PREDICTIONS
+    # ---------------------------
 
-# Convert to DataFrame and save to CSV
-predictions_df = pd.DataFrame(predictions_data)
-predictions_file_path = "../results/titanic_predictions.csv"
-predictions_df.to_csv(predictions_file_path, index=False)
+    # Reuse the predictions from training and save them as CSV and Parquet
+    predictions_df = build_predictions_table(results, y_test)
+    predictions_file_path = "../results/titanic_predictions.csv"
+    save_predictions(predictions_df, predictions_file_path, parquet_path="../results/titanic_predictions.parquet")
 
-print(f"Predictions saved to {predictions_file_path}")
+    # Explain every tree-model prediction: per-passenger feature attributions, same row layout
+    if not args.no_explain:
+        attributions = explain_models(results, X_test, n_jobs=args.explain_jobs)
+        attributions_df = build_attributions_table(attributions, results, y_test, features)
+        save_predictions(attributions_df, "../results/titanic_attributions.csv",
+                         parquet_path="../results/titanic_attributions.parquet")
 
-# ---------------------------
-# CLEANING DATASET FOR FUTURE USE
-# ---------------------------
+    # ---------------------------
+    # CLEANING DATASET FOR FUTURE USE
+    # ---------------------------
 
-from utils import preprocess_and_save
+    # Define file paths
+    raw_data_path = "../data/titanic.csv"
+    cleaned_data_path = "../data/Processed/titanic_cleaned.csv"
 
-# Define file paths
-raw_data_path = "../data/titanic.csv"
-cleaned_data_path = "../data/Processed/titanic_cleaned.csv"
+    # Generate and save the cleaned dataset (reusing the fitted feature engine)
+    preprocess_and_save(raw_data_path, cleaned_data_path, engine=engine)
 
-# Generate and save the cleaned dataset
-preprocess_and_save(raw_data_path, cleaned_data_path)
+    # Wait for the queued diagnostic plots
+    rendered_plots = renderer.close()
 
-print("\n✅ All outputs successfully generated!")
-print(f"📂 Cleaned dataset saved at: {cleaned_data_path}")
-print(f"📂 Model predictions saved at: {predictions_file_path}")
-print("📊 Visualization plots are stored in the results/plots directory.")
+    print("\n✅ All outputs successfully generated!")
+    print(f"📂 Cleaned dataset saved at: {cleaned_data_path}")
+    print(f"📂 Model predictions saved at: {predictions_file_path}")
+    if renderer.enabled:
+        print(f"📊 {len(rendered_plots)} visualization plots are stored in the results/plots directory.")
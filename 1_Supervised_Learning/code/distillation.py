@@ -0,0 +1,155 @@
+# -------------------------------------------------------
+# RANDOM FOREST DISTILLATION INTO A COMPACT STUDENT
+# -------------------------------------------------------
+# Trains small "student" models to reproduce the Random Forest's
+# soft predictions (its predict_proba), for low-latency scoring:
+#   - a shallow DecisionTreeClassifier
+#   - a LogisticRegression on pairwise interaction features
+#
+# Soft labels are fitted with sample weights: every transfer row
+# appears once as "survived" with weight p and once as "not
+# survived" with weight 1 - p, where p is the forest's survival
+# probability. Minimizing the weighted log-loss / impurity then
+# matches the forest's probabilities instead of hard labels.
+#
+# The transfer set is the training data plus optional synthetic
+# passengers (synthetic_data.py) labelled by the forest, so the
+# students learn the forest's function on more of the input space
+# than the 712 training rows cover.
+#
+# The report compares teacher and students on the test set:
+# accuracy, agreement with the forest's predicted labels,
+# probability gap, predict_proba latency and pickled size.
+# -------------------------------------------------------
+
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import PolynomialFeatures, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from features import required_columns
+from synthetic_data import make_passengers
+
+# -------------------------------------------------------
+# STUDENTS & TRANSFER SET
+# -------------------------------------------------------
+
+def build_students(max_depth=6):
+    """
+    Returns the registry of student models (unfitted).
+    """
+    return {
+        "DistilledTree": DecisionTreeClassifier(max_depth=max_depth, min_samples_leaf=5, random_state=42),
+        # Pairwise products (e.g. Sex × Pclass) let the linear model express the forest's interactions
+        "DistilledLogistic": make_pipeline(
+            PolynomialFeatures(degree=2, interaction_only=True, include_bias=False),
+            StandardScaler(),
+            LogisticRegression(max_iter=1000)
+        )
+    }
+
+def build_transfer_set(X_train, engine, synthetic_rows=0, seed=7):
+    """
+    Returns the rows the forest labels for its students: the training
+    features, plus `synthetic_rows` synthetic passengers preprocessed
+    with the same fitted feature engine.
+    """
+    if synthetic_rows <= 0:
+        return X_train
+    # Name / Ticket are only generated when the features derive from them
+    include_text = bool({"Name", "Ticket"} & set(required_columns(X_train.columns)))
+    synthetic = make_passengers(synthetic_rows, seed=seed, include_text=include_text)
+    X_synthetic = engine.transform(synthetic, columns=list(X_train.columns))
+    return pd.concat([X_train, X_synthetic], ignore_index=True)
+
+def fit_student(student, X, soft_labels):
+    """
+    Fits a classifier on soft labels (probability of class 1) using duplicated, weighted rows.
+
+    Returns:
+    - The fitted student.
+    """
+    X_doubled = pd.concat([X, X], ignore_index=True)
+    y_doubled = np.repeat([0, 1], len(X))
+    weights = np.concatenate([1 - soft_labels, soft_labels])
+
+    keep = weights > 0  # Rows the forest is certain about appear only once
+    fit_params = {"sample_weight": weights[keep]}
+    if isinstance(student, Pipeline):
+        fit_params = {f"{student.steps[-1][0]}__sample_weight": weights[keep]}
+    return student.fit(X_doubled[keep], y_doubled[keep], **fit_params)
+
+# -------------------------------------------------------
+# REPORTING
+# -------------------------------------------------------
+
+def latency_ms(model, X, repeats=200):
+    """Mean predict_proba latency per call in milliseconds."""
+    model.predict_proba(X)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict_proba(X)
+    return (time.perf_counter() - start) / repeats * 1000
+
+def describe_model(model_name, model, X_test, y_test, teacher_pred, teacher_proba, repeats=200):
+    """
+    Returns one report row: accuracy, agreement with the teacher, probability gap, latency and size.
+    """
+    proba = model.predict_proba(X_test)[:, 1]
+    y_pred = model.predict(X_test)
+    return {
+        "Model": model_name,
+        "Accuracy": float(np.mean(y_pred == np.asarray(y_test))),
+        "Agreement": float(np.mean(y_pred == teacher_pred)),
+        "ProbabilityMAE": float(np.mean(np.abs(proba - teacher_proba))),
+        "Latency1RowMs": latency_ms(model, X_test.iloc[:1], repeats),
+        "Latency100RowsMs": latency_ms(model, X_test.iloc[:100], repeats),
+        "SizeKB": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024,
+    }
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+def distill_forest(teacher, X_transfer, X_test, y_test, students=None, output_dir=None, repeats=200):
+    """
+    Distills a fitted Random Forest into the student models and compares them.
+
+    Parameters:
+    - teacher (RandomForestClassifier): Fitted forest.
+    - X_transfer (pd.DataFrame): Rows labelled by the forest (see build_transfer_set()).
+    - X_test, y_test: Held-out data for the comparison.
+    - students (dict, optional): Model name → unfitted student (default: build_students()).
+    - output_dir (str, optional): Directory for distillation_report.csv.
+    - repeats (int): predict_proba calls per latency measurement.
+
+    Returns:
+    - tuple: (dict of fitted students, report DataFrame with the teacher in the first row).
+    """
+    students = build_students() if students is None else students
+    soft_labels = teacher.predict_proba(X_transfer)[:, 1]
+
+    teacher_proba = teacher.predict_proba(X_test)[:, 1]
+    teacher_pred = teacher.predict(X_test)
+    report = [describe_model(type(teacher).__name__, teacher, X_test, y_test, teacher_pred, teacher_proba, repeats)]
+
+    fitted = {}
+    for student_name, student in students.items():
+        start = time.perf_counter()
+        fitted[student_name] = fit_student(student, X_transfer, soft_labels)
+        fit_seconds = time.perf_counter() - start
+        row = describe_model(student_name, fitted[student_name], X_test, y_test, teacher_pred, teacher_proba, repeats)
+        row["FitSeconds"] = fit_seconds
+        report.append(row)
+
+    report = pd.DataFrame(report)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        report.to_csv(os.path.join(output_dir, "distillation_report.csv"), index=False)
+    return fitted, report
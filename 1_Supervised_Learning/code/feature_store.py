@@ -0,0 +1,165 @@
+# -------------------------------------------------------
+# MEMORY-MAPPED FEATURE STORE
+# -------------------------------------------------------
+# Binary column store for preprocessed datasets, written next
+# to the cleaned CSV by utils.preprocess_and_save:
+#
+#   titanic_cleaned_store/
+#     manifest.json      – row count, column schema, engine statistics
+#     Age.npy, Sex.npy…  – one .npy file per column
+#
+# Numeric and boolean columns are opened with np.load(mmap_mode="r"),
+# i.e. mapped straight from the page cache with no parsing and no
+# copy. String columns are stored as fixed-width UTF-8 bytes and are
+# decoded only when requested; categoricals are stored as codes.
+#
+# The manifest is written last (atomically), so a store is either
+# complete or not visible at all.
+# -------------------------------------------------------
+
+import json
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# -------------------------------------------------------
+# WRITING
+# -------------------------------------------------------
+
+def _file_name(column):
+    return re.sub(r"[^\w.-]", "_", str(column)) + ".npy"
+
+def write_feature_store(df, store_dir, engine=None, source=None):
+    """
+    Writes a DataFrame as a memory-mappable column store.
+
+    Parameters:
+    - df (pd.DataFrame): Preprocessed dataset.
+    - store_dir (str): Output directory (created if needed; existing columns are overwritten).
+    - engine (TitanicFeatureEngine, optional): Fitted statistics saved in the manifest,
+      so raw passengers can later be preprocessed consistently with the stored data.
+    - source (str, optional): Path of the raw data the store was built from.
+
+    Returns:
+    - dict: The written manifest.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    columns = []
+
+    for name in df.columns:
+        series = df[name]
+        entry = {"name": name, "file": _file_name(name)}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            entry["kind"] = "category"
+            entry["categories"] = series.cat.categories.tolist()
+        elif pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy()
+            entry["kind"] = "numeric"
+        else:
+            # Strings: fixed-width UTF-8 bytes plus a missing-value mask (if any)
+            missing = series.isna().to_numpy()
+            values = np.char.encode(series.fillna("").to_numpy(dtype=str), "utf-8")
+            entry["kind"] = "string"
+            if missing.any():
+                entry["mask_file"] = _file_name(f"{name}.missing")
+                np.save(os.path.join(store_dir, entry["mask_file"]), missing)
+
+        np.save(os.path.join(store_dir, entry["file"]), values)
+        entry["dtype"] = values.dtype.str
+        columns.append(entry)
+
+    manifest = {
+        "version": STORE_VERSION,
+        "n_rows": len(df),
+        "columns": columns,
+        "engine": engine.to_dict() if engine is not None else None,
+        "source": source,
+    }
+
+    # Publish the store by atomically replacing the manifest
+    fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(store_dir, MANIFEST_NAME))
+    return manifest
+
+# -------------------------------------------------------
+# READING
+# -------------------------------------------------------
+
+def read_manifest(store_dir):
+    """
+    Returns:
+    - dict: The store's manifest (raises FileNotFoundError if the store does not exist).
+    """
+    with open(os.path.join(store_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != STORE_VERSION:
+        raise ValueError(f"Unsupported feature store version {manifest.get('version')} in {store_dir}")
+    return manifest
+
+def open_columns(store_dir, columns=None):
+    """
+    Memory-maps stored columns without parsing or copying.
+
+    Parameters:
+    - store_dir (str): Store directory.
+    - columns (list, optional): Columns to open (all when omitted).
+
+    Returns:
+    - dict: Column name → read-only np.memmap (string columns as fixed-width bytes,
+      categoricals as codes).
+    """
+    manifest = read_manifest(store_dir)
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    names = list(entries) if columns is None else list(columns)
+
+    missing = [name for name in names if name not in entries]
+    if missing:
+        raise KeyError(f"Columns not in feature store {store_dir}: {missing}")
+
+    return {name: np.load(os.path.join(store_dir, entries[name]["file"]), mmap_mode="r") for name in names}
+
+def load_feature_store(store_dir, columns=None):
+    """
+    Opens a stored dataset as a DataFrame backed by the memory maps.
+
+    Numeric and boolean columns are zero-copy, read-only views of the files
+    (call .copy() before modifying them in place); string columns are decoded
+    and categoricals rebuilt from their codes.
+
+    Parameters:
+    - store_dir (str): Store directory.
+    - columns (list, optional): Columns to load, in this order (all when omitted).
+
+    Returns:
+    - pd.DataFrame
+    """
+    manifest = read_manifest(store_dir)
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    arrays = open_columns(store_dir, columns)
+
+    data = {}
+    for name, values in arrays.items():
+        entry = entries[name]
+        if entry["kind"] == "category":
+            data[name] = pd.Categorical.from_codes(values, categories=entry["categories"])
+        elif entry["kind"] == "string":
+            if (np.asarray(values).view(np.uint8) > 127).any():
+                decoded = np.char.decode(values, "utf-8").astype(object)
+            else:
+                decoded = values.astype(str).astype(object)  # ASCII-only: much faster than UTF-8 decoding
+            if "mask_file" in entry:
+                decoded[np.load(os.path.join(store_dir, entry["mask_file"]))] = np.nan
+            data[name] = pd.array(decoded, dtype="str")
+        else:
+            data[name] = values
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,271 @@
+# -------------------------------------------------------
+# TITANIC FEATURE ENGINE
+# -------------------------------------------------------
+# Fit-once / transform-many preprocessing shared by main.py,
+# classification.py and utils.py.
+#
+# The engine learns the imputation statistics (Age median,
+# Embarked mode) and the Embarked dummy vocabulary once, can
+# persist them to JSON, and then transforms any number of
+# batches column by column without re-fitting.
+#
+# Optional Name / Ticket features (TEXT_FEATURES, see
+# text_features.py) are only computed when requested.
+# -------------------------------------------------------
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from text_features import (
+    TITLE_CATEGORIES,
+    learn_prefix_vocabulary,
+    learn_surname_counts,
+    learn_ticket_counts,
+    name_features,
+    ticket_features,
+)
+
+# -------------------------------------------------------
+# FEATURE CONFIGURATION
+# -------------------------------------------------------
+
+# Model input features produced by the engine
+FEATURES = ["Pclass", "Sex", "Age", "Fare", "FamilySize", "Embarked_Q", "Embarked_S"]
+
+# Optional features derived from the Name and Ticket text columns
+TEXT_FEATURES = ["Title", "SurnameGroupSize", "TicketPrefix", "TicketGroupSize"]
+
+# Raw text column each optional feature is derived from
+TEXT_SOURCES = {"Title": "Name", "SurnameGroupSize": "Name", "TicketPrefix": "Ticket", "TicketGroupSize": "Ticket"}
+
+# Target variable (0 = Not Survived, 1 = Survived)
+TARGET = "Survived"
+
+# Encoding used for Sex (0 = Male, 1 = Female)
+SEX_CATEGORIES = ["male", "female"]
+
+# Columns removed during preprocessing
+DROP_COLUMNS = ["Cabin"]
+
+
+def required_columns(features):
+    """
+    Returns the raw CSV columns needed to build the given model features
+    (e.g. FamilySize needs SibSp and Parch, Embarked_S needs Embarked).
+    """
+    columns = []
+    for feature in features:
+        if feature == "FamilySize":
+            sources = ["SibSp", "Parch"]
+        elif feature.startswith("Embarked_"):
+            sources = ["Embarked"]
+        elif feature in TEXT_SOURCES:
+            sources = [TEXT_SOURCES[feature]]
+        else:
+            sources = [feature]
+        columns.extend(column for column in sources if column not in columns)
+    return columns
+
+def _encode(column, codes, fill):
+    """Maps a (string or categorical) column to int8 codes, filling missing/unseen values."""
+    encoded = column.map(codes)
+    if isinstance(encoded.dtype, pd.CategoricalDtype):
+        encoded = encoded.astype(np.float64)
+    return encoded.fillna(fill).to_numpy(dtype=np.int8)
+
+
+class TitanicFeatureEngine:
+    """
+    Columnar preprocessing transformer for the Titanic dataset.
+
+    fit() learns:
+    - age_median (float): Median used to fill missing Age values.
+    - embarked_mode (str): Most frequent port used to fill missing Embarked values.
+    - embarked_categories (list): Sorted Embarked vocabulary; the first entry
+      is dropped when one-hot encoding (same as get_dummies(drop_first=True)).
+    - sex_fill (int): Encoded Sex value used for missing or unknown entries.
+    - title_fill (int): Title code used for missing names (when Name is present).
+    - surname_counts (dict): Passengers per shared surname (when Name is present).
+    - ticket_prefixes (list): Ticket-prefix vocabulary (when Ticket is present).
+    - ticket_counts (dict): Passengers per shared ticket (when Ticket is present).
+
+    transform() then applies the frozen statistics to any batch in a single
+    pass per column. Untouched columns are passed through without copying.
+    """
+
+    def __init__(self):
+        self.age_median = None
+        self.embarked_mode = None
+        self.embarked_categories = None
+        self.sex_fill = None
+        self.title_fill = None
+        self.surname_counts = None
+        self.ticket_prefixes = None
+        self.ticket_counts = None
+
+    # ---------------------------
+    # FITTING
+    # ---------------------------
+
+    def fit(self, df):
+        """
+        Learns imputation statistics and the Embarked vocabulary from a DataFrame.
+
+        Parameters:
+        - df (pd.DataFrame): Raw Titanic data.
+
+        Returns:
+        - TitanicFeatureEngine: The fitted engine (self).
+        """
+        self.age_median = float(df["Age"].median())
+
+        # Same tie-breaking as Series.mode(): the smallest of the most frequent ports
+        embarked_counts = df["Embarked"].value_counts()
+        embarked_counts = embarked_counts[embarked_counts > 0]  # Unused categorical levels
+        top_ports = embarked_counts.index[embarked_counts == embarked_counts.max()]
+        self.embarked_mode = str(min(top_ports))
+        self.embarked_categories = sorted(str(port) for port in embarked_counts.index)
+
+        sex_counts = df["Sex"].value_counts()
+        self.sex_fill = int(np.argmax([sex_counts.get(sex, 0) for sex in SEX_CATEGORIES]))
+
+        # Vocabularies of the optional text features (only when the raw columns were loaded)
+        if "Name" in df.columns:
+            titles = name_features(df["Name"], -1, {})["Title"]
+            titles = titles[titles >= 0]
+            self.title_fill = int(np.bincount(titles, minlength=len(TITLE_CATEGORIES)).argmax())
+            self.surname_counts = learn_surname_counts(df["Name"])
+        if "Ticket" in df.columns:
+            self.ticket_prefixes = learn_prefix_vocabulary(df["Ticket"])
+            self.ticket_counts = learn_ticket_counts(df["Ticket"])
+
+        return self
+
+    @property
+    def is_fitted(self):
+        return self.age_median is not None
+
+    @property
+    def _sex_codes(self):
+        return {sex: code for code, sex in enumerate(SEX_CATEGORIES)}
+
+    @property
+    def _embarked_codes(self):
+        return {port: code for code, port in enumerate(self.embarked_categories)}
+
+    @property
+    def dummy_columns(self):
+        """Names of the one-hot Embarked columns produced by transform()."""
+        return [f"Embarked_{port}" for port in self.embarked_categories[1:]]
+
+    # ---------------------------
+    # TRANSFORMING
+    # ---------------------------
+
+    def transform(self, df, columns=None):
+        """
+        Applies the fitted preprocessing to a batch of passengers.
+
+        Parameters:
+        - df (pd.DataFrame): Raw Titanic data (the input frame is not modified).
+        - columns (list, optional): Restrict the output to these columns
+          (e.g. FEATURES + [TARGET]) so unused columns are never materialized.
+
+        Returns:
+        - pd.DataFrame: Preprocessed dataset with the same index as `df`.
+        """
+        if not self.is_fitted:
+            raise ValueError("TitanicFeatureEngine must be fitted before calling transform().")
+
+        # Encode Sex / Embarked with one vectorized lookup each; missing or unseen values
+        # fall back to the learned fill codes
+        sex_codes = _encode(df["Sex"], self._sex_codes, self.sex_fill)
+        embarked_codes = _encode(
+            df["Embarked"], self._embarked_codes, self._embarked_codes[self.embarked_mode]
+        )
+
+        engineered = {
+            "Sex": sex_codes,
+            "Age": df["Age"].fillna(self.age_median).to_numpy(),
+            "FamilySize": (df["SibSp"] + df["Parch"] + 1).to_numpy(),
+        }
+        for code, column in enumerate(self.dummy_columns, start=1):
+            engineered[column] = embarked_codes == code
+
+        # Keep the original column order: passthrough columns, FamilySize, then Embarked dummies
+        output = {}
+        for column in df.columns:
+            if column in DROP_COLUMNS or column == "Embarked":
+                continue
+            output[column] = engineered[column] if column in engineered else df[column]
+        output["FamilySize"] = engineered["FamilySize"]
+        for column in self.dummy_columns:
+            output[column] = engineered[column]
+
+        if columns is not None:
+            # Name / Ticket features are derived only on request
+            output.update(self._text_features(df, [column for column in columns if column in TEXT_SOURCES]))
+            output = {column: output[column] for column in columns}
+
+        return pd.DataFrame(output, index=df.index, copy=False)
+
+    def _text_features(self, df, features):
+        """Computes the requested TEXT_FEATURES of a batch."""
+        sources = {TEXT_SOURCES[feature] for feature in features}
+        if (("Name" in sources and self.surname_counts is None)
+                or ("Ticket" in sources and self.ticket_counts is None)):
+            raise ValueError("Name / Ticket features need an engine fitted on data with the Name and Ticket columns.")
+
+        derived = {}
+        if "Name" in sources:
+            derived.update(name_features(df["Name"], self.title_fill, self.surname_counts))
+        if "Ticket" in sources:
+            derived.update(ticket_features(df["Ticket"], self.ticket_prefixes, self.ticket_counts))
+        return {feature: derived[feature] for feature in features}
+
+    def fit_transform(self, df, columns=None):
+        """Fits the engine on `df` and returns the transformed batch."""
+        return self.fit(df).transform(df, columns=columns)
+
+    # ---------------------------
+    # PERSISTENCE
+    # ---------------------------
+
+    def to_dict(self):
+        return {
+            "age_median": self.age_median,
+            "embarked_mode": self.embarked_mode,
+            "embarked_categories": self.embarked_categories,
+            "sex_fill": self.sex_fill,
+            "title_fill": self.title_fill,
+            "surname_counts": self.surname_counts,
+            "ticket_prefixes": self.ticket_prefixes,
+            "ticket_counts": self.ticket_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls()
+        engine.age_median = state["age_median"]
+        engine.embarked_mode = state["embarked_mode"]
+        engine.embarked_categories = list(state["embarked_categories"])
+        engine.sex_fill = state["sex_fill"]
+        # Engines saved before the text features existed have no vocabularies
+        engine.title_fill = state.get("title_fill")
+        engine.surname_counts = state.get("surname_counts")
+        engine.ticket_prefixes = state.get("ticket_prefixes")
+        engine.ticket_counts = state.get("ticket_counts")
+        return engine
+
+    def save(self, path):
+        """Saves the learned statistics to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a previously saved engine from a JSON file."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,149 @@
+# -------------------------------------------------------
+# OOB-DRIVEN FOREST GROWTH WITH EARLY STOPPING
+# -------------------------------------------------------
+# Grows the Random Forest of classification.py in increments of
+# trees with warm_start (earlier trees are kept, only new ones
+# are fitted) and tracks the out-of-bag (OOB) accuracy after each
+# increment. Growth stops once the OOB score has not improved by
+# more than `tol` for `patience` increments, and the forest is cut
+# back to the size with the best OOB score, so no trees that add
+# nothing are trained further or scored at inference time.
+#
+# The OOB score of very small forests is noisy (many rows have
+# only a few OOB votes), so patience only starts counting, and a
+# size can only be selected, from `min_estimators` trees on.
+#
+# A warm-started forest with the same random_state contains
+# exactly the trees a cold fit of that size would build, so the
+# chosen size can be cached as an ordinary fitted model.
+#
+# The stopping curve (trees vs. OOB score) is saved per model.
+# -------------------------------------------------------
+
+import os
+import time
+import warnings
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+
+from model_cache import cache_key, hash_data
+
+# -------------------------------------------------------
+# GROWTH
+# -------------------------------------------------------
+
+def grow_forest(model, X, y, step=10, min_estimators=50, max_estimators=500, patience=3, tol=0.002):
+    """
+    Grows a Random Forest until its OOB score plateaus.
+
+    Parameters:
+    - model (RandomForestClassifier): Unfitted forest (its n_estimators is ignored).
+    - X, y: Training data.
+    - step (int): Trees added per increment.
+    - min_estimators (int): Smallest forest size that can be selected; patience starts counting there.
+    - max_estimators (int): Upper limit on the forest size (always the last size tried).
+    - patience (int): Increments without improvement before stopping.
+    - tol (float): Minimum OOB accuracy gain that counts as an improvement.
+
+    Returns:
+    - tuple: (forest fitted with the best number of trees, stopping-curve DataFrame).
+    """
+    if not model.get_params()["bootstrap"]:
+        raise ValueError("OOB early stopping needs bootstrap=True (out-of-bag rows only exist with bootstrapping).")
+    if max_estimators < max(step, min_estimators):
+        raise ValueError(f"max_estimators ({max_estimators}) must be at least step ({step}) "
+                         f"and min_estimators ({min_estimators}).")
+
+    # Sizes tried: multiples of step, then max_estimators itself if it is not one
+    sizes = list(range(step, max_estimators + 1, step))
+    if sizes[-1] != max_estimators:
+        sizes.append(max_estimators)
+
+    forest = clone(model).set_params(warm_start=True, oob_score=True)
+    curve = []
+    best_score, best_n, best_oob_decision, stale = -1.0, 0, None, 0
+    total_seconds = 0.0
+
+    for n_estimators in sizes:
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            # Small forests leave some rows without OOB votes; the score is still comparable
+            warnings.filterwarnings("ignore", message="Some inputs do not have OOB scores")
+            forest.set_params(n_estimators=n_estimators).fit(X, y)
+        seconds = time.perf_counter() - start
+        total_seconds += seconds
+
+        score = forest.oob_score_
+        eligible = n_estimators >= min_estimators
+        improved = eligible and score > best_score + tol
+        if improved:
+            best_score, best_n, best_oob_decision, stale = score, n_estimators, forest.oob_decision_function_.copy(), 0
+        elif eligible:
+            stale += 1
+
+        curve.append({"n_estimators": n_estimators, "oob_score": score, "oob_error": 1 - score,
+                      "increment_seconds": seconds, "total_seconds": total_seconds, "improved": improved})
+        if stale >= patience:
+            break
+
+    # Cut the forest back to the best size (identical to a cold fit of model with that many trees)
+    forest.estimators_ = forest.estimators_[:best_n]
+    forest.set_params(**clone(model).set_params(n_estimators=best_n).get_params())
+    if model.get_params()["oob_score"]:
+        forest.oob_score_ = best_score
+        forest.oob_decision_function_ = best_oob_decision
+    else:
+        del forest.oob_score_, forest.oob_decision_function_
+
+    curve = pd.DataFrame(curve)
+    curve["selected"] = curve["n_estimators"] == best_n
+    return forest, curve
+
+def grow_models(models, X, y, output_dir, cache=None, renderer=None, **growth_kwargs):
+    """
+    Grows every Random Forest in the registry with OOB early stopping and saves
+    its stopping curve (CSV, plus a plot when a PlotRenderer is given).
+
+    The grown forests are returned already fitted, so the following training step
+    uses them instead of refitting. With a ModelCache they are also stored under
+    the key of their estimator, so later identical runs load them from disk.
+
+    Parameters:
+    - models (dict): Model name → unfitted estimator (as returned by build_models()).
+    - X, y: Training data.
+    - output_dir (str): Directory for the stopping-curve CSV files.
+
+    Returns:
+    - tuple: (the same registry with the forests' n_estimators set to the selected size,
+      dict model name → grown forest fitted on X, y).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    grown = dict(models)
+    prefitted = {}
+
+    for model_name, model in models.items():
+        if not isinstance(model, RandomForestClassifier):
+            continue
+
+        print(f"\n🌲 Growing {model_name} with OOB early stopping...")
+        forest, curve = grow_forest(model, X, y, **growth_kwargs)
+
+        curve_path = os.path.join(output_dir, f"{model_name}_oob_curve.csv")
+        curve.to_csv(curve_path, index=False)
+        if renderer is not None:
+            renderer.submit("oob_curve", model_name, n_estimators=curve["n_estimators"].to_numpy(),
+                            oob_scores=curve["oob_score"].to_numpy(), selected=forest.n_estimators)
+
+        best_score = curve.loc[curve["selected"], "oob_score"].iloc[0]
+        print(f"Stopped after {curve['n_estimators'].iloc[-1]} trees; selected {forest.n_estimators} trees "
+              f"(OOB accuracy {best_score:.3f}; configured: {model.n_estimators})")
+        print(f"Stopping curve saved to {curve_path}")
+
+        grown[model_name] = clone(model).set_params(n_estimators=forest.n_estimators)
+        prefitted[model_name] = forest
+        if cache is not None:
+            cache.put(cache_key(grown[model_name], hash_data(X, y), X.columns), forest)
+
+    return grown, prefitted
@@ -0,0 +1,136 @@
+# -------------------------------------------------------
+# SUCCESSIVE-HALVING HYPERPARAMETER SEARCH
+# -------------------------------------------------------
+# Tunes the tree models of classification.py (depth, leaf size,
+# number of trees; learning rate and iterations for the gradient
+# boosting model) with successive halving:
+# many cheap candidates are trained on small subsamples of the
+# training set, and only the best third of each round is
+# promoted to three times more data, up to the full set.
+# Candidates of a round are evaluated in parallel.
+#
+# A leaderboard of every evaluated candidate is written per model.
+# -------------------------------------------------------
+
+import os
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingRandomSearchCV)
+from sklearn.model_selection import HalvingRandomSearchCV
+
+# -------------------------------------------------------
+# SEARCH SPACES
+# -------------------------------------------------------
+
+PARAM_DISTRIBUTIONS = {
+    "DecisionTreeClassifier": {
+        "max_depth": [2, 3, 4, 5, 6, 8, 10, 12, 16, None],
+        "min_samples_leaf": [1, 2, 4, 8, 16, 32],
+    },
+    "RandomForestClassifier": {
+        "n_estimators": [25, 50, 100, 200, 300, 500],
+        "max_depth": [3, 4, 5, 6, 8, 10, 12, 16, None],
+        "min_samples_leaf": [1, 2, 4, 8, 16],
+    },
+    # Pipeline(FeatureBinner, HistGradientBoostingClassifier): parameters carry the step prefix
+    "HistGradientBoostingClassifier": {
+        "histgradientboostingclassifier__learning_rate": [0.03, 0.05, 0.1, 0.2],
+        "histgradientboostingclassifier__max_iter": [50, 100, 200, 400],
+        "histgradientboostingclassifier__max_leaf_nodes": [7, 15, 31, 63],
+        "histgradientboostingclassifier__min_samples_leaf": [5, 10, 20, 40],
+        "histgradientboostingclassifier__l2_regularization": [0.0, 0.1, 1.0],
+    },
+}
+
+# -------------------------------------------------------
+# SEARCH
+# -------------------------------------------------------
+
+def halving_search(model, param_distributions, X, y, n_candidates="exhaust", factor=3,
+                   min_resources="smallest", cv=5, scoring="accuracy", n_jobs=-1, random_state=42):
+    """
+    Runs a successive-halving random search over training-set size.
+
+    Parameters:
+    - model: Unfitted estimator.
+    - param_distributions (dict): Parameter name → list of candidate values.
+    - X, y: Training data.
+    - n_candidates (int or "exhaust"): Candidates in the first round ("exhaust" sizes the
+      first round so the last round uses the full data).
+    - factor (int): Candidates kept per round = 1/factor; data per round grows by factor.
+    - min_resources (int or "smallest"): Subsample size of the first round.
+    - cv (int): Cross-validation folds per candidate evaluation.
+    - n_jobs (int): Parallel candidate fits (-1 = all cores).
+
+    Returns:
+    - tuple: (fitted HalvingRandomSearchCV, leaderboard DataFrame).
+    """
+    search = HalvingRandomSearchCV(
+        clone(model),
+        param_distributions,
+        n_candidates=n_candidates,
+        factor=factor,
+        resource="n_samples",
+        min_resources=min_resources,
+        cv=cv,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        refit=False,
+    )
+    search.fit(X, y)
+    return search, leaderboard(search)
+
+def leaderboard(search):
+    """
+    Builds the leaderboard of every evaluated candidate, best first
+    (candidates that reached later rounds, i.e. more data, rank higher).
+
+    Returns:
+    - pd.DataFrame: Round, training samples, hyperparameters, CV score and fit time.
+    """
+    results = pd.DataFrame(search.cv_results_)
+    params = pd.DataFrame(list(results["params"]))
+    board = pd.concat([
+        results[["iter", "n_resources"]].rename(columns={"iter": "Round", "n_resources": "TrainingSamples"}),
+        params,
+        results[["mean_test_score", "std_test_score", "mean_fit_time"]].rename(columns={
+            "mean_test_score": "MeanScore", "std_test_score": "StdScore", "mean_fit_time": "MeanFitSeconds"}),
+    ], axis=1)
+    return board.sort_values(["Round", "MeanScore"], ascending=False).reset_index(drop=True)
+
+def tune_models(models, X, y, output_dir, **search_kwargs):
+    """
+    Tunes every model that has a search space in PARAM_DISTRIBUTIONS and writes
+    one leaderboard CSV per model.
+
+    Parameters:
+    - models (dict): Model name → unfitted estimator (as returned by build_models()).
+    - X, y: Training data used for the search.
+    - output_dir (str): Directory for the leaderboard CSV files.
+
+    Returns:
+    - dict: The same registry with tuned (unfitted) estimators for the searched models.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tuned = dict(models)
+
+    for model_name, model in models.items():
+        if model_name not in PARAM_DISTRIBUTIONS:
+            continue
+
+        print(f"\n🔍 Successive-halving search for {model_name}...")
+        search, board = halving_search(model, PARAM_DISTRIBUTIONS[model_name], X, y, **search_kwargs)
+
+        board_path = os.path.join(output_dir, f"{model_name}_leaderboard.csv")
+        board.to_csv(board_path, index=False)
+
+        rounds = ", ".join(f"{n} × {r} rows" for n, r in zip(search.n_candidates_, search.n_resources_))
+        print(f"Rounds: {rounds}")
+        print(f"Best parameters: {search.best_params_} (CV accuracy {search.best_score_:.3f})")
+        print(f"Leaderboard saved to {board_path}")
+
+        tuned[model_name] = clone(model).set_params(**search.best_params_)
+
+    return tuned
@@ -0,0 +1,226 @@
+# -------------------------------------------------------
+# OUT-OF-CORE INCREMENTAL TRAINING
+# -------------------------------------------------------
+# Trains a linear classifier on passenger files that do not fit
+# in memory. The CSV is read in chunks (utils.load_data with
+# chunksize); each chunk is preprocessed with frozen feature
+# statistics and used for one SGDClassifier(loss="log_loss")
+# partial_fit update, i.e. an incrementally trained logistic
+# regression. Weights are averaged over all updates (ASGD),
+# which keeps the model stable from the first epoch on.
+#
+#   - The feature engine and the feature scaler are fitted once,
+#     on the first chunk (or the engine is passed in fitted), and
+#     then frozen for the whole stream.
+#   - Every `holdout_every`-th row (up to `holdout_rows` rows) is
+#     never trained on and is kept as a bounded evaluation set.
+#   - Progress reports show throughput and the progressive
+#     accuracy (each chunk is scored before it is learned).
+#   - Checkpoints allow an interrupted run to resume.
+#
+# Memory is bounded by one chunk plus the hold-out set.
+# -------------------------------------------------------
+
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from features import FEATURES, TARGET, TitanicFeatureEngine
+from utils import load_data
+
+CLASSES = np.array([0, 1])
+
+
+class IncrementalTrainer:
+    """
+    Chunk-by-chunk trainer for an SGD logistic regression.
+
+    Parameters:
+    - features (list): Model features.
+    - engine (TitanicFeatureEngine, optional): Fitted statistics; fitted on the first chunk when omitted.
+    - holdout_every (int): Every n-th row of the stream is held out for evaluation.
+    - holdout_rows (int): Maximum number of held-out rows kept in memory.
+    - alpha (float): L2 regularisation strength of the SGDClassifier.
+    - random_state (int): Seed for the SGD updates and the within-chunk shuffling.
+    """
+
+    def __init__(self, features=FEATURES, engine=None, holdout_every=5, holdout_rows=100_000,
+                 alpha=1e-4, random_state=42):
+        self.features = list(features)
+        self.engine = engine
+        self.scaler = None
+        self.classifier = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=random_state)
+        self.holdout_every = holdout_every
+        self.holdout_rows = holdout_rows
+        self.random_state = random_state
+
+        # Progress through the stream (saved in checkpoints)
+        self.epoch = 0
+        self.chunks_done = 0
+        self.rows_trained = 0
+        self._holdout_X = []
+        self._holdout_y = []
+
+    # ---------------------------------------------------
+    # Training
+    # ---------------------------------------------------
+
+    def _holdout_mask(self, first_row, n_rows):
+        rows = np.arange(first_row, first_row + n_rows)
+        return (rows % self.holdout_every == 0) & (rows // self.holdout_every < self.holdout_rows)
+
+    def partial_fit_chunk(self, chunk, first_row, chunk_index):
+        """
+        Preprocesses one raw chunk with the frozen statistics and applies one update.
+
+        Parameters:
+        - chunk (pd.DataFrame): Raw passenger rows (as read by utils.load_data).
+        - first_row (int): Position of the chunk's first row in the stream (selects hold-out rows).
+        - chunk_index (int): Position of the chunk in the stream (seeds the shuffling).
+
+        Returns:
+        - float or None: Accuracy of the model on the chunk before the update.
+        """
+        held_out = self._holdout_mask(first_row, len(chunk))
+        if self.engine is None:
+            self.engine = TitanicFeatureEngine().fit(chunk[~held_out])
+
+        df = self.engine.transform(chunk, columns=self.features + [TARGET])
+        X = df[self.features].astype(np.float64)
+        y = df[TARGET].to_numpy()
+
+        if self.epoch == 0 and held_out.any():
+            self._holdout_X.append(X.to_numpy()[held_out])
+            self._holdout_y.append(y[held_out])
+        X, y = X[~held_out], y[~held_out]
+        if len(y) == 0:
+            return None
+
+        if self.scaler is None:
+            self.scaler = StandardScaler().fit(X)
+        X = self.scaler.transform(X)
+
+        # Progressive validation: score the chunk before learning from it
+        accuracy = None
+        if hasattr(self.classifier, "coef_"):
+            accuracy = float((self.classifier.predict(X) == y).mean())
+
+        order = np.random.default_rng([self.random_state, self.epoch, chunk_index]).permutation(len(y))
+        self.classifier.partial_fit(X[order], y[order], classes=CLASSES)
+        self.rows_trained += len(y)
+        return accuracy
+
+    def fit_file(self, file_path, chunksize=100_000, epochs=1, checkpoint_path=None, checkpoint_every=10):
+        """
+        Streams a passenger CSV through partial_fit for a number of epochs.
+
+        Parameters:
+        - file_path (str): Passenger CSV (titanic.csv columns).
+        - chunksize (int): Rows read and learned per update.
+        - epochs (int): Passes over the file.
+        - checkpoint_path (str, optional): Checkpoint file written every `checkpoint_every`
+          chunks and at the end of every epoch. A trainer restored with
+          load_checkpoint() skips the chunks it has already learned.
+
+        Returns:
+        - IncrementalTrainer: self.
+        """
+        start = time.perf_counter()
+        rows_at_start = self.rows_trained
+
+        while self.epoch < epochs:
+            first_row = 0
+            for chunk_index, chunk in enumerate(load_data(file_path, features=self.features, chunksize=chunksize)):
+                chunk_first_row, first_row = first_row, first_row + len(chunk)
+                if chunk_index < self.chunks_done:
+                    continue  # Already learned before the checkpoint
+
+                accuracy = self.partial_fit_chunk(chunk, chunk_first_row, chunk_index)
+                self.chunks_done = chunk_index + 1
+
+                elapsed = time.perf_counter() - start
+                throughput = (self.rows_trained - rows_at_start) / elapsed if elapsed > 0 else 0
+                progressive = f" · progressive accuracy {accuracy:.3f}" if accuracy is not None else ""
+                print(f"Epoch {self.epoch + 1}/{epochs} · chunk {self.chunks_done} · "
+                      f"{self.rows_trained:,} rows trained · {throughput:,.0f} rows/s{progressive}")
+
+                if checkpoint_path and self.chunks_done % checkpoint_every == 0:
+                    self.save_checkpoint(checkpoint_path)
+
+            self.epoch += 1
+            self.chunks_done = 0
+            if checkpoint_path:
+                self.save_checkpoint(checkpoint_path)
+        return self
+
+    # ---------------------------------------------------
+    # Results
+    # ---------------------------------------------------
+
+    @property
+    def model(self):
+        """Scaler + classifier pipeline that scores preprocessed feature matrices."""
+        return make_pipeline(self.scaler, self.classifier)
+
+    def holdout(self):
+        """
+        Returns:
+        - tuple: (X_holdout DataFrame, y_holdout Series) of the rows never trained on.
+        """
+        X = np.concatenate(self._holdout_X) if self._holdout_X else np.empty((0, len(self.features)))
+        y = np.concatenate(self._holdout_y) if self._holdout_y else np.empty(0, dtype=np.int64)
+        return pd.DataFrame(X, columns=self.features), pd.Series(y, name=TARGET)
+
+    # ---------------------------------------------------
+    # Checkpoints
+    # ---------------------------------------------------
+
+    def save_checkpoint(self, path):
+        """Writes the trainer state atomically (an interrupted write never corrupts the last checkpoint)."""
+        X_holdout, y_holdout = self.holdout()
+        state = {
+            "features": self.features,
+            "engine": self.engine.to_dict() if self.engine is not None else None,
+            "scaler": self.scaler,
+            "classifier": self.classifier,
+            "holdout_every": self.holdout_every,
+            "holdout_rows": self.holdout_rows,
+            "random_state": self.random_state,
+            "epoch": self.epoch,
+            "chunks_done": self.chunks_done,
+            "rows_trained": self.rows_trained,
+            "holdout": (X_holdout.to_numpy(), y_holdout.to_numpy()),
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(state, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Restores a trainer saved with save_checkpoint()."""
+        state = joblib.load(path)
+        engine = TitanicFeatureEngine.from_dict(state["engine"]) if state["engine"] is not None else None
+        trainer = cls(state["features"], engine, state["holdout_every"], state["holdout_rows"],
+                      random_state=state["random_state"])
+        trainer.scaler = state["scaler"]
+        trainer.classifier = state["classifier"]
+        trainer.epoch = state["epoch"]
+        trainer.chunks_done = state["chunks_done"]
+        trainer.rows_trained = state["rows_trained"]
+        X_holdout, y_holdout = state["holdout"]
+        if len(y_holdout) > 0:
+            trainer._holdout_X, trainer._holdout_y = [X_holdout], [y_holdout]
+        return trainer
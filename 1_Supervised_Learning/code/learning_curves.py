@@ -0,0 +1,194 @@
+# -------------------------------------------------------
+# PARALLEL LEARNING CURVES
+# -------------------------------------------------------
+# Trains every registered model on nested subsamples of the
+# training set (1% → 100%) and records, per model and size:
+#   - train accuracy (on the subsample) and test accuracy
+#   - fit time and peak memory allocated by the fit (tracemalloc)
+#
+# Subsamples are prefixes of one stratified shuffle of the
+# training rows, so each size contains all rows of the smaller
+# sizes and roughly the full class balance. All (model, size)
+# fits run in a process pool; the training and test data are
+# copied into shared memory once (parallel_training.py helpers)
+# and each task only receives its model and row count.
+#
+# tracemalloc slows allocation-heavy fits down; use
+# track_memory=False (--no-memory) for comparable timings.
+#
+# For each model the "plateau size" is the smallest training size
+# whose test accuracy is within `tol` of the best one: adding data
+# beyond it no longer pays off.
+# -------------------------------------------------------
+
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from parallel_training import attach_array, share_array
+
+DEFAULT_FRACTIONS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0]
+
+# -------------------------------------------------------
+# SUBSAMPLES
+# -------------------------------------------------------
+
+def nested_order(y, random_state=42):
+    """
+    Returns a row order whose every prefix is a stratified random subsample.
+
+    Rows are shuffled within each class and interleaved by their relative
+    rank in the class, so the first k rows keep the class balance of y.
+    """
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    position = np.empty(len(y))
+    for label in np.unique(y):
+        rows = np.flatnonzero(y == label)
+        # Relative rank in (0, 1) of each row of this class, in shuffled order
+        position[rng.permutation(rows)] = (np.arange(len(rows)) + rng.random()) / len(rows)
+    return np.argsort(position, kind="stable")
+
+def subsample_sizes(n_rows, fractions=DEFAULT_FRACTIONS, min_rows=10):
+    """Returns the distinct training-set sizes for the given fractions (at least min_rows each)."""
+    sizes = [min(n_rows, max(min_rows, int(round(fraction * n_rows)))) for fraction in fractions]
+    return sorted(set(sizes))
+
+# -------------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------------
+
+# Arrays attached once per worker process by _init_worker
+_shared = {}
+
+def _init_worker(specs, columns):
+    for key, spec in specs.items():
+        _shared[key] = attach_array(spec)
+    _shared["columns"] = columns
+
+def _fit_subsample(model_name, model, n_rows, track_memory):
+    """Fits one model on the first n_rows of the shared (pre-shuffled) training data and scores it."""
+    columns = _shared["columns"]
+    X_train = pd.DataFrame(_shared["X_train"][1][:n_rows], columns=columns, copy=False)
+    y_train = _shared["y_train"][1][:n_rows]
+    X_test = pd.DataFrame(_shared["X_test"][1], columns=columns, copy=False)
+    y_test = _shared["y_test"][1]
+
+    record = {"Model": model_name, "TrainRows": n_rows}
+    if len(np.unique(y_train)) < 2:
+        # Too few rows to contain both classes: nothing to fit
+        return {**record, "TrainAccuracy": np.nan, "TestAccuracy": np.nan, "FitSeconds": np.nan, "PeakMB": np.nan}
+
+    if track_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2 if track_memory else np.nan
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+
+    return {
+        **record,
+        "TrainAccuracy": float(np.mean(model.predict(X_train) == y_train)),
+        "TestAccuracy": float(np.mean(model.predict(X_test) == y_test)),
+        "FitSeconds": fit_seconds,
+        "PeakMB": peak_mb,
+    }
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+def plateau_sizes(curves, tol=0.01):
+    """
+    Returns, per model, the smallest training size whose test accuracy is within tol of its best.
+
+    Returns:
+    - dict: Model name → training rows.
+    """
+    plateaus = {}
+    for model_name, curve in curves.groupby("Model", sort=False):
+        curve = curve.dropna(subset=["TestAccuracy"])
+        good_enough = curve["TestAccuracy"] >= curve["TestAccuracy"].max() - tol
+        plateaus[model_name] = int(curve.loc[good_enough, "TrainRows"].min())
+    return plateaus
+
+def learning_curves(models, X_train, y_train, X_test, y_test, fractions=DEFAULT_FRACTIONS,
+                    max_workers=None, track_memory=True, random_state=42):
+    """
+    Computes learning curves for every model in a process pool backed by shared memory.
+
+    Parameters:
+    - models (dict): Model name → unfitted estimator (as returned by build_models()).
+    - X_train (pd.DataFrame), y_train: Full training data; subsamples are nested prefixes of it.
+    - X_test, y_test: Held-out data scored at every size.
+    - fractions (list): Fractions of the training set to train on.
+    - max_workers (int, optional): Pool size (defaults to the CPU count).
+    - track_memory (bool): Record the peak memory allocated by each fit (slows fits down).
+
+    Returns:
+    - pd.DataFrame: One row per model and size (Model, TrainRows, TrainFraction,
+      TrainAccuracy, TestAccuracy, FitSeconds, PeakMB), in registration and size order.
+    """
+    order = nested_order(y_train, random_state)
+    sizes = subsample_sizes(len(order), fractions)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    blocks = {}
+    try:
+        # Training rows are shared in nested order, so a subsample is a zero-copy prefix
+        blocks["X_train"] = share_array(X_train.to_numpy(dtype=np.float64)[order])
+        blocks["y_train"] = share_array(np.asarray(y_train)[order])
+        blocks["X_test"] = share_array(X_test.to_numpy(dtype=np.float64))
+        blocks["y_test"] = share_array(np.asarray(y_test))
+        specs = {key: spec for key, (_, spec) in blocks.items()}
+
+        records = []
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(specs, list(X_train.columns))) as pool:
+            # Largest fits first, so the small ones fill the gaps at the end
+            tasks = [(name, model, size) for size in reversed(sizes) for name, model in models.items()]
+            futures = [pool.submit(_fit_subsample, name, model, size, track_memory) for name, model, size in tasks]
+            for future in as_completed(futures):
+                records.append(future.result())
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    curves = pd.DataFrame(records)
+    curves["Model"] = pd.Categorical(curves["Model"], categories=list(models))
+    curves = curves.sort_values(["Model", "TrainRows"], ignore_index=True)
+    curves["Model"] = curves["Model"].astype(str)
+    curves.insert(2, "TrainFraction", curves["TrainRows"] / len(order))
+    return curves
+
+def save_learning_curves(curves, output_dir, renderer=None, tol=0.01):
+    """
+    Saves the curves as CSV, queues one plot per model on a PlotRenderer and
+    prints the plateau size of each model.
+
+    Returns:
+    - dict: Model name → plateau size (see plateau_sizes()).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    curves_path = os.path.join(output_dir, "learning_curves.csv")
+    curves.to_csv(curves_path, index=False)
+
+    plateaus = plateau_sizes(curves, tol)
+    for model_name, curve in curves.groupby("Model", sort=False):
+        print(f"{model_name}: test accuracy within {tol:.2f} of its best from {plateaus[model_name]} "
+              f"training rows ({plateaus[model_name] / curve['TrainRows'].max():.0%})")
+        if renderer is not None:
+            renderer.submit("learning_curve", model_name, train_rows=curve["TrainRows"].to_numpy(),
+                            train_scores=curve["TrainAccuracy"].to_numpy(),
+                            test_scores=curve["TestAccuracy"].to_numpy(), plateau=plateaus[model_name])
+    print(f"Learning curves saved to {curves_path}")
+    return plateaus
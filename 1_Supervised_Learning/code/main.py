@@ -2,6 +2,9 @@
 # IMPORT REQUIRED LIBRARIES
 # -------------------------------------------------------
 
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -10,6 +13,13 @@ from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 
+from features import FEATURES, TARGET, TitanicFeatureEngine
+from cross_validation import cross_validate
+from feature_store import load_feature_store
+from incremental_training import IncrementalTrainer
+from model_cache import ModelCache
+from utils import load_data as load_titanic_csv
+
 # -------------------------------------------------------
 # FILE PATH CONFIGURATION
 # -------------------------------------------------------
@@ -17,6 +27,15 @@ from sklearn.metrics import classification_report, accuracy_score, confusion_mat
 # Define the dataset location (Ensure the correct path before execution)
 FILE_PATH = "C:/Users/antho/Documents/AI and ML Internship Projects/1_Supervised_Learning/data/titanic.csv"
 
+# Fitted models are cached here, keyed by data hash, features and hyperparameters
+MODEL_CACHE_DIR = "../results/model_cache"
+
+# Memory-mapped preprocessed features written by utils.preprocess_and_save (--from-store)
+FEATURE_STORE_DIR = "../data/Processed/titanic_cleaned_store"
+
+# Streaming (--stream) training checkpoints
+CHECKPOINT_PATH = "../results/checkpoints/incremental_sgd.joblib"
+
 # -------------------------------------------------------
 # FUNCTION DEFINITIONS
 # -------------------------------------------------------
@@ -24,9 +43,11 @@ FILE_PATH = "C:/Users/antho/Documents/AI and ML Internship Projects/1_Supervised
 def load_data(file_path):
     """
     Loads the Titanic dataset from a CSV file and returns a Pandas DataFrame.
+    Only the columns needed for the model features are read, with declared
+    compact dtypes (see utils.TITANIC_DTYPES).
     Provides an initial overview of the dataset structure.
     """
-    df = pd.read_csv(file_path)
+    df = load_titanic_csv(file_path, features=FEATURES)
     
     print("\n✅ Dataset Loaded Successfully")
     print(df.info())  # Display dataset structure
@@ -34,22 +55,16 @@ def load_data(file_path):
     
     return df
 
-def preprocess_data(df):
+def preprocess_data(df, engine=None):
     """
     Handles missing values, encodes categorical variables, 
     and creates additional features to enhance model performance.
+    Reuses the statistics of `engine` (a fitted TitanicFeatureEngine) when given.
     """
-    # Handle missing values
-    df["Age"].fillna(df["Age"].median(), inplace=True)  # Fill missing Age values with median
-    df["Embarked"].fillna(df["Embarked"].mode()[0], inplace=True)  # Fill missing Embarked values with mode
-    df.drop(columns=["Cabin"], inplace=True, errors='ignore')  # Drop Cabin due to excessive missing data
-
-    # Feature Engineering: Create FamilySize (Combining SibSp & Parch)
-    df["FamilySize"] = df["SibSp"] + df["Parch"] + 1
-
-    # Convert categorical variables to numerical
-    df["Sex"] = df["Sex"].map({"male": 0, "female": 1})  # Encode gender (0 = Male, 1 = Female)
-    df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)  # One-hot encode Embarked feature
+    # Handle missing values, drop Cabin, create FamilySize and encode Sex / Embarked
+    if engine is None:
+        engine = TitanicFeatureEngine().fit(df)  # Learn medians, modes and dummy vocabulary once
+    df = engine.transform(df)
 
     print("\n✅ Data Preprocessing Completed")
     print(df.head())  # Preview first few rows after preprocessing
@@ -61,9 +76,8 @@ def split_data(df):
     Splits the dataset into training (80%) and testing (20%) sets.
     Defines the feature set and target variable.
     """
-    features = ["Pclass", "Sex", "Age", "Fare", "FamilySize", "Embarked_Q", "Embarked_S"]
-    X = df[features]  # Predictor variables
-    y = df["Survived"]  # Target variable (0 = Not Survived, 1 = Survived)
+    X = df[FEATURES]  # Predictor variables
+    y = df[TARGET]  # Target variable (0 = Not Survived, 1 = Survived)
 
     # Perform train-test split
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
@@ -74,16 +88,60 @@ def split_data(df):
 
     return X_train, X_test, y_train, y_test
 
-def train_model(X_train, y_train):
+def train_model(X_train, y_train, cache=None):
     """
     Trains a Logistic Regression model and returns the trained model.
+    With a ModelCache, an identical previous fit (same data, features and
+    hyperparameters) is loaded from disk instead of refitting.
     """
     model = LogisticRegression(max_iter=200)
-    model.fit(X_train, y_train)
+    if cache is None:
+        model.fit(X_train, y_train)
+    else:
+        model, cached = cache.fit(model, X_train, y_train, FEATURES)
+        if cached:
+            print("\n♻️ Loaded identical fitted model from the model cache")
 
     print("\n✅ Model Training Completed")
     return model
 
+def train_model_streaming(file_path, chunksize=100_000, epochs=1, checkpoint_path=None, resume=False):
+    """
+    Trains an incremental (SGD) Logistic Regression on a CSV that does not fit in memory.
+    The file is read in chunks, each chunk is preprocessed with statistics frozen on the
+    first chunk and applied as one partial_fit update. Every 5th row (up to 100k rows)
+    is held out for evaluation. With `resume`, training continues from the checkpoint.
+
+    Returns:
+    - tuple: (trained model, X_holdout, y_holdout).
+    """
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        trainer = IncrementalTrainer.load_checkpoint(checkpoint_path)
+        print(f"\n♻️ Resuming from checkpoint (epoch {trainer.epoch + 1}, {trainer.chunks_done} chunks done)")
+    else:
+        trainer = IncrementalTrainer(FEATURES)
+
+    trainer.fit_file(file_path, chunksize=chunksize, epochs=epochs, checkpoint_path=checkpoint_path)
+    X_holdout, y_holdout = trainer.holdout()
+
+    print("\n✅ Streaming Model Training Completed")
+    print(f"Rows trained: {trainer.rows_trained:,} · Hold-out rows: {len(y_holdout):,}")
+    return trainer.model, X_holdout, y_holdout
+
+def cross_validate_model(df, n_splits=5):
+    """
+    Estimates Logistic Regression performance with parallel stratified k-fold
+    cross-validation (each fold warm-started from the previous fold's coefficients)
+    and prints per-fold and aggregate metrics.
+    """
+    fold_df, summary_df = cross_validate(LogisticRegression(max_iter=200), df[FEATURES], df[TARGET], n_splits=n_splits)
+
+    print(f"\n📊 {n_splits}-Fold Cross-Validation Results:")
+    print(fold_df.to_string(index=False))
+    print("\nAggregate Metrics:")
+    print(summary_df)
+    return fold_df, summary_df
+
 def evaluate_model(model, X_test, y_test):
     """
     Evaluates the trained model on the test set and prints 
@@ -103,23 +161,57 @@ def evaluate_model(model, X_test, y_test):
 # -------------------------------------------------------
 
 if __name__ == "__main__":
-    print("\n🚀 Starting Data Pipeline...\n")
-
-    # Load dataset
-    df = load_data(FILE_PATH)
-
-    # Preprocess dataset
-    df = preprocess_data(df)
-
-    # Split data into training and testing sets
-    X_train, X_test, y_train, y_test = split_data(df)
-
-    # Train model
-    print("\n🔄 Training Logistic Regression Model...")
-    model = train_model(X_train, y_train)
-
-    # Evaluate model performance
-    print("\n📊 Evaluating Model Performance...")
-    evaluate_model(model, X_test, y_test)
+    parser = argparse.ArgumentParser(description="Titanic Logistic Regression pipeline.")
+    parser.add_argument("--cv-folds", type=int, default=0,
+                        help="Also run parallel k-fold cross-validation with this many folds (0 = skip).")
+    parser.add_argument("--from-store", action="store_true",
+                        help="Open the preprocessed features from the memory-mapped feature store instead of the raw CSV.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Train out-of-core: read the CSV in chunks and update an SGD logistic regression.")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk in --stream mode.")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the file in --stream mode.")
+    parser.add_argument("--resume", action="store_true", help="Resume --stream training from the last checkpoint.")
+    args = parser.parse_args()
+
+    if args.stream:
+        print("\n🚀 Starting Streaming Training Pipeline...\n")
+
+        # Train out-of-core on chunks of the CSV
+        model, X_test, y_test = train_model_streaming(
+            FILE_PATH, chunksize=args.chunksize, epochs=args.epochs,
+            checkpoint_path=CHECKPOINT_PATH, resume=args.resume)
+
+        # Evaluate on the held-out rows
+        print("\n📊 Evaluating Model Performance on Hold-out Rows...")
+        evaluate_model(model, X_test, y_test)
+    else:
+        print("\n🚀 Starting Data Pipeline...\n")
+
+        if args.from_store:
+            # Open the already preprocessed features (memory-mapped, no parsing)
+            df = load_feature_store(FEATURE_STORE_DIR, columns=FEATURES + [TARGET])
+            print(f"\n✅ Preprocessed features opened from {FEATURE_STORE_DIR} ({len(df):,} rows)")
+        else:
+            # Load dataset
+            df = load_data(FILE_PATH)
+
+            # Preprocess dataset
+            df = preprocess_data(df)
+
+        # Split data into training and testing sets
+        X_train, X_test, y_train, y_test = split_data(df)
+
+        # Train model
+        print("\n🔄 Training Logistic Regression Model...")
+        model = train_model(X_train, y_train, cache=ModelCache(MODEL_CACHE_DIR))
+
+        # Evaluate model performance
+        print("\n📊 Evaluating Model Performance...")
+        evaluate_model(model, X_test, y_test)
+
+        # Cross-validated estimate of model quality
+        if args.cv_folds > 1:
+            print(f"\n🔁 Running {args.cv_folds}-Fold Cross-Validation...")
+            cross_validate_model(df, n_splits=args.cv_folds)
 
     print("\n✅ Pipeline Completed Successfully!")
@@ -0,0 +1,102 @@
+# -------------------------------------------------------
+# MODEL BUNDLE (PREPROCESSING + MODEL)
+# -------------------------------------------------------
+# A single persisted artifact holding the fitted feature engine
+# statistics, the trained model and its feature list, so raw
+# passenger records can be scored without re-running the
+# training scripts. Small batches of tree models are scored with
+# the flattened array scorer (tree_scorer.py), which returns the
+# same results as sklearn with far less per-call overhead; large
+# batches go to sklearn's compiled traversal, which wins there.
+# Tree bundles can also explain their scores per passenger
+# (tree_shap.py).
+# -------------------------------------------------------
+
+import joblib
+import pandas as pd
+
+from features import TitanicFeatureEngine
+from tree_scorer import FlatTreeEnsemble
+from tree_shap import TreeShapExplainer
+
+# Largest batch scored with the flattened tree scorer (sklearn is faster beyond ~1000 rows)
+FLAT_SCORER_MAX_ROWS = 512
+
+
+class ModelBundle:
+    """
+    Fitted TitanicFeatureEngine + trained classifier.
+
+    Parameters:
+    - engine (TitanicFeatureEngine): Fitted preprocessing statistics.
+    - model: Trained scikit-learn classifier.
+    - features (list): Model input features, in training order.
+    - model_name (str): Name used in reports and file names.
+    """
+
+    def __init__(self, engine, model, features, model_name):
+        self.engine = engine
+        self.model = model
+        self.features = list(features)
+        self.model_name = model_name
+        # Tree models are also packed into node arrays for low-latency small-batch scoring
+        self.flat_model = FlatTreeEnsemble.from_model(model) if FlatTreeEnsemble.supports(model) else None
+        self._explainer = None  # Built on the first explain() call
+
+    def predict(self, df):
+        """
+        Preprocesses raw passengers with the frozen statistics and scores them.
+
+        Parameters:
+        - df (pd.DataFrame): Raw passenger records (Titanic CSV columns).
+
+        Returns:
+        - tuple: (predicted labels, survival probabilities or None).
+        """
+        X = self.engine.transform(df, columns=self.features)
+        scorer = self.flat_model if self.flat_model is not None and len(X) <= FLAT_SCORER_MAX_ROWS else self.model
+        y_pred = scorer.predict(X)
+        y_proba = scorer.predict_proba(X)[:, 1] if hasattr(scorer, "predict_proba") else None
+        return y_pred, y_proba
+
+    def explain(self, df, n_jobs=1):
+        """
+        Computes per-passenger feature attributions of the survival probability (tree models only).
+
+        Parameters:
+        - df (pd.DataFrame): Raw passenger records (Titanic CSV columns).
+        - n_jobs (int): Worker processes used for large batches.
+
+        Returns:
+        - tuple: (expected value, (rows × features) attribution matrix in self.features order).
+        """
+        if self.flat_model is None:
+            raise TypeError(f"{self.model_name} is not a tree model; attributions are only available for tree models.")
+        if self._explainer is None:
+            self._explainer = TreeShapExplainer(self.model)
+        X = self.engine.transform(df, columns=self.features)
+        return self._explainer.expected_value, self._explainer.explain(X, n_jobs=n_jobs)
+
+    def predict_records(self, records):
+        """Scores a list of passenger dicts (e.g. parsed JSON)."""
+        return self.predict(pd.DataFrame.from_records(records))
+
+    def save(self, path):
+        """Saves the bundle with joblib (engine statistics are stored as a plain dict)."""
+        joblib.dump({
+            "engine": self.engine.to_dict(),
+            "model": self.model,
+            "features": self.features,
+            "model_name": self.model_name,
+        }, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a bundle saved with save()."""
+        state = joblib.load(path)
+        return cls(
+            TitanicFeatureEngine.from_dict(state["engine"]),
+            state["model"],
+            state["features"],
+            state["model_name"],
+        )
@@ -0,0 +1,167 @@
+# -------------------------------------------------------
+# CONTENT-ADDRESSED TRAINING CACHE
+# -------------------------------------------------------
+# Stores fitted models on disk under a key derived from:
+#   - a hash of the training data (features + target)
+#   - the feature list
+#   - the estimator class and its hyperparameters
+#   - the scikit-learn version
+# A run with identical inputs loads the fitted model instead
+# of refitting it. The cache directory is bounded in size and
+# evicts least-recently-used entries first.
+# -------------------------------------------------------
+
+import hashlib
+import json
+import os
+import tempfile
+
+import joblib
+import pandas as pd
+import sklearn
+
+# -------------------------------------------------------
+# CACHE KEYS
+# -------------------------------------------------------
+
+def hash_data(X, y=None):
+    """
+    Computes a content hash of a feature matrix (and optional target).
+
+    Parameters:
+    - X (pd.DataFrame): Feature matrix.
+    - y (pd.Series, optional): Target values.
+
+    Returns:
+    - str: Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([list(map(str, X.columns)), list(map(str, X.dtypes))]).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    if y is not None:
+        digest.update(pd.util.hash_pandas_object(y, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def cache_key(model, data_hash, features):
+    """
+    Builds the cache key for an (unfitted) estimator trained on hashed data.
+
+    Returns:
+    - str: Hex SHA-256 digest.
+    """
+    description = {
+        "data": data_hash,
+        "features": list(features),
+        "estimator": f"{type(model).__module__}.{type(model).__name__}",
+        "params": model.get_params(deep=True),
+        "sklearn": sklearn.__version__,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+# -------------------------------------------------------
+# CACHE STORE
+# -------------------------------------------------------
+
+def evict_lru(cache_dir, max_bytes, suffix=".joblib"):
+    """
+    Removes least-recently-used (oldest mtime) `suffix` files from cache_dir
+    until their total size fits in max_bytes. Files that cannot be removed
+    (e.g. still open on Windows) are skipped.
+
+    Returns:
+    - int: Number of evicted entries.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(suffix):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError:
+            continue
+        total -= size
+        evicted += 1
+    return evicted
+
+
+class ModelCache:
+    """
+    Size-bounded on-disk cache of fitted models.
+
+    Parameters:
+    - cache_dir (str): Directory holding one .joblib file per cached model.
+    - max_bytes (int): Total size limit; least-recently-used entries are evicted above it.
+    """
+
+    def __init__(self, cache_dir, max_bytes=500 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.evict()  # Apply a (possibly lowered) size limit to existing entries
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.joblib")
+
+    def get(self, key):
+        """
+        Returns the cached model for `key`, or None on a miss.
+        A hit refreshes the entry's access time for LRU eviction.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            model = joblib.load(path)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache entry {path}: {e}")
+            return None
+        os.utime(path)  # Mark as recently used
+        return model
+
+    def put(self, key, model):
+        """Stores a fitted model (atomically) and evicts old entries if the cache is too large."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp_path)
+            if os.path.getsize(tmp_path) > self.max_bytes:
+                print(f"⚠️ {type(model).__name__} is larger than the model cache limit – not cached.")
+                return
+            os.replace(tmp_path, self._path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes least-recently-used entries until the cache fits in max_bytes.
+
+        Returns:
+        - int: Number of evicted entries.
+        """
+        return evict_lru(self.cache_dir, self.max_bytes)
+
+    def fit(self, model, X, y, features=None):
+        """
+        Fits `model` on (X, y) unless an identical fit is cached.
+
+        Returns:
+        - tuple: (fitted model, True if it was loaded from the cache).
+        """
+        key = cache_key(model, hash_data(X, y), features if features is not None else list(X.columns))
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        model.fit(X, y)
+        self.put(key, model)
+        return model, False
@@ -0,0 +1,148 @@
+# -------------------------------------------------------
+# PARALLEL MODEL-ZOO TRAINING
+# -------------------------------------------------------
+# Fits every registered model at once in a process pool.
+#
+# X_train, y_train and X_test are copied into shared memory
+# a single time; each worker attaches to the same blocks when
+# it starts, so the training data is never pickled per model.
+# Only the (small) estimator and its predictions travel
+# between processes.
+# -------------------------------------------------------
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------
+# SHARED-MEMORY HELPERS
+# -------------------------------------------------------
+
+def share_array(array):
+    """
+    Copies a NumPy array into a new shared-memory block.
+
+    Parameters:
+    - array (np.ndarray): Array to share.
+
+    Returns:
+    - tuple: (SharedMemory block, spec dict with name/shape/dtype used by attach_array).
+    """
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    spec = {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+    return shm, spec
+
+def attach_array(spec):
+    """
+    Attaches to a shared-memory block created by share_array (zero-copy).
+
+    Returns:
+    - tuple: (SharedMemory block, read-only np.ndarray view).
+    """
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    array = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+    array.flags.writeable = False
+    return shm, array
+
+# -------------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------------
+
+# Arrays attached once per worker process by _init_worker
+_shared = {}
+
+def _init_worker(specs, columns):
+    for key, spec in specs.items():
+        _shared[key] = attach_array(spec)
+    _shared["columns"] = columns
+
+def _shared_frame(key):
+    """Wraps a shared feature matrix in a DataFrame without copying it."""
+    return pd.DataFrame(_shared[key][1], columns=_shared["columns"], copy=False)
+
+def _fit_model(model_name, model):
+    """Fits one model on the shared training data and predicts the shared test set."""
+    X_train = _shared_frame("X_train")
+    y_train = _shared["y_train"][1]
+    X_test = _shared_frame("X_test")
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = model.predict(X_test)
+    y_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+
+    return model_name, model, y_pred, y_proba, fit_seconds
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+def train_models_parallel(models, X_train, y_train, X_test, max_workers=None):
+    """
+    Trains all models concurrently in a process pool backed by shared memory.
+
+    Parameters:
+    - models (dict): Model name → unfitted estimator.
+    - X_train (pd.DataFrame), y_train: Training features and target.
+    - X_test (pd.DataFrame): Test features used to generate predictions.
+    - max_workers (int, optional): Pool size (defaults to one worker per model, capped at CPU count).
+
+    Returns:
+    - dict: Model name → {"model", "y_pred", "y_proba", "fit_seconds"} in registration order.
+    """
+    if max_workers is None:
+        max_workers = min(len(models), os.cpu_count() or 1)
+
+    blocks = {}
+    try:
+        # Features are shared as one float64 matrix (the dtype the estimators convert to anyway)
+        blocks["X_train"] = share_array(X_train.to_numpy(dtype=np.float64))
+        blocks["X_test"] = share_array(X_test.to_numpy(dtype=np.float64))
+        blocks["y_train"] = share_array(np.asarray(y_train))
+        specs = {key: spec for key, (_, spec) in blocks.items()}
+        columns = list(X_train.columns)
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(specs, columns)) as pool:
+            futures = [pool.submit(_fit_model, name, model) for name, model in models.items()]
+            for future in as_completed(futures):
+                model_name, model, y_pred, y_proba, fit_seconds = future.result()
+                results[model_name] = {
+                    "model": model,
+                    "y_pred": y_pred,
+                    "y_proba": y_proba,
+                    "fit_seconds": fit_seconds,
+                }
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    return {name: results[name] for name in models}
+
+def results_table(results, y_test):
+    """
+    Gathers per-model training results into one DataFrame.
+
+    Returns:
+    - pd.DataFrame: One row per model with accuracy, fit time and whether it came from the model cache.
+    """
+    y_test = np.asarray(y_test)
+    return pd.DataFrame([
+        {
+            "Model": model_name,
+            "Accuracy": float(np.mean(result["y_pred"] == y_test)),
+            "FitSeconds": result["fit_seconds"],
+            "Cached": result.get("cached", False),
+        }
+        for model_name, result in results.items()
+    ])
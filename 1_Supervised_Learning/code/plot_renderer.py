@@ -0,0 +1,184 @@
+# -------------------------------------------------------
+# BACKGROUND PLOT RENDERING QUEUE
+# -------------------------------------------------------
+# Renders the per-model diagnostic plots (ROC, precision-recall,
+# confusion matrix, feature importance, OOB stopping curve,
+# learning curve) off the training path.
+#
+# Plot jobs are queued with PlotRenderer.submit() and rendered
+# in worker processes with the headless Agg backend. Each worker
+# keeps one Figure per figure size and clears it between jobs,
+# so no figures are created through pyplot (and none can leak).
+# The renderer can be disabled entirely for benchmark runs.
+# -------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# -------------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------------
+
+# Reusable figures of the current worker, keyed by figure size
+_figures = {}
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")  # Headless rendering, no GUI event loop
+
+def _get_figure(figsize):
+    from matplotlib.figure import Figure
+
+    if figsize not in _figures:
+        _figures[figsize] = Figure(figsize=figsize)
+    figure = _figures[figsize]
+    figure.clear()
+    return figure
+
+def _plot_roc_curve(ax, model_name, y_test, y_proba):
+    from sklearn.metrics import auc, roc_curve
+
+    fpr, tpr, _ = roc_curve(y_test, y_proba)
+    roc_auc = auc(fpr, tpr)
+
+    ax.plot(fpr, tpr, label=f"AUC = {roc_auc:.2f}")
+    ax.plot([0, 1], [0, 1], linestyle="--", color="gray")  # Reference diagonal
+    ax.set_xlabel("False Positive Rate")
+    ax.set_ylabel("True Positive Rate")
+    ax.set_title(f"{model_name} - ROC Curve")
+    ax.legend(loc="lower right")
+
+def _plot_precision_recall_curve(ax, model_name, y_test, y_proba):
+    from sklearn.metrics import precision_recall_curve
+
+    precision, recall, _ = precision_recall_curve(y_test, y_proba)
+
+    ax.plot(recall, precision, label="Precision-Recall Curve")
+    ax.set_xlabel("Recall")
+    ax.set_ylabel("Precision")
+    ax.set_title(f"{model_name} - Precision-Recall Curve")
+    ax.legend()
+
+def _plot_confusion_matrix(ax, model_name, conf_matrix):
+    import seaborn as sns
+
+    sns.heatmap(conf_matrix, annot=True, fmt="d", cmap="Blues", ax=ax,
+                xticklabels=["Not Survived", "Survived"],
+                yticklabels=["Not Survived", "Survived"])
+    ax.set_xlabel("Predicted Label")
+    ax.set_ylabel("True Label")
+    ax.set_title(f"{model_name} - Confusion Matrix")
+
+def _plot_feature_importance(ax, model_name, feature_importances, features):
+    import seaborn as sns
+
+    sns.barplot(x=feature_importances, y=features, ax=ax)
+    ax.set_xlabel("Feature Importance")
+    ax.set_ylabel("Feature Names")
+    ax.set_title(f"{model_name} - Feature Importance")
+
+def _plot_oob_curve(ax, model_name, n_estimators, oob_scores, selected):
+    ax.plot(n_estimators, oob_scores, marker="o")
+    ax.axvline(selected, linestyle="--", color="gray", label=f"Selected: {selected} trees")
+    ax.set_xlabel("Number of Trees")
+    ax.set_ylabel("OOB Accuracy")
+    ax.set_title(f"{model_name} - OOB Stopping Curve")
+    ax.legend(loc="lower right")
+
+def _plot_learning_curve(ax, model_name, train_rows, train_scores, test_scores, plateau):
+    ax.plot(train_rows, train_scores, marker="o", label="Train accuracy")
+    ax.plot(train_rows, test_scores, marker="o", label="Test accuracy")
+    ax.axvline(plateau, linestyle="--", color="gray", label=f"Plateau: {plateau} rows")
+    ax.set_xscale("log")
+    ax.set_xlabel("Training Rows")
+    ax.set_ylabel("Accuracy")
+    ax.set_title(f"{model_name} - Learning Curve")
+    ax.legend(loc="lower right")
+
+# Plot kind → (drawing function, figure size, file name suffix)
+PLOT_JOBS = {
+    "roc_curve": (_plot_roc_curve, (6, 6), "roc_curve"),
+    "precision_recall_curve": (_plot_precision_recall_curve, (6, 6), "precision_recall_curve"),
+    "confusion_matrix": (_plot_confusion_matrix, (6, 6), "confusion_matrix"),
+    "feature_importance": (_plot_feature_importance, (8, 6), "feature_importance"),
+    "oob_curve": (_plot_oob_curve, (8, 6), "oob_curve"),
+    "learning_curve": (_plot_learning_curve, (8, 6), "learning_curve"),
+}
+
+def _render(kind, model_name, output_dir, data):
+    draw, figsize, suffix = PLOT_JOBS[kind]
+    figure = _get_figure(figsize)
+    draw(figure.add_subplot(), model_name, **data)
+
+    output_path = os.path.join(output_dir, f"{model_name}_{suffix}.png")
+    figure.savefig(output_path)  # Save plot
+    return output_path
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+class PlotRenderer:
+    """
+    Queue of plot jobs rendered in background worker processes.
+
+    Parameters:
+    - output_dir (str): Directory where PNG files are written.
+    - enabled (bool): When False every submitted job is dropped (benchmark runs).
+    - max_workers (int): Number of rendering processes.
+
+    Use as a context manager (or call close()) to wait for all queued plots.
+    """
+
+    def __init__(self, output_dir, enabled=True, max_workers=1):
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self._pool = None
+        self._futures = []
+
+        if enabled:
+            os.makedirs(output_dir, exist_ok=True)
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+    def submit(self, kind, model_name, **data):
+        """
+        Queues one plot job.
+
+        Parameters:
+        - kind (str): One of PLOT_JOBS ("roc_curve", "precision_recall_curve",
+          "confusion_matrix", "feature_importance", "oob_curve", "learning_curve").
+        - model_name (str): Used in the plot title and file name.
+        - **data: Arrays required by the plot (e.g. y_test, y_proba).
+        """
+        if not self.enabled:
+            return
+        if kind not in PLOT_JOBS:
+            raise ValueError(f"Unknown plot kind: {kind}. Expected one of {list(PLOT_JOBS)}.")
+        self._futures.append(self._pool.submit(_render, kind, model_name, self.output_dir, data))
+
+    def close(self):
+        """
+        Waits for every queued plot and shuts the workers down.
+
+        Returns:
+        - list: Paths of the rendered PNG files.
+        """
+        if self._pool is None:
+            return []
+
+        rendered = []
+        for future in self._futures:
+            try:
+                rendered.append(future.result())
+            except Exception as e:
+                print(f"❌ Plot rendering failed: {e}")
+        self._pool.shutdown()
+        self._pool = None
+        self._futures = []
+        return rendered
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
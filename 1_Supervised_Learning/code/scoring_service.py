@@ -0,0 +1,325 @@
+# -------------------------------------------------------
+# MICRO-BATCHING SCORING SERVICE
+# -------------------------------------------------------
+# Serves a persisted ModelBundle over local HTTP (TCP or a
+# Unix socket). The bundle is loaded once at start-up, so no
+# request pays for interpreter start-up or sklearn imports.
+#
+# Concurrent requests are coalesced by a single scoring thread
+# into micro-batches (up to --max-batch-size passengers or
+# --max-wait-ms of waiting), scored with one vectorized
+# predict call, and answered individually. Records missing a raw
+# field the model needs, with a non-numeric value in a numeric
+# field, or with a null in a field the model does not impute are
+# rejected with 400 before batching; if a coalesced batch still
+# fails, each of its requests is re-scored on its own so only the
+# offending request gets the error (500).
+#
+# Endpoints:
+#   POST /predict  – body: one passenger object or a list of them
+#   GET  /stats    – request count, batch sizes, p50/p99 latency
+#
+# How to run:
+#   python scoring_service.py --bundle ../results/models/RandomForestClassifier.joblib --port 8000
+#   curl -X POST localhost:8000/predict -d '{"Pclass": 3, "Sex": "male", "Age": 22, "SibSp": 1, "Parch": 0, "Fare": 7.25, "Embarked": "S"}'
+# -------------------------------------------------------
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from features import required_columns
+from model_bundle import ModelBundle
+
+# Placeholder passenger for the start-up warm-up (only the columns the bundle needs are sent)
+WARMUP_PASSENGER = {
+    "Pclass": 3, "Sex": "male", "Age": 22.0, "SibSp": 1, "Parch": 0, "Fare": 7.25, "Embarked": "S",
+    "Name": "Braund, Mr. Owen Harris", "Ticket": "A/5 21171",
+}
+
+# Raw fields parsed as numbers, and fields whose missing values the feature engine fills
+NUMERIC_FIELDS = {"Pclass", "Age", "SibSp", "Parch", "Fare"}
+TEXT_FIELDS = {"Name", "Ticket"}
+IMPUTED_FIELDS = {"Age", "Sex", "Embarked", "Name", "Ticket"}
+
+# -------------------------------------------------------
+# REQUEST VALIDATION
+# -------------------------------------------------------
+
+def clean_record(record, required):
+    """
+    Checks one passenger's raw fields and coerces the numeric ones.
+
+    Parameters:
+    - record (dict): Passenger as parsed from the request JSON.
+    - required (list): Raw columns the bundle needs.
+
+    Returns:
+    - dict: Copy of the record with numeric fields as floats (NaN/None → None).
+
+    Raises:
+    - ValueError: Naming the missing, null or malformed field.
+    """
+    missing = [column for column in required if column not in record]
+    if missing:
+        raise ValueError(f"missing required fields: {', '.join(missing)}")
+
+    cleaned = dict(record)
+    for column in required:
+        value = record[column]
+        if column in NUMERIC_FIELDS and value is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError(f"field '{column}' must be numeric, got {value!r}")
+            try:
+                value = float(pd.to_numeric(value, errors="raise"))
+            except (ValueError, TypeError):
+                raise ValueError(f"field '{column}' must be numeric, got {value!r}") from None
+            if np.isinf(value):
+                raise ValueError(f"field '{column}' must be finite, got {value!r}")
+            value = None if np.isnan(value) else value
+        elif column in TEXT_FIELDS and value is not None and not isinstance(value, str):
+            raise ValueError(f"field '{column}' must be a string, got {value!r}")
+
+        if value is None and column not in IMPUTED_FIELDS:
+            raise ValueError(f"field '{column}' must not be null")
+        cleaned[column] = value
+    return cleaned
+
+# -------------------------------------------------------
+# MICRO-BATCHER
+# -------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into micro-batches.
+
+    Parameters:
+    - bundle (ModelBundle): Loaded preprocessing + model bundle.
+    - max_batch_size (int): Maximum passengers scored in one predict call.
+    - max_wait_ms (float): Longest time the first request of a batch waits for company.
+    - latency_window (int): Number of recent request latencies kept for percentiles.
+    """
+
+    def __init__(self, bundle, max_batch_size=256, max_wait_ms=2.0, latency_window=10_000):
+        self.bundle = bundle
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._requests = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_sizes = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        """
+        Queues a list of passenger dicts.
+
+        Returns:
+        - Future: Resolves to a list of {"PredictedSurvived", "ProbabilitySurvived"} dicts.
+        """
+        future = Future()
+        self._requests.put((records, future, time.perf_counter()))
+        return future
+
+    def _collect_batch(self):
+        # Block for the first request, then gather more until the batch is full or the wait expires
+        batch = [self._requests.get()]
+        n_passengers = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+
+        while n_passengers < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            n_passengers += len(request[0])
+        return batch
+
+    def _predict(self, records):
+        """Scores records with one vectorized call; returns one response dict per record."""
+        y_pred, y_proba = self.bundle.predict_records(records)
+        return [
+            {
+                "PredictedSurvived": int(y_pred[i]),
+                "ProbabilitySurvived": float(y_proba[i]) if y_proba is not None else None,
+            }
+            for i in range(len(records))
+        ]
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            records = [record for request_records, _, _ in batch for record in request_records]
+
+            try:
+                predictions = self._predict(records)
+            except Exception:
+                # One bad request must not fail the others: re-score each request on its own
+                predictions = None
+
+            # Split the vectorized result back into one response per request
+            offset = 0
+            for request_records, future, received in batch:
+                end = offset + len(request_records)
+                if predictions is not None:
+                    future.set_result(predictions[offset:end])
+                else:
+                    try:
+                        future.set_result(self._predict(request_records))
+                    except Exception as e:
+                        future.set_exception(e)
+                offset = end
+                with self._lock:
+                    self._latencies.append(time.perf_counter() - received)
+
+            with self._lock:
+                self._batch_sizes.append(len(records))
+                self._request_count += len(batch)
+
+    def stats(self):
+        """
+        Returns:
+        - dict: Requests served, mean batch size and p50/p99 latency (ms) over the recent window.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            batch_sizes = np.array(self._batch_sizes)
+            request_count = self._request_count
+
+        if len(latencies) == 0:
+            return {"requests": request_count}
+        return {
+            "requests": request_count,
+            "mean_batch_size": float(batch_sizes.mean()),
+            "p50_latency_ms": float(np.percentile(latencies, 50)),
+            "p99_latency_ms": float(np.percentile(latencies, 99)),
+        }
+
+# -------------------------------------------------------
+# HTTP ENDPOINTS
+# -------------------------------------------------------
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """POST /predict and GET /stats; the server owns the shared MicroBatcher."""
+
+    def do_POST(self):
+        if self.path != "/predict":
+            return self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except json.JSONDecodeError as e:
+            return self._send_json(400, {"error": f"Invalid JSON: {e}"})
+
+        records = payload if isinstance(payload, list) else [payload]
+        if not records or not all(isinstance(record, dict) for record in records):
+            return self._send_json(400, {"error": "Expected a passenger object or a non-empty list of them."})
+
+        # Reject malformed records (client errors) before they reach a shared batch
+        cleaned = []
+        for i, record in enumerate(records):
+            try:
+                cleaned.append(clean_record(record, self.server.required_columns))
+            except ValueError as e:
+                return self._send_json(400, {"error": f"Passenger {i}: {e}"})
+        records = cleaned
+
+        try:
+            predictions = self.server.batcher.submit(records).result()
+        except Exception as e:
+            return self._send_json(500, {"error": str(e)})
+
+        self._send_json(200, predictions if isinstance(payload, list) else predictions[0])
+
+    def do_GET(self):
+        if self.path != "/stats":
+            return self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+        self._send_json(200, self.server.batcher.stats())
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would dominate latency
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128  # Listen backlog for bursts of concurrent clients
+
+class UnixScoringServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+class UnixScoringHandler(ScoringHandler):
+    def address_string(self):
+        return "unix-socket"  # Unix sockets have no (host, port) client address
+
+def create_server(bundle, host="127.0.0.1", port=8000, unix_socket=None, max_batch_size=256, max_wait_ms=2.0):
+    """
+    Creates the scoring server (not yet serving).
+
+    Returns:
+    - Server with a `batcher` attribute; call serve_forever() to start.
+    """
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = UnixScoringServer(unix_socket, UnixScoringHandler)
+    else:
+        server = ScoringHTTPServer((host, port), ScoringHandler)
+    server.batcher = MicroBatcher(bundle, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server.required_columns = required_columns(bundle.features)
+    return server
+
+# -------------------------------------------------------
+# EXECUTION
+# -------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a persisted Titanic model bundle with micro-batching.")
+    parser.add_argument("--bundle", default="../results/models/RandomForestClassifier.joblib",
+                        help="Path to a ModelBundle saved by classification.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix-socket", help="Serve on this Unix socket path instead of TCP.")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    bundle = ModelBundle.load(args.bundle)
+
+    # Warm up once so the first request does not pay for lazy initialisation
+    bundle.predict(pd.DataFrame.from_records([
+        {column: WARMUP_PASSENGER.get(column) for column in required_columns(bundle.features)}
+    ]))
+
+    server = create_server(bundle, args.host, args.port, args.unix_socket, args.max_batch_size, args.max_wait_ms)
+    address = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"✅ Serving {bundle.model_name} on {address} (POST /predict, GET /stats)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n📊 Latency summary:", server.batcher.stats())
+    finally:
+        server.server_close()
@@ -0,0 +1,206 @@
+# -------------------------------------------------------
+# SYNTHETIC TITANIC PASSENGER GENERATOR
+# -------------------------------------------------------
+# Generates passenger tables with the raw titanic.csv columns
+# and distributions fitted to the 891 real passengers:
+#   - class mix, sex ratio, age and fare per class
+#   - SibSp / Parch frequencies, port of embarkation per class
+#   - cabins mostly in first class, ~20% missing ages
+#   - survival driven by sex, class and age (so the models
+#     have the same kind of signal to learn)
+#   - names with titles and shared surnames/tickets for groups
+#
+# Rows are produced in chunks, each from its own seeded random
+# stream, so any size from 1k to 100M rows is generated with
+# bounded memory and the same (seed, chunk_size) always yields
+# the same table.
+#
+# How to run:
+#   python synthetic_data.py --rows 1000000 --output ../data/synthetic/titanic_1M.csv
+# -------------------------------------------------------
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------
+# DISTRIBUTIONS (fitted to titanic.csv)
+# -------------------------------------------------------
+
+PCLASS_PROBS = [0.242, 0.207, 0.551]                 # Pclass 1, 2, 3
+FEMALE_PROB = np.array([0.44, 0.41, 0.29])           # P(female | Pclass)
+AGE_MEAN = np.array([38.2, 29.9, 25.1])              # Age ~ Normal per class
+AGE_STD = np.array([14.8, 14.0, 12.5])
+AGE_MISSING_PROB = 0.199
+FARE_LOG_MEAN = np.array([4.18, 2.93, 2.42])         # Fare ~ LogNormal per class
+FARE_LOG_STD = np.array([0.72, 0.49, 0.57])
+SIBSP_VALUES, SIBSP_PROBS = [0, 1, 2, 3, 4, 5, 8], [0.682, 0.235, 0.031, 0.018, 0.020, 0.006, 0.008]
+PARCH_VALUES, PARCH_PROBS = [0, 1, 2, 3, 4, 5, 6], [0.761, 0.132, 0.090, 0.006, 0.004, 0.006, 0.001]
+EMBARKED_PORTS = np.array(["C", "Q", "S"], dtype=object)
+EMBARKED_PROBS = np.array([[0.40, 0.01, 0.59],      # P(port | Pclass)
+                           [0.09, 0.02, 0.89],
+                           [0.13, 0.15, 0.72]])
+EMBARKED_MISSING_PROB = 0.002
+CABIN_PROB = np.array([0.81, 0.09, 0.02])            # P(cabin recorded | Pclass)
+CABIN_DECKS = np.array([["A", "B", "C", "D", "E"],   # Decks drawn per class
+                        ["D", "E", "F", "D", "E"],
+                        ["E", "F", "G", "F", "G"]], dtype=object)
+
+# Survival rate per (sex, class) in titanic.csv; children get a boost on top
+SURVIVAL_RATE = np.array([[0.37, 0.16, 0.14],        # male
+                          [0.97, 0.92, 0.50]])       # female
+CHILD_AGE, CHILD_LOGIT_BOOST = 10, 1.5
+
+# Name parts (surnames are shared by passengers on the same ticket)
+SURNAME_STEMS = np.array(["Ander", "Brau", "Carl", "Dav", "Ed", "Fitz", "Gold", "Hans", "Iver",
+                          "Jans", "Karl", "Lind", "Mac", "Niel", "Ols", "Pet", "Quin", "Ros",
+                          "Sand", "Thom", "Ull", "Vand", "Wil", "Yorke"], dtype=object)
+SURNAME_ENDINGS = np.array(["son", "sen", "er", "ley", "ton", "berg", "field", "man", "ford", "ing"], dtype=object)
+MALE_FIRST_NAMES = np.array(["John", "William", "Charles", "George", "James", "Thomas", "Henry",
+                             "Edward", "Frederick", "Arthur", "Karl", "Johan"], dtype=object)
+FEMALE_FIRST_NAMES = np.array(["Mary", "Anna", "Elizabeth", "Margaret", "Helen", "Alice", "Ellen",
+                               "Emily", "Bertha", "Marion", "Edith", "Maria"], dtype=object)
+RARE_TITLES, RARE_TITLE_PROB = np.array(["Dr", "Rev", "Col", "Major"], dtype=object), 0.02
+TICKET_PREFIXES = np.array(["", "PC ", "C.A. ", "STON/O 2. ", "A/5 ", "W./C. ", "SOTON/O.Q. "], dtype=object)
+TICKET_PREFIX_PROBS = [0.74, 0.07, 0.06, 0.04, 0.04, 0.03, 0.02]
+PASSENGERS_PER_TICKET = 1.35  # Mean group size on one ticket
+
+# -------------------------------------------------------
+# GENERATOR
+# -------------------------------------------------------
+
+def _choose_rows(rng, probs):
+    """Draws one category index per row from row-specific probability vectors."""
+    cumulative = probs.cumsum(axis=1)
+    return (rng.random((len(probs), 1)) > cumulative).sum(axis=1).clip(max=probs.shape[1] - 1)
+
+def _generate_chunk(rng, n_rows, first_id, include_text):
+    pclass_index = rng.choice(3, n_rows, p=PCLASS_PROBS)
+    female = rng.random(n_rows) < FEMALE_PROB[pclass_index]
+
+    age = rng.normal(AGE_MEAN[pclass_index], AGE_STD[pclass_index]).clip(0.42, 80.0)
+    age = np.where(age < 1, age.round(2), np.floor(age))
+    known_age = rng.random(n_rows) >= AGE_MISSING_PROB
+
+    fare = np.exp(rng.normal(FARE_LOG_MEAN[pclass_index], FARE_LOG_STD[pclass_index])).round(4)
+
+    embarked = EMBARKED_PORTS[_choose_rows(rng, EMBARKED_PROBS[pclass_index])]
+    embarked[rng.random(n_rows) < EMBARKED_MISSING_PROB] = np.nan
+
+    cabin = np.full(n_rows, np.nan, dtype=object)
+    has_cabin = rng.random(n_rows) < CABIN_PROB[pclass_index]
+    decks = CABIN_DECKS[pclass_index[has_cabin], rng.integers(0, 5, has_cabin.sum())]
+    cabin[has_cabin] = decks + rng.integers(2, 130, has_cabin.sum()).astype(str).astype(object)
+
+    # Survival: real per-(sex, class) rate, shifted up on the logit scale for children
+    rate = SURVIVAL_RATE[female.astype(int), pclass_index]
+    logit = np.log(rate / (1 - rate)) + CHILD_LOGIT_BOOST * (known_age & (age < CHILD_AGE))
+    survived = rng.random(n_rows) < 1 / (1 + np.exp(-logit))
+
+    df = pd.DataFrame({
+        "PassengerId": np.arange(first_id, first_id + n_rows, dtype=np.int64),
+        "Survived": survived.astype(np.int64),
+        "Pclass": pclass_index + 1,
+        "Name": None,
+        "Sex": np.where(female, "female", "male").astype(object),
+        "Age": np.where(known_age, age, np.nan),
+        "SibSp": rng.choice(SIBSP_VALUES, n_rows, p=SIBSP_PROBS),
+        "Parch": rng.choice(PARCH_VALUES, n_rows, p=PARCH_PROBS),
+        "Ticket": None,
+        "Fare": fare,
+        "Cabin": cabin,
+        "Embarked": embarked,
+    })
+
+    if not include_text:
+        return df.drop(columns=["Name", "Ticket"])
+
+    # Passengers sharing a ticket number share the surname (families and travel groups)
+    n_groups = max(1, int(n_rows / PASSENGERS_PER_TICKET))
+    group = rng.integers(0, n_groups, n_rows)
+    ticket_number = first_id + group
+    n_surnames = len(SURNAME_STEMS) * len(SURNAME_ENDINGS)
+    surname = (SURNAME_STEMS[group % len(SURNAME_STEMS)]
+               + SURNAME_ENDINGS[(group // len(SURNAME_STEMS)) % len(SURNAME_ENDINGS)])
+    repeat = group // n_surnames  # Disambiguate surnames once the vocabulary is exhausted
+    surname = np.where(repeat > 0, surname + "-" + repeat.astype(str).astype(object), surname)
+
+    adult = ~known_age | (age >= 13)
+    married = rng.random(n_rows) < np.where(known_age & (age < 25), 0.15, 0.6)
+    title = np.where(female, np.where(married & adult, "Mrs", "Miss"), np.where(adult, "Mr", "Master")).astype(object)
+    rare = ~female & adult & (rng.random(n_rows) < RARE_TITLE_PROB)
+    title[rare] = RARE_TITLES[rng.integers(0, len(RARE_TITLES), rare.sum())]
+    first_name = np.where(female, FEMALE_FIRST_NAMES[rng.integers(0, len(FEMALE_FIRST_NAMES), n_rows)],
+                          MALE_FIRST_NAMES[rng.integers(0, len(MALE_FIRST_NAMES), n_rows)])
+
+    ticket_prefix = TICKET_PREFIXES[rng.choice(len(TICKET_PREFIXES), n_groups, p=TICKET_PREFIX_PROBS)[group]]
+
+    df["Name"] = surname + ", " + title + ". " + first_name
+    df["Ticket"] = ticket_prefix + ticket_number.astype(str).astype(object)
+    return df
+
+def generate_passengers(n_rows, seed=42, chunk_size=1_000_000, include_text=True):
+    """
+    Yields a synthetic passenger table chunk by chunk.
+
+    Parameters:
+    - n_rows (int): Total number of passengers.
+    - seed (int): Base seed; chunk i uses the stream seeded with (seed, i).
+    - chunk_size (int): Passengers per yielded DataFrame (bounds peak memory).
+    - include_text (bool): Also generate the Name and Ticket string columns
+      (the most memory-hungry ones; not needed by the model features).
+
+    Yields:
+    - pd.DataFrame: Chunks with the titanic.csv columns and consecutive PassengerIds
+      (a single empty chunk, with the same columns and dtypes, when n_rows is 0).
+    """
+    if n_rows < 0:
+        raise ValueError(f"n_rows must be non-negative, got {n_rows}.")
+    if n_rows == 0:
+        # Empty slice of a one-row chunk: same columns and dtypes as a real table
+        yield _generate_chunk(np.random.default_rng([seed, 0]), 1, 1, include_text).iloc[:0]
+        return
+    for chunk_index, start in enumerate(range(0, n_rows, chunk_size)):
+        rng = np.random.default_rng([seed, chunk_index])
+        yield _generate_chunk(rng, min(chunk_size, n_rows - start), start + 1, include_text)
+
+def make_passengers(n_rows, seed=42, chunk_size=1_000_000, include_text=True):
+    """
+    Generates a complete synthetic passenger table in memory.
+
+    Returns:
+    - pd.DataFrame: Same rows as the concatenated chunks of generate_passengers().
+    """
+    chunks = list(generate_passengers(n_rows, seed=seed, chunk_size=chunk_size, include_text=include_text))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def write_csv(output_path, n_rows, seed=42, chunk_size=1_000_000, include_text=True):
+    """
+    Streams a synthetic passenger table to a CSV file without holding it in memory.
+
+    Returns:
+    - str: The output path.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    for i, chunk in enumerate(generate_passengers(n_rows, seed=seed, chunk_size=chunk_size, include_text=include_text)):
+        chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return output_path
+
+# -------------------------------------------------------
+# EXECUTION
+# -------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Titanic passenger CSV.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of passengers.")
+    parser.add_argument("--output", default="../data/synthetic/titanic_synthetic.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--no-text", action="store_true", help="Omit the Name and Ticket columns.")
+    args = parser.parse_args()
+
+    print(f"🔄 Writing {args.rows:,} synthetic passengers to {args.output}...")
+    write_csv(args.output, args.rows, seed=args.seed, chunk_size=args.chunk_size, include_text=not args.no_text)
+    print("✅ Synthetic dataset saved.")
@@ -0,0 +1,50 @@
+# -------------------------------------------------------
+# TESTS FOR OOB-DRIVEN FOREST GROWTH
+# -------------------------------------------------------
+# Run from this directory with: python -m pytest -q
+# -------------------------------------------------------
+
+import pytest
+from sklearn.base import clone
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_growth import grow_forest
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=600, n_features=8, n_informative=4, flip_y=0.1, random_state=0)
+
+def test_selected_size_is_not_stuck_at_first_step(data):
+    X, y = data
+    forest, curve = grow_forest(RandomForestClassifier(random_state=42), X, y, step=10, min_estimators=50)
+
+    assert forest.n_estimators >= 50
+    assert len(forest.estimators_) == forest.n_estimators
+    # Patience only counts from the minimum size, so growth runs past it
+    assert curve["n_estimators"].iloc[-1] >= 50 + 3 * 10
+    assert not curve.loc[curve["n_estimators"] < 50, "improved"].any()
+
+def test_grown_forest_matches_cold_fit_params(data):
+    X, y = data
+    model = RandomForestClassifier(random_state=42)
+    forest, _ = grow_forest(model, X, y, step=10, min_estimators=50)
+
+    assert forest.get_params() == clone(model).set_params(n_estimators=forest.n_estimators).get_params()
+    assert not hasattr(forest, "oob_score_")
+
+def test_max_estimators_is_always_tried(data):
+    X, y = data
+    forest, curve = grow_forest(RandomForestClassifier(random_state=42), X, y, step=10,
+                                min_estimators=50, max_estimators=55, patience=100)
+
+    assert curve["n_estimators"].tolist() == [10, 20, 30, 40, 50, 55]
+    assert forest.n_estimators in (50, 55)
+
+@pytest.mark.parametrize("max_estimators, min_estimators", [(5, 1), (45, 100)])
+def test_max_estimators_below_step_or_minimum_is_rejected(data, max_estimators, min_estimators):
+    X, y = data
+    with pytest.raises(ValueError, match="max_estimators"):
+        grow_forest(RandomForestClassifier(random_state=42), X, y, step=10,
+                    min_estimators=min_estimators, max_estimators=max_estimators)
@@ -0,0 +1,157 @@
+# -------------------------------------------------------
+# NAME & TICKET FEATURE EXTRACTION
+# -------------------------------------------------------
+# Derives compact model features from the free-text Name and
+# Ticket columns:
+#   Title             "Braund, Mr. Owen Harris"  → Mr (int8 code)
+#   SurnameGroupSize  training passengers sharing the surname "Braund"
+#   TicketPrefix      "STON/O2. 3101282"          → STONO2 (int8 code)
+#   TicketGroupSize   training passengers sharing the exact ticket
+#
+# Everything runs as vectorized column operations: each column is
+# factorized once, the precompiled regexes are applied to the
+# distinct values only (plain numeric tickets skip the prefix
+# regex), and results are
+# broadcast back to the rows through the factorize codes. There
+# are no Python-level loops over rows, so tens of millions of
+# passengers are processed in a few passes over the data.
+#
+# Group sizes are looked up in surname / ticket counts learned
+# once from the training data (learn_surname_counts(),
+# learn_ticket_counts()), so a passenger gets the same value
+# whatever else is scored with it; unseen surnames and tickets
+# count as groups of 1. Only keys seen at least twice are kept.
+# -------------------------------------------------------
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------
+# CONFIGURATION
+# -------------------------------------------------------
+
+# "Surname, Title. First names"
+SURNAME_PATTERN = re.compile(r"^\s*([^,]+),")
+TITLE_PATTERN = re.compile(r",\s*([^.]+)\.")
+# Everything before the trailing ticket number ("A/5 21171" → "A/5")
+TICKET_PREFIX_PATTERN = re.compile(r"^(.*?)\s*\d*$")
+# Punctuation and spaces removed from prefixes ("S.O./P.P." → "SOPP")
+PREFIX_PUNCTUATION_PATTERN = re.compile(r"[./\s]")
+
+# Title vocabulary (code = position); rare titles are pooled
+TITLE_CATEGORIES = ["Mr", "Mrs", "Miss", "Master", "Rare"]
+TITLE_ALIASES = {"Mlle": "Miss", "Ms": "Miss", "Mme": "Mrs"}
+
+# Ticket-prefix codes reserved for plain numeric tickets and prefixes outside the vocabulary
+NO_PREFIX = "NONE"
+OTHER_PREFIX = "OTHER"
+
+# -------------------------------------------------------
+# HELPERS
+# -------------------------------------------------------
+
+def _factorize(column):
+    """Returns (row codes, distinct values as a Series); missing values get code -1."""
+    codes, uniques = pd.factorize(column)
+    return codes, pd.Series(uniques, dtype="str")
+
+def _broadcast(codes, unique_values, missing):
+    """Maps per-distinct-value results back to the rows (code -1 → missing)."""
+    if len(unique_values) == 0:
+        return np.full(len(codes), missing)
+    return np.where(codes >= 0, unique_values[np.maximum(codes, 0)], missing)
+
+def _surnames(unique_names):
+    """Normalized surname of every distinct name ("Braund, Mr. Owen Harris" → "braund")."""
+    return unique_names.str.extract(SURNAME_PATTERN, expand=False).str.strip().str.lower()
+
+def _lookup_sizes(unique_keys, counts):
+    """Learned group size of every distinct key (1 for keys not in counts)."""
+    return unique_keys.map(counts).fillna(1).to_numpy(dtype=np.int32)
+
+def _frequent_counts(counts):
+    """Keeps the keys shared by at least two passengers, as a plain {str: int} dict."""
+    counts = counts[counts >= 2]
+    return {str(key): int(count) for key, count in counts.items()}
+
+def ticket_prefixes(tickets):
+    """Returns the normalized prefix of every ticket (NO_PREFIX for plain numbers)."""
+    prefixes = pd.Series(NO_PREFIX, index=tickets.index, dtype="str")
+    has_prefix = ~tickets.str.isdigit().fillna(True).to_numpy(dtype=bool)  # Most tickets are plain numbers
+    if has_prefix.any():
+        extracted = tickets[has_prefix].str.extract(TICKET_PREFIX_PATTERN, expand=False)
+        extracted = extracted.str.replace(PREFIX_PUNCTUATION_PATTERN, "", regex=True).str.upper()
+        prefixes[has_prefix] = extracted.mask(extracted.fillna("") == "", NO_PREFIX)
+    return prefixes
+
+# -------------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------------
+
+def name_features(names, title_fill, surname_counts):
+    """
+    Derives Title and SurnameGroupSize from the Name column.
+
+    Parameters:
+    - names (pd.Series): Raw names ("Surname, Title. First names").
+    - title_fill (int): Title code for missing names and names without a title.
+    - surname_counts (dict): Surname counts from learn_surname_counts().
+
+    Returns:
+    - dict: "Title" (int8 codes into TITLE_CATEGORIES), "SurnameGroupSize" (int32).
+    """
+    codes, uniques = _factorize(names)
+    titles = uniques.str.extract(TITLE_PATTERN, expand=False).str.strip().replace(TITLE_ALIASES)
+    title_codes = pd.Categorical(titles, categories=TITLE_CATEGORIES).codes.astype(np.int8)
+    title_codes[(title_codes == -1) & titles.notna().to_numpy()] = TITLE_CATEGORIES.index("Rare")
+    title_codes[titles.isna().to_numpy()] = title_fill
+
+    return {
+        "Title": _broadcast(codes, title_codes, title_fill).astype(np.int8),
+        "SurnameGroupSize": _broadcast(codes, _lookup_sizes(_surnames(uniques), surname_counts), 1).astype(np.int32),
+    }
+
+def ticket_features(tickets, vocabulary, ticket_counts):
+    """
+    Derives TicketPrefix and TicketGroupSize from the Ticket column.
+
+    Parameters:
+    - tickets (pd.Series): Raw ticket strings.
+    - vocabulary (list): Prefix vocabulary from learn_prefix_vocabulary().
+    - ticket_counts (dict): Ticket counts from learn_ticket_counts().
+
+    Returns:
+    - dict: "TicketPrefix" (int8 codes into vocabulary; unknown prefixes → OTHER_PREFIX,
+      missing tickets → NO_PREFIX), "TicketGroupSize" (int32).
+    """
+    codes, uniques = _factorize(tickets)
+    prefix_codes = pd.Categorical(ticket_prefixes(uniques), categories=vocabulary).codes.astype(np.int8)
+    prefix_codes[prefix_codes == -1] = vocabulary.index(OTHER_PREFIX)
+    return {
+        "TicketPrefix": _broadcast(codes, prefix_codes, vocabulary.index(NO_PREFIX)).astype(np.int8),
+        "TicketGroupSize": _broadcast(codes, _lookup_sizes(uniques, ticket_counts), 1).astype(np.int32),
+    }
+
+def learn_surname_counts(names):
+    """Learns how many passengers share each surname (surnames seen at least twice)."""
+    codes, uniques = _factorize(names)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return _frequent_counts(pd.Series(counts).groupby(_surnames(uniques).to_numpy()).sum())
+
+def learn_ticket_counts(tickets):
+    """Learns how many passengers share each ticket (tickets seen at least twice)."""
+    return _frequent_counts(tickets.value_counts())
+
+def learn_prefix_vocabulary(tickets, min_count=10, max_prefixes=100):
+    """
+    Learns the ticket-prefix vocabulary: prefixes used by at least min_count
+    passengers (at most max_prefixes), between NO_PREFIX and OTHER_PREFIX.
+    """
+    codes, uniques = _factorize(tickets)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    per_prefix = pd.Series(counts).groupby(ticket_prefixes(uniques).to_numpy()).sum()
+    frequent = per_prefix[(per_prefix >= min_count) & (per_prefix.index != NO_PREFIX)]
+    frequent = frequent.sort_values(ascending=False, kind="stable").index[:max_prefixes]
+    return [NO_PREFIX] + sorted(frequent) + [OTHER_PREFIX]
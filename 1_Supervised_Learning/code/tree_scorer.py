@@ -0,0 +1,178 @@
+# -------------------------------------------------------
+# FLATTENED TREE-ENSEMBLE SCORER
+# -------------------------------------------------------
+# Exports a fitted DecisionTreeClassifier or RandomForestClassifier
+# into packed NumPy node arrays, all trees concatenated:
+#   feature[node], threshold[node], children[2 * node + {0, 1}],
+#   missing_left[node], value[node, class]  (+ one root per tree)
+#
+# Scoring walks every tree for the whole batch at once: a
+# (trees × rows) array of current nodes is advanced one level per
+# step with a few array gathers, for max-depth steps. Leaves point
+# to themselves, so finished walks simply stay put. There is no
+# per-call validation or thread-pool dispatch, which dominates
+# sklearn's latency for single rows and small batches. For large
+# batches (beyond ~1000 rows) sklearn's compiled traversal is faster.
+#
+# Results match sklearn exactly: inputs are cast to float32 and
+# compared with `<=` against the float64 thresholds (as sklearn's
+# tree code does), and forest probabilities are summed tree by
+# tree in estimator order before dividing by the tree count.
+# -------------------------------------------------------
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+
+class FlatTreeEnsemble:
+    """
+    Packed-array representation of a fitted tree classifier.
+
+    Use FlatTreeEnsemble.from_model(model) to export and predict_proba()/predict() to score.
+    """
+
+    def __init__(self, feature, threshold, children, missing_left, value, roots, max_depth,
+                 classes, feature_names=None, average=False):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children  # children[2 * node] = left child, children[2 * node + 1] = right child
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)  # Levels to walk until every row has reached a leaf
+        self.classes_ = classes
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.average = average  # Forests average the per-tree probabilities
+
+    # ---------------------------------------------------
+    # Export
+    # ---------------------------------------------------
+
+    @staticmethod
+    def supports(model):
+        """Single-output DecisionTreeClassifier and RandomForestClassifier models can be flattened."""
+        return isinstance(model, (DecisionTreeClassifier, RandomForestClassifier)) and model.n_outputs_ == 1
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Flattens a fitted DecisionTreeClassifier or RandomForestClassifier.
+
+        Returns:
+        - FlatTreeEnsemble
+        """
+        if not cls.supports(model):
+            raise TypeError(f"Cannot flatten {type(model).__name__}; expected a single-output "
+                            "DecisionTreeClassifier or RandomForestClassifier.")
+
+        trees = model.estimators_ if isinstance(model, RandomForestClassifier) else [model]
+        n_classes = len(model.classes_)
+
+        features, thresholds, children, missing_lefts, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in trees:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count, dtype=np.int32)
+            leaf = tree.children_left == -1
+
+            # Leaves point to themselves so a finished walk stays in place
+            features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            children.append(np.column_stack([
+                np.where(leaf, nodes, tree.children_left),
+                np.where(leaf, nodes, tree.children_right),
+            ]).astype(np.int32).ravel() + offset)
+            missing_lefts.append(np.asarray(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count)), dtype=bool))
+            values.append(tree.value[:, 0, :n_classes])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(children),
+            np.concatenate(missing_lefts),
+            np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            np.array(roots, dtype=np.int32),
+            max(estimator.tree_.max_depth for estimator in trees),
+            model.classes_,
+            getattr(model, "feature_names_in_", None),
+            average=isinstance(model, RandomForestClassifier),
+        )
+
+    # ---------------------------------------------------
+    # Scoring
+    # ---------------------------------------------------
+
+    def _to_array(self, X):
+        if hasattr(X, "columns"):
+            if self.feature_names is not None and list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+            return X.to_numpy(dtype=np.float32)
+        return np.asarray(X, dtype=np.float32)  # Same input precision as sklearn's trees
+
+    def apply(self, X):
+        """
+        Returns:
+        - np.ndarray: (trees × rows) indices of the leaf each row reaches in each tree.
+        """
+        X = self._to_array(X)
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = np.arange(n_rows, dtype=np.int64) * n_features
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        has_missing = np.isnan(X_flat).any()
+
+        # One level per step for all (tree, row) pairs; leaves loop back to themselves
+        for _ in range(self.max_depth):
+            x = np.take(X_flat, row_offsets + np.take(self.feature, nodes))
+            go_right = ~(x <= np.take(self.threshold, nodes))
+            if has_missing:
+                go_right &= ~(np.isnan(x) & np.take(self.missing_left, nodes))
+            nodes = np.take(self.children, 2 * nodes + go_right)
+        return nodes
+
+    def predict_proba(self, X):
+        """
+        Returns:
+        - np.ndarray: (rows × classes) class probabilities, identical to model.predict_proba(X).
+        """
+        leaf_values = self.value[self.apply(X)]  # (trees, rows, classes)
+        if not self.average:
+            return leaf_values[0]
+        # Reducing over the outer (tree) axis sums sequentially in estimator order, like sklearn
+        proba = leaf_values.sum(axis=0)
+        proba /= leaf_values.shape[0]
+        return proba
+
+    def predict(self, X):
+        """
+        Returns:
+        - np.ndarray: Predicted class labels, identical to model.predict(X).
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    # ---------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------
+
+    def save(self, path):
+        """Saves the packed node arrays to a single .npz file."""
+        np.savez(
+            path,
+            feature=self.feature, threshold=self.threshold, children=self.children,
+            missing_left=self.missing_left, value=self.value, roots=self.roots,
+            max_depth=np.array(self.max_depth), classes=self.classes_,
+            feature_names=np.array(self.feature_names if self.feature_names is not None else [], dtype=str),
+            average=np.array(self.average),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Loads arrays saved with save()."""
+        with np.load(path) as arrays:
+            feature_names = arrays["feature_names"].tolist() or None
+            return cls(arrays["feature"], arrays["threshold"], arrays["children"], arrays["missing_left"],
+                       arrays["value"], arrays["roots"], int(arrays["max_depth"]), arrays["classes"],
+                       feature_names, average=bool(arrays["average"]))
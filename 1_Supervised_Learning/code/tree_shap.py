@@ -0,0 +1,190 @@
+# -------------------------------------------------------
+# PER-PREDICTION TREE ATTRIBUTIONS (PATH-DEPENDENT TREESHAP)
+# -------------------------------------------------------
+# Exact Shapley-value attributions of the survival probability
+# of a DecisionTreeClassifier or RandomForestClassifier, using
+# the path-dependent TreeSHAP definition: a feature left out of
+# a coalition is integrated out by following both children of
+# its splits, weighted by their training cover.
+#
+# Every leaf is reduced once to a box per feature (the split
+# thresholds on its path), the product of the cover fractions of
+# that feature's splits (z) and its leaf value. For a row, o = 1
+# when the row falls inside the feature's box. The leaf's share
+# of feature j is then
+#   value * (o_j - z_j) * sum_s w(s) * e_s(o, z without j)
+# with e_s the coefficients of prod_k (o_k t + z_k) and w(s) the
+# Shapley weights. Features not split on the path have o = z = 1
+# and act as null players, so all leaves share the same feature
+# count. This is polynomial in the number of features (no
+# coalition enumeration) and runs as array operations over a
+# (leaves × rows) block; row batches can be spread over
+# processes.
+#
+# Attributions satisfy base value + sum(row attributions) =
+# predict_proba (up to floating-point rounding).
+# -------------------------------------------------------
+
+from concurrent.futures import ProcessPoolExecutor
+from math import factorial
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from tree_scorer import FlatTreeEnsemble
+
+# Largest (leaves × rows × features) block evaluated at once
+_BLOCK_ELEMENTS = 2_000_000
+
+# -------------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------------
+
+# Explainer of the current worker process, set once by _init_worker
+_worker_explainer = None
+
+def _init_worker(explainer):
+    global _worker_explainer
+    _worker_explainer = explainer
+
+def _explain_batch(X):
+    return _worker_explainer._attributions(X)
+
+# -------------------------------------------------------
+# EXPLAINER
+# -------------------------------------------------------
+
+class TreeShapExplainer:
+    """
+    Exact per-row feature attributions of a fitted tree classifier.
+
+    Parameters:
+    - model: Fitted single-output DecisionTreeClassifier or RandomForestClassifier.
+    - class_index (int): Class whose predicted probability is explained (default: the positive class).
+    """
+
+    def __init__(self, model, class_index=-1):
+        if not FlatTreeEnsemble.supports(model):
+            raise TypeError(f"Cannot explain {type(model).__name__}; expected a single-output "
+                            "DecisionTreeClassifier or RandomForestClassifier.")
+
+        trees = model.estimators_ if isinstance(model, RandomForestClassifier) else [model]
+        self.n_features = model.n_features_in_
+        self.feature_names = list(getattr(model, "feature_names_in_", range(self.n_features)))
+        self.class_index = class_index
+
+        lower, upper, nan_ok, cover, values = [], [], [], [], []
+        for estimator in trees:
+            for leaf in self._leaf_boxes(estimator.tree_):
+                lower.append(leaf[0])
+                upper.append(leaf[1])
+                nan_ok.append(leaf[2])
+                cover.append(leaf[3])
+                values.append(estimator.tree_.value[leaf[4], 0, class_index])
+
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+        self.nan_ok = np.array(nan_ok)
+        self.cover = np.array(cover)
+        # Forests average their trees, so each leaf carries 1 / n_trees of its value
+        self.values = np.array(values) / len(trees)
+        self.expected_value = float(np.sum(self.values * self.cover.prod(axis=1)))
+
+        # Shapley weight of a coalition of size s among n_features players
+        n = self.n_features
+        self.weights = np.array([factorial(s) * factorial(n - s - 1) / factorial(n) for s in range(n)])
+
+    def _leaf_boxes(self, tree):
+        """
+        Walks one tree and yields, per leaf, the per-feature
+        (lower bound, upper bound, missing values allowed, cover fraction, node id).
+        """
+        n = self.n_features
+        missing_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool))
+        cover = tree.weighted_n_node_samples
+        stack = [(0, np.full(n, -np.inf), np.full(n, np.inf), np.ones(n, dtype=bool), np.ones(n))]
+
+        while stack:
+            node, lower, upper, nan_ok, z = stack.pop()
+            left, right = tree.children_left[node], tree.children_right[node]
+            if left == -1:
+                yield lower, upper, nan_ok, z, node
+                continue
+
+            feature, threshold = tree.feature[node], tree.threshold[node]
+            for child, go_left in ((left, True), (right, False)):
+                child_lower, child_upper = lower.copy(), upper.copy()
+                child_nan_ok, child_z = nan_ok.copy(), z.copy()
+                if go_left:
+                    child_upper[feature] = min(upper[feature], threshold)  # x <= threshold
+                else:
+                    child_lower[feature] = max(lower[feature], threshold)  # x > threshold
+                child_nan_ok[feature] &= bool(missing_left[node]) == go_left
+                child_z[feature] *= cover[child] / cover[node]
+                stack.append((child, child_lower, child_upper, child_nan_ok, child_z))
+
+    def _to_array(self, X):
+        if hasattr(X, "columns"):
+            X = X[self.feature_names]
+        # Same float32 input precision as sklearn's tree traversal
+        return np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    def _attributions(self, X):
+        """Attributions of one batch of rows (float64 array) → (rows × features)."""
+        n_rows, n = X.shape
+        phi = np.zeros((n_rows, n))
+        block = max(1, _BLOCK_ELEMENTS // max(1, n_rows * n))
+        missing = np.isnan(X)
+
+        for start in range(0, len(self.values), block):
+            leaves = slice(start, start + block)
+            # o[leaf, row, feature]: the row satisfies every split on that feature along the leaf's path
+            o = (X > self.lower[leaves, None, :]) & (X <= self.upper[leaves, None, :])
+            o |= missing & self.nan_ok[leaves, None, :]
+            o = o.astype(np.float64)
+            z = self.cover[leaves, None, :]  # Broadcasts over rows
+
+            # Coefficients of prod_k (o_k t + z_k): poly[s] sums the coalitions of size s
+            poly = np.zeros((n + 1,) + o.shape[:2])
+            poly[0] = 1.0
+            for k in range(n):
+                poly[1:k + 2] = poly[1:k + 2] * z[..., k] + poly[0:k + 1] * o[..., k]
+                poly[0] *= z[..., k]
+
+            for j in range(n):
+                o_j, z_j = o[..., j], z[..., j]
+                # Divide feature j back out of the polynomial (the "unwind" step of TreeSHAP):
+                # top-down for the factor (t + z_j) when o_j = 1, by the constant z_j when o_j = 0
+                quotient = poly[n]
+                weighted_in = self.weights[n - 1] * quotient
+                for s in range(n - 1, 0, -1):
+                    quotient = poly[s] - z_j * quotient
+                    weighted_in += self.weights[s - 1] * quotient
+                weighted_out = np.tensordot(self.weights, poly[:n], axes=1) / z_j
+                weighted = np.where(o_j == 1.0, weighted_in, weighted_out)
+                phi[:, j] += self.values[leaves] @ ((o_j - z_j) * weighted)
+        return phi
+
+    def explain(self, X, batch_size=1024, n_jobs=1):
+        """
+        Computes the attributions of every row.
+
+        Parameters:
+        - X (pd.DataFrame or np.ndarray): Model input features.
+        - batch_size (int): Rows evaluated per batch.
+        - n_jobs (int): Worker processes the batches are spread over (1 = in-process).
+
+        Returns:
+        - np.ndarray: (rows × features) contributions to the explained class probability;
+          each row sums to predict_proba - expected_value.
+        """
+        X = self._to_array(X)
+        batches = [X[start:start + batch_size] for start in range(0, len(X), batch_size)]
+        if not batches:
+            return np.zeros((0, self.n_features))
+
+        if n_jobs > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches)), initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                return np.vstack(list(pool.map(_explain_batch, batches)))
+        return np.vstack([self._attributions(batch) for batch in batches])
@@ -2,39 +2,72 @@
 # IMPORT REQUIRED LIBRARIES
 # -------------------------------------------------------
 
+import os
+
 import pandas as pd
 import numpy as np
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 
+from feature_store import write_feature_store
+from features import TARGET, TitanicFeatureEngine, required_columns
+
+# -------------------------------------------------------
+# DATA SCHEMA
+# -------------------------------------------------------
+
+# Declared dtypes for the raw Titanic columns (no dtype inference, compact storage)
+TITANIC_DTYPES = {
+    "PassengerId": np.int32,
+    "Survived": np.int8,
+    "Pclass": np.int8,
+    "Name": str,
+    "Sex": "category",
+    "Age": np.float32,
+    "SibSp": np.int8,
+    "Parch": np.int8,
+    "Ticket": str,
+    "Fare": np.float32,
+    "Cabin": str,
+    "Embarked": "category",
+}
+
 # -------------------------------------------------------
 # DATA LOADING & PREPROCESSING FUNCTIONS
 # -------------------------------------------------------
 
-def load_data(file_path):
+def load_data(file_path, features=None, include_target=True, chunksize=None):
     """
-    Loads the Titanic dataset from a CSV file and returns a Pandas DataFrame.
+    Loads the Titanic dataset from a CSV file using the declared TITANIC_DTYPES schema.
+
+    Parameters:
+    - file_path (str): Path to the CSV file.
+    - features (list, optional): Model features; only the raw columns needed to build
+      them (plus the target) are read. All columns are read when omitted.
+    - include_target (bool): Also read the Survived column when projecting features.
+    - chunksize (int, optional): Return an iterator of DataFrames with this many rows
+      instead of loading the whole file at once.
+
+    Returns:
+    - pd.DataFrame, or an iterator of DataFrames when chunksize is given.
     """
-    df = pd.read_csv(file_path)
-    return df
+    usecols = None
+    if features is not None:
+        usecols = required_columns(features) + ([TARGET] if include_target else [])
+
+    return pd.read_csv(file_path, usecols=usecols, dtype=TITANIC_DTYPES, chunksize=chunksize)
 
-def preprocess_data(df):
+def preprocess_data(df, engine=None):
     """
     Cleans the dataset by handling missing values, encoding categorical variables, 
     and engineering additional features to enhance model performance.
-    """
-    # Handle missing values
-    df["Age"].fillna(df["Age"].median(), inplace=True)  # Fill missing Age with median
-    df["Embarked"].fillna(df["Embarked"].mode()[0], inplace=True)  # Fill missing Embarked with mode
-    df.drop(columns=["Cabin"], inplace=True, errors="ignore")  # Drop Cabin column due to excessive missing values
-
-    # Feature Engineering: Create FamilySize
-    df["FamilySize"] = df["SibSp"] + df["Parch"] + 1  # Combine SibSp and Parch
 
-    # Convert categorical variables to numerical format
-    df["Sex"] = df["Sex"].map({"male": 0, "female": 1})  # Encode Sex column (0 = Male, 1 = Female)
-    df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)  # One-hot encode Embarked feature
+    Pass a fitted TitanicFeatureEngine to reuse previously learned statistics;
+    otherwise a new engine is fitted on `df`.
+    """
+    if engine is None:
+        engine = TitanicFeatureEngine().fit(df)  # Learn medians, modes and dummy vocabulary once
 
-    return df
+    return engine.transform(df)
 
 # -------------------------------------------------------
 # MODEL EVALUATION FUNCTION
@@ -57,24 +90,107 @@ def evaluate_model(model, X_test, y_test):
 # DATA PREPROCESSING & SAVING FUNCTION
 # -------------------------------------------------------
 
-def preprocess_and_save(input_path, output_path):
+def preprocess_and_save(input_path, output_path, engine=None, store_dir=None):
     """
     Loads the raw Titanic dataset, performs data cleaning, 
     feature engineering, and saves the processed dataset.
+    An already fitted TitanicFeatureEngine can be passed to skip re-fitting.
+
+    Besides the CSV, a memory-mapped column store (one .npy file per column plus
+    manifest.json, see feature_store.py) is written to `store_dir`, by default
+    next to the CSV (e.g. titanic_cleaned_store/), so consumers can reopen the
+    cleaned features without parsing.
     """
     # Load dataset
-    df = pd.read_csv(input_path)
-
-    # Handle missing values
-    df["Age"].fillna(df["Age"].median(), inplace=True)  # Fill missing Age with median
-    df["Embarked"].fillna(df["Embarked"].mode()[0], inplace=True)  # Fill missing Embarked with mode
-    df.drop(columns=["Cabin"], inplace=True, errors="ignore")  # Drop Cabin column
+    df = load_data(input_path)
 
-    # Feature Engineering: Create FamilySize
-    df["FamilySize"] = df["SibSp"] + df["Parch"] + 1  # Capture family influence on survival
-    df["Sex"] = df["Sex"].map({"male": 0, "female": 1})  # Convert Sex to numerical
-    df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)  # Encode Embarked
+    # Handle missing values, drop Cabin, create FamilySize and encode Sex / Embarked
+    if engine is None:
+        engine = TitanicFeatureEngine().fit(df)
+    df = preprocess_data(df, engine)
 
     # Save cleaned dataset
     df.to_csv(output_path, index=False)
     print(f"\n✅ Cleaned dataset saved at: {output_path}")
+
+    # Save the binary column store
+    if store_dir is None:
+        store_dir = os.path.splitext(output_path)[0] + "_store"
+    write_feature_store(df, store_dir, engine=engine, source=input_path)
+    print(f"✅ Feature store saved at: {store_dir}")
+
+# -------------------------------------------------------
+# PREDICTIONS EXPORT FUNCTIONS
+# -------------------------------------------------------
+
+def build_predictions_table(results, y_test):
+    """
+    Assembles the long-format prediction table (one row per model and test passenger)
+    from already computed predictions using array operations only.
+
+    Parameters:
+    - results (dict): Model name → {"y_pred", "y_proba"} as returned by train_models().
+    - y_test (pd.Series): Actual target values indexed by passenger.
+
+    Returns:
+    - pd.DataFrame: PassengerIndex, ActualSurvived, PredictedSurvived, ProbabilitySurvived, Model.
+    """
+    model_names = list(results)
+    n_rows = len(y_test)
+
+    # Models without predict_proba contribute missing probabilities
+    probabilities = [
+        result["y_proba"] if result["y_proba"] is not None else np.full(n_rows, np.nan)
+        for result in results.values()
+    ]
+
+    return pd.DataFrame({
+        "PassengerIndex": np.tile(y_test.index.to_numpy(), len(model_names)),
+        "ActualSurvived": np.tile(y_test.to_numpy(), len(model_names)),
+        "PredictedSurvived": np.concatenate([result["y_pred"] for result in results.values()]),
+        "ProbabilitySurvived": np.concatenate(probabilities),
+        "Model": pd.Categorical.from_codes(np.repeat(np.arange(len(model_names)), n_rows), model_names),
+    })
+
+def build_attributions_table(attributions, results, y_test, features):
+    """
+    Assembles the per-passenger attribution table of the explained models,
+    one row per model and test passenger (matching the prediction table).
+
+    Parameters:
+    - attributions (dict): Model name → (expected value, rows × features attribution matrix).
+    - results (dict): Model name → {"y_proba"} as returned by train_models().
+    - y_test (pd.Series): Actual target values indexed by passenger.
+    - features (list): Feature names, in attribution-matrix column order.
+
+    Returns:
+    - pd.DataFrame: PassengerIndex, Model, BaseValue, ProbabilitySurvived and one attribution column per feature.
+    """
+    model_names = list(attributions)
+    n_rows = len(y_test)
+
+    table = pd.DataFrame({
+        "PassengerIndex": np.tile(y_test.index.to_numpy(), len(model_names)),
+        "Model": pd.Categorical.from_codes(np.repeat(np.arange(len(model_names)), n_rows), model_names),
+        "BaseValue": np.repeat([attributions[name][0] for name in model_names], n_rows),
+        "ProbabilitySurvived": np.concatenate([results[name]["y_proba"] for name in model_names]),
+    })
+    matrix = np.vstack([attributions[name][1] for name in model_names])
+    for j, feature in enumerate(features):
+        table[feature] = matrix[:, j]
+    return table
+
+def save_predictions(predictions_df, csv_path, parquet_path=None):
+    """
+    Saves the prediction table as CSV and, when a path is given, as columnar Parquet.
+    Parquet export requires pyarrow; it is skipped with a warning if unavailable.
+    """
+    predictions_df.to_csv(csv_path, index=False, na_rep="N/A")
+    print(f"Predictions saved to {csv_path}")
+
+    if parquet_path is not None:
+        try:
+            predictions_df.to_parquet(parquet_path, index=False)
+            print(f"Predictions saved to {parquet_path}")
+        except ImportError:
+            print("⚠️ pyarrow is not installed – skipping Parquet export (pip install pyarrow).")
@@ -9,12 +9,25 @@
 # 2. Scale numerical features
 # 3. Determine the optimal number of clusters using the Elbow Method
 # 4. Apply K-Means clustering and save results
+#
+# For files larger than memory, run the streaming mode
+# (see streaming_kmeans.py), which performs the same steps
+# chunk by chunk with Mini-Batch K-Means:
+#   python clustering.py --stream --chunksize 100000
 # ---------------------------------------------------
 
+import argparse
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
+from streaming_kmeans import stream_clustering
+
+parser = argparse.ArgumentParser(description="Cluster Titanic passengers with K-Means.")
+parser.add_argument("--stream", action="store_true",
+                    help="Stream the CSV in chunks with Mini-Batch K-Means (constant memory).")
+parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk in streaming mode.")
+args = parser.parse_args()
 
 # ---------------------------------------------------
 # 1️⃣ Load the Dataset
@@ -23,44 +36,57 @@ import matplotlib.pyplot as plt
 # Define file path to raw Titanic dataset
 file_path = r"C:\Users\antho\Documents\AI and ML Internship Projects\2_Unsupervised_Learning\data\raw\titanic.csv"
 
-# Load the dataset into a Pandas DataFrame
-df = pd.read_csv(file_path)
+# Define output file path
+output_path = r"C:\Users\antho\Documents\AI and ML Internship Projects\2_Unsupervised_Learning\results\output\titanic_clusters.csv"
 
-# ---------------------------------------------------
-# 2️⃣ Data Preprocessing
-# ---------------------------------------------------
+K_range = range(1, 11)  # Testing K values from 1 to 10
 
-# Convert categorical features to numerical
-df['Sex'] = df['Sex'].map({'male': 0, 'female': 1})
+# Choose the optimal number of clusters based on the Elbow Method
+optimal_k = 3  # Adjust based on the elbow plot results
 
-# Handle missing values
-df['Embarked'].fillna('S', inplace=True)  # Fill missing embarkation points with the most common port
-df['Embarked'] = df['Embarked'].map({'S': 0, 'C': 1, 'Q': 2})  # Convert embarkation ports to numeric values
-df['Age'].fillna(df['Age'].median(), inplace=True)  # Replace missing ages with the median
+if args.stream:
+    # Steps 1-6 in three passes over the file: scaler statistics, Mini-Batch
+    # K-Means training for every K, then streamed labels (and WCSS per K)
+    _, _, wcss = stream_clustering(file_path, output_path, k_range=K_range, optimal_k=optimal_k,
+                                   chunksize=args.chunksize)
+else:
+    # Load the dataset into a Pandas DataFrame
+    df = pd.read_csv(file_path)
 
-# Select relevant features for clustering
-df_cluster = df[['Pclass', 'Sex', 'Age', 'Fare', 'SibSp', 'Parch']]
+    # ---------------------------------------------------
+    # 2️⃣ Data Preprocessing
+    # ---------------------------------------------------
 
-# ---------------------------------------------------
-# 3️⃣ Feature Scaling
-# ---------------------------------------------------
+    # Convert categorical features to numerical
+    df['Sex'] = df['Sex'].map({'male': 0, 'female': 1})
 
-# Scale features to ensure all variables contribute equally to clustering
-scaler = StandardScaler()
-df_scaled = scaler.fit_transform(df_cluster)
+    # Handle missing values
+    df['Embarked'] = df['Embarked'].fillna('S')  # Fill missing embarkation points with the most common port
+    df['Embarked'] = df['Embarked'].map({'S': 0, 'C': 1, 'Q': 2})  # Convert embarkation ports to numeric values
+    df['Age'] = df['Age'].fillna(df['Age'].median())  # Replace missing ages with the median
 
-# ---------------------------------------------------
-# 4️⃣ Determine Optimal K (Elbow Method)
-# ---------------------------------------------------
+    # Select relevant features for clustering
+    df_cluster = df[['Pclass', 'Sex', 'Age', 'Fare', 'SibSp', 'Parch']]
 
-# Within-Cluster Sum of Squares (WCSS) to determine the best number of clusters
-wcss = []
-K_range = range(1, 11)  # Testing K values from 1 to 10
+    # ---------------------------------------------------
+    # 3️⃣ Feature Scaling
+    # ---------------------------------------------------
+
+    # Scale features to ensure all variables contribute equally to clustering
+    scaler = StandardScaler()
+    df_scaled = scaler.fit_transform(df_cluster)
 
-for k in K_range:
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-    kmeans.fit(df_scaled)
-    wcss.append(kmeans.inertia_)  # Store WCSS for each K
+    # ---------------------------------------------------
+    # 4️⃣ Determine Optimal K (Elbow Method)
+    # ---------------------------------------------------
+
+    # Within-Cluster Sum of Squares (WCSS) to determine the best number of clusters
+    wcss = []
+
+    for k in K_range:
+        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
+        kmeans.fit(df_scaled)
+        wcss.append(kmeans.inertia_)  # Store WCSS for each K
 
 # Plot the Elbow Graph
 plt.figure(figsize=(8, 5))
@@ -74,22 +100,18 @@ plt.show()
 # 5️⃣ Apply K-Means Clustering
 # ---------------------------------------------------
 
-# Choose the optimal number of clusters based on the Elbow Method
-optimal_k = 3  # Adjust based on the elbow plot results
-kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
-
-# Assign cluster labels to the dataset
-df_cluster['Cluster'] = kmeans.fit_predict(df_scaled)
+if not args.stream:
+    kmeans = KMeans(n_clusters=optimal_k, random_state=42, n_init=10)
 
-# ---------------------------------------------------
-# 6️⃣ Save the Clustered Results
-# ---------------------------------------------------
+    # Assign cluster labels to the dataset
+    df_cluster['Cluster'] = kmeans.fit_predict(df_scaled)
 
-# Define output file path
-output_path = r"C:\Users\antho\Documents\AI and ML Internship Projects\2_Unsupervised_Learning\results\output\titanic_clusters.csv"
+    # ---------------------------------------------------
+    # 6️⃣ Save the Clustered Results
+    # ---------------------------------------------------
 
-# Save the dataset with cluster assignments
-df_cluster.to_csv(output_path, index=False)
+    # Save the dataset with cluster assignments
+    df_cluster.to_csv(output_path, index=False)
 
 # Print confirmation message
 print(f"✅ Clustering complete. Results saved to: {output_path}")
@@ -0,0 +1,89 @@
+# ------------------------------------------------------------
+# Memoized K-Means / PCA Fits for the Visualization Suite
+# ------------------------------------------------------------
+# Several plots need the same fitted models: the elbow and
+# silhouette plots both fit K-Means for K = 2..9, and the PCA
+# plot refits K=3. FitCache fits each configuration once and
+# hands the same fitted model (and its labels) to every caller.
+#
+# Entries are keyed by a fingerprint of the data (SHA-256 of its
+# shape, dtype and values) plus the estimator parameters, so a
+# cached model is never reused for different data or settings.
+# The cache lives in memory for the duration of the script.
+# ------------------------------------------------------------
+
+import hashlib
+import json
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+
+from silhouette import silhouette
+
+# ------------------------------------------------------------
+# 📌 Cache Keys
+# ------------------------------------------------------------
+
+def fingerprint(X):
+    """
+    Computes a content hash of a data matrix (DataFrame or array).
+
+    Returns:
+    - str: Hex SHA-256 digest.
+    """
+    values = np.ascontiguousarray(np.asarray(X, dtype=np.float64))
+    digest = hashlib.sha256()
+    digest.update(json.dumps([values.shape, values.dtype.str]).encode())
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+# ------------------------------------------------------------
+# 📌 Cache Store
+# ------------------------------------------------------------
+
+class FitCache:
+    """
+    In-memory cache of fitted K-Means and PCA models and derived scores.
+
+    Every accessor fits on a miss and returns the stored result on a hit;
+    `fits` and `reused` count both, per kind of computation.
+    """
+
+    def __init__(self):
+        self._store = {}
+        self.fits = {}
+        self.reused = {}
+
+    def _get(self, kind, X, params, compute):
+        key = (kind, fingerprint(X), json.dumps(params, sort_keys=True))
+        if key in self._store:
+            self.reused[kind] = self.reused.get(kind, 0) + 1
+        else:
+            self._store[key] = compute()
+            self.fits[kind] = self.fits.get(kind, 0) + 1
+        return self._store[key]
+
+    def kmeans(self, X, k, random_state=42, n_init=10):
+        """Returns KMeans(n_clusters=k) fitted on X (labels in .labels_)."""
+        params = {"k": k, "random_state": random_state, "n_init": n_init}
+        return self._get("KMeans", X, params,
+                         lambda: KMeans(n_clusters=k, random_state=random_state, n_init=n_init).fit(X))
+
+    def pca(self, X, n_components=2):
+        """Returns (fitted PCA, X projected on its components)."""
+        def compute():
+            pca = PCA(n_components=n_components)
+            return pca, pca.fit_transform(X)
+        return self._get("PCA", X, {"n_components": n_components}, compute)
+
+    def silhouette(self, X, k, random_state=42, n_init=10):
+        """Returns the silhouette result (see silhouette.py) of the cached K-Means labels."""
+        params = {"k": k, "random_state": random_state, "n_init": n_init}
+        return self._get("Silhouette", X, params,
+                         lambda: silhouette(X, self.kmeans(X, k, random_state, n_init).labels_))
+
+    def summary(self):
+        """One-line description of fits performed and reused, per kind."""
+        return ", ".join(f"{kind}: {count} fitted / {self.reused.get(kind, 0)} reused"
+                         for kind, count in self.fits.items())
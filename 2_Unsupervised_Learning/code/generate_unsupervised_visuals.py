@@ -13,15 +13,17 @@
 # 5. Boxplots - Visualize distribution of key features
 #
 # All visualizations are saved in the 'results/plots/' directory.
+#
+# KMeans and PCA fits are shared between the plots through a
+# FitCache (fit_cache.py): each configuration is fitted once
+# (9 KMeans fits instead of 18).
 # ---------------------------------------------------
 
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-from sklearn.metrics import silhouette_score
 import pandas as pd
 import numpy as np
+from fit_cache import FitCache
 
 # ---------------------------------------------------
 # 1️⃣ Load the Dataset
@@ -38,8 +40,8 @@ df = pd.read_csv(file_path)
 # ---------------------------------------------------
 
 # Handle missing values
-df["Age"].fillna(df["Age"].median(), inplace=True)
-df["Fare"].fillna(df["Fare"].median(), inplace=True)
+df["Age"] = df["Age"].fillna(df["Age"].median())
+df["Fare"] = df["Fare"].fillna(df["Fare"].median())
 
 # Encode categorical variables
 df["Sex"] = df["Sex"].map({"male": 0, "female": 1})
@@ -53,6 +55,9 @@ X = df[features]
 # 3️⃣ Visualization Functions
 # ---------------------------------------------------
 
+# Fitted KMeans / PCA models shared by all plots
+fits = FitCache()
+
 # 📌 Elbow Method - Determine optimal K
 def plot_elbow_method(X):
     """
@@ -63,9 +68,7 @@ def plot_elbow_method(X):
     K_range = range(1, 10)
 
     for k in K_range:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        kmeans.fit(X)
-        distortions.append(kmeans.inertia_)
+        distortions.append(fits.kmeans(X, k).inertia_)
 
     plt.figure(figsize=(8, 6))
     plt.plot(K_range, distortions, marker='o', linestyle='-')
@@ -79,18 +82,20 @@ def plot_elbow_method(X):
 def plot_silhouette_score(X):
     """
     Generates a plot of Silhouette Scores for different values of K
-    to evaluate how well clusters are separated.
+    to evaluate how well clusters are separated. On large datasets the
+    scores are estimated from a sample and drawn with their 95% confidence band.
     """
-    silhouette_scores = []
+    scores = []
     K_range = range(2, 10)
 
     for k in K_range:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(X)
-        silhouette_scores.append(silhouette_score(X, labels))
+        scores.append(fits.silhouette(X, k))
 
     plt.figure(figsize=(8, 6))
-    plt.plot(K_range, silhouette_scores, marker='o', linestyle='-')
+    plt.plot(K_range, [score["score"] for score in scores], marker='o', linestyle='-')
+    if not all(score["exact"] for score in scores):
+        plt.fill_between(K_range, [score["ci_low"] for score in scores],
+                         [score["ci_high"] for score in scores], alpha=0.2)
     plt.xlabel('Number of Clusters (K)')
     plt.ylabel('Silhouette Score')
     plt.title('Silhouette Scores for Clustering')
@@ -103,10 +108,8 @@ def plot_pca_clusters(X):
     Reduces feature dimensions using PCA and visualizes clusters 
     in 2D space.
     """
-    kmeans = KMeans(n_clusters=3, random_state=42, n_init=10)
-    labels = kmeans.fit_predict(X)
-    pca = PCA(n_components=2)
-    X_pca = pca.fit_transform(X)
+    labels = fits.kmeans(X, 3).labels_
+    _, X_pca = fits.pca(X, n_components=2)
 
     plt.figure(figsize=(8, 6))
     sns.scatterplot(x=X_pca[:, 0], y=X_pca[:, 1], hue=labels, palette='viridis')
@@ -153,4 +156,5 @@ plot_boxplot(df, "Age")
 plot_boxplot(df, "Fare")
 
 # Print completion message
+print(f"♻️ Model fits – {fits.summary()}")
 print("✅ Unsupervised learning visualizations have been successfully generated! Check the 'results/plots' directory.")
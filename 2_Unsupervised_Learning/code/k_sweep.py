@@ -0,0 +1,208 @@
+# ------------------------------------------------------------
+# K-Means Sweep Engine for Choosing the Number of Clusters
+# ------------------------------------------------------------
+# Fits K-Means for every K of a range and scores each solution
+# with the silhouette score, in one of two modes:
+#
+# - Cold (default): every K is an independent
+#   KMeans(n_init=10) fit, exactly as before, but the K values
+#   are fitted and scored in parallel worker processes.
+# - Warm start: the smallest K is fitted cold, then each K is
+#   seeded from the (K-1) solution by splitting one of its worst
+#   clusters (largest within-cluster sum of squares) in two along
+#   its principal axis. The 3 worst clusters are tried, each with
+#   a single Lloyd run, and the lowest inertia wins: 3 cheap
+#   refinements per K instead of 10 full fits. The chain is
+#   sequential; the silhouette scoring still runs in parallel.
+#
+# Silhouette scores come from silhouette.py: exact and blockwise
+# up to max_exact_rows rows, a stratified estimate (with a
+# confidence interval) above.
+#
+# The data matrix is placed in shared memory once and every
+# worker attaches to the same block (share_array / attach_array
+# from 1_Supervised_Learning/code/parallel_training.py). Its
+# squared row norms are computed once per sweep and reused by the
+# cluster splits that seed each warm-started K. The KMeans fits
+# recompute them (one pass over the rows per fit): a NumPy Lloyd
+# loop that takes the norms measured ~3.5x slower per iteration
+# than sklearn's compiled one.
+# ------------------------------------------------------------
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+from silhouette import MAX_EXACT_ROWS, silhouette
+
+# Shared-memory helpers come from the supervised project (appended, so local modules take precedence)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "1_Supervised_Learning", "code"))
+from parallel_training import attach_array, share_array  # noqa: E402
+
+# ------------------------------------------------------------
+# 📌 Shared Memory
+# ------------------------------------------------------------
+
+# Data matrix of the current worker process
+_shared = {}
+
+def _init_worker(specs):
+    for key, spec in specs.items():
+        _shared[key] = attach_array(spec)
+
+# ------------------------------------------------------------
+# 📌 Fitting
+# ------------------------------------------------------------
+
+def fit_cold(X, k, n_init=10, random_state=42):
+    """
+    Fits K-Means from scratch with n_init k-means++ restarts (same as the original sweep).
+
+    Returns:
+    - KMeans: The fitted model.
+    """
+    return KMeans(n_clusters=k, random_state=random_state, n_init=n_init).fit(X)
+
+def split_centers(X, x_squared_norms, centers, labels, n_candidates=3):
+    """
+    Seeds (K+1)-center initializations from a K-cluster solution: for each of the
+    n_candidates clusters with the largest within-cluster sum of squares, that
+    cluster is replaced by two centers placed along its principal axis (at
+    ± sqrt(2/pi) standard deviations, the 2-means split of a Gaussian).
+
+    Returns:
+    - list: (K+1) × features initial center arrays, worst cluster first.
+    """
+    # Squared distance of every row to its center, from the shared norms: |x|² - 2x·c + |c|²
+    assigned = centers[labels]
+    distances = x_squared_norms - 2 * np.einsum("ij,ij->i", X, assigned) + np.einsum("ij,ij->i", assigned, assigned)
+    sse = np.bincount(labels, weights=np.maximum(distances, 0), minlength=len(centers))
+
+    seeds = []
+    for cluster in np.argsort(sse)[::-1][:n_candidates]:
+        members = X[labels == cluster]
+        if len(members) < 2:
+            # Degenerate cluster: open the new cluster at the worst-fitted row instead
+            seeds.append(np.vstack([centers, X[np.argmax(distances)]]))
+            continue
+        eigenvalues, eigenvectors = np.linalg.eigh(np.cov(members, rowvar=False))
+        offset = eigenvectors[:, -1] * np.sqrt(max(eigenvalues[-1], 0) * 2 / np.pi)
+        others = np.delete(centers, cluster, axis=0)
+        seeds.append(np.vstack([others, centers[cluster] + offset, centers[cluster] - offset]))
+    return seeds
+
+def fit_warm_chain(X, x_squared_norms, k_values, n_init=10, random_state=42, n_candidates=3):
+    """
+    Fits the smallest K cold, then every next K from the previous solution plus
+    one split: each candidate split is refined with a single Lloyd run and the
+    one with the lowest inertia is kept.
+
+    Returns:
+    - dict: K → (fitted KMeans, fit seconds).
+    """
+    fitted = {}
+    model = None
+    for k in range(min(k_values), max(k_values) + 1):
+        start = time.perf_counter()
+        if model is None:
+            model = fit_cold(X, k, n_init, random_state)
+        else:
+            candidates = [
+                KMeans(n_clusters=k, init=centers, n_init=1).fit(X)
+                for centers in split_centers(X, x_squared_norms, model.cluster_centers_, model.labels_, n_candidates)
+            ]
+            model = min(candidates, key=lambda candidate: candidate.inertia_)
+        fitted[k] = (model, time.perf_counter() - start)
+    return {k: fitted[k] for k in k_values}
+
+# ------------------------------------------------------------
+# 📌 Worker Tasks
+# ------------------------------------------------------------
+
+def _fit_and_score(k, n_init, random_state, scoring):
+    X = _shared["X"][1]
+    start = time.perf_counter()
+    model = fit_cold(X, k, n_init, random_state)
+    fit_seconds = time.perf_counter() - start
+    return k, model, fit_seconds, *_score(X, model.labels_, scoring)
+
+def _score_labels(labels, scoring):
+    return _score(_shared["X"][1], labels, scoring)
+
+def _score(X, labels, scoring):
+    start = time.perf_counter()
+    score = silhouette(X, labels, **scoring)
+    return score, time.perf_counter() - start
+
+# ------------------------------------------------------------
+# 📌 Public API
+# ------------------------------------------------------------
+
+def sweep_k(data, k_range, warm_start=False, n_init=10, n_jobs=None, random_state=42,
+            max_exact_rows=MAX_EXACT_ROWS, sample_size=10_000):
+    """
+    Fits and scores K-Means for every K in k_range.
+
+    Parameters:
+    - data (np.array): Scaled dataset for clustering.
+    - k_range (range): K values to test (K >= 2).
+    - warm_start (bool): Seed each K from the (K-1) solution plus one split.
+    - n_init (int): k-means++ restarts of every cold fit.
+    - n_jobs (int, optional): Worker processes (default: CPU count; 1 runs in-process).
+    - max_exact_rows (int): Largest dataset scored with the exact silhouette.
+    - sample_size (int): Rows sampled by the silhouette estimator above max_exact_rows.
+
+    Returns:
+    - list: One dict per K, in k_range order, with keys "k", "model", "inertia",
+      "silhouette", "silhouette_low", "silhouette_high" (confidence interval,
+      equal to the score when exact), "fit_seconds", "score_seconds".
+    """
+    k_values = list(k_range)
+    X = np.ascontiguousarray(data, dtype=np.float64)
+    norms = np.einsum("ij,ij->i", X, X)  # Squared row norms for split seeding only (KMeans.fit recomputes its own)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(k_values))
+
+    blocks, pool = {}, None
+    try:
+        if n_jobs > 1:
+            blocks = {"X": share_array(X)}
+            specs = {key: spec for key, (_, spec) in blocks.items()}
+            pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(specs,))
+        else:
+            _shared["X"] = (None, X)
+        # Parallel over K in the pool; otherwise the silhouette itself uses all cores
+        scoring = {"max_exact_rows": max_exact_rows, "sample_size": sample_size,
+                   "random_state": random_state, "n_jobs": 1 if pool else None}
+
+        if warm_start:
+            fitted = fit_warm_chain(X, norms, k_values, n_init, random_state)
+            labels = [fitted[k][0].labels_ for k in k_values]
+            if pool:
+                scores = list(pool.map(_score_labels, labels, [scoring] * len(labels)))
+            else:
+                scores = [_score_labels(lab, scoring) for lab in labels]
+            outcomes = [(k, fitted[k][0], fitted[k][1], *scores[i]) for i, k in enumerate(k_values)]
+        elif pool:
+            # Largest K first: those fits take longest
+            futures = [pool.submit(_fit_and_score, k, n_init, random_state, scoring) for k in reversed(k_values)]
+            outcomes = sorted((future.result() for future in futures), key=lambda outcome: outcome[0])
+        else:
+            outcomes = [_fit_and_score(k, n_init, random_state, scoring) for k in k_values]
+    finally:
+        if pool:
+            pool.shutdown()
+        _shared.clear()
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    return [
+        {"k": k, "model": model, "inertia": model.inertia_, "silhouette": score["score"],
+         "silhouette_low": score["ci_low"], "silhouette_high": score["ci_high"],
+         "fit_seconds": fit_seconds, "score_seconds": score_seconds}
+        for k, model, fit_seconds, score, score_seconds in outcomes
+    ]
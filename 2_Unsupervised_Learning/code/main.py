@@ -10,7 +10,8 @@
 # 3. Determine the optimal number of clusters using Silhouette Score
 # 4. Apply K-Means clustering and analyze results
 # 5. Reduce dimensions with PCA for visualization
-# 6. Save the clustered dataset
+# 6. Save the clustered dataset and the segment bundle used to
+#    assign new passengers (see segment_assignment.py)
 # ------------------------------------------------------------
 
 # 📌 Step 1: Import Required Libraries
@@ -22,7 +23,8 @@ import seaborn as sns
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
-from sklearn.metrics import silhouette_score
+from silhouette import silhouette  # Blockwise / sampled silhouette (bounded memory)
+from segment_assignment import SegmentBundle
 
 # ------------------------------------------------------------
 # 📌 Step 2: Load the Titanic Dataset
@@ -45,9 +47,10 @@ print(df.head())  # Preview first few rows
 # Drop non-numeric and irrelevant columns
 df.drop(columns=["Name", "Ticket", "Cabin"], inplace=True)
 
-# Handle missing values
-df["Age"] = df["Age"].fillna(df["Age"].median())  # Replace missing Age with median
-df["Fare"] = df["Fare"].fillna(df["Fare"].median())  # Replace missing Fare with median
+# Handle missing values (the fill values are saved with the segment bundle)
+fill_values = {"Age": df["Age"].median(), "Fare": df["Fare"].median()}
+df["Age"] = df["Age"].fillna(fill_values["Age"])  # Replace missing Age with median
+df["Fare"] = df["Fare"].fillna(fill_values["Fare"])  # Replace missing Fare with median
 df["Embarked"] = df["Embarked"].fillna(df["Embarked"].mode()[0])  # Fill missing Embarked with most common value
 
 # Encode categorical variables
@@ -58,6 +61,10 @@ df = pd.get_dummies(df, columns=["Embarked"], drop_first=True)  # One-hot encode
 features = ["Pclass", "Sex", "Age", "Fare", "SibSp", "Parch"]
 X = df[features]
 
+# Fill values for the other features, so incomplete new passengers can still be assigned:
+# most common class and (encoded) sex, no relatives aboard
+fill_values.update({"Pclass": int(df["Pclass"].mode()[0]), "Sex": int(df["Sex"].mode()[0]), "SibSp": 0, "Parch": 0})
+
 # Standardize Features to improve clustering performance
 scaler = StandardScaler()
 X_scaled = scaler.fit_transform(X)
@@ -77,9 +84,14 @@ best_score = -1  # Initial value for silhouette score comparison
 for k in range(2, 6):  # Evaluate K from 2 to 5 to find the most meaningful clusters
     kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
     labels = kmeans.fit_predict(X_scaled)
-    score = silhouette_score(X_scaled, labels)
+    result = silhouette(X_scaled, labels)  # Exact up to 50,000 rows, stratified estimate above
+    score = result["score"]
 
-    print(f"Tested K={k}, Silhouette Score={score:.2f}")
+    if result["exact"]:
+        print(f"Tested K={k}, Silhouette Score={score:.2f}")
+    else:
+        print(f"Tested K={k}, Silhouette Score≈{score:.2f} "
+              f"(95% CI {result['ci_low']:.3f}–{result['ci_high']:.3f}, {result['rows_scored']:,} rows sampled)")
 
     # Select the best K based on highest silhouette score
     if score > best_score:
@@ -104,7 +116,7 @@ print(df[["Pclass", "Sex", "Age", "Fare", "Cluster"]].head())  # Preview cluster
 # ------------------------------------------------------------
 
 # Compute silhouette score for final model
-sil_score = silhouette_score(X_scaled, df["Cluster"])
+sil_score = silhouette(X_scaled, df["Cluster"])["score"]
 print(f"\n✅ Final Silhouette Score: {sil_score:.2f} (Higher is better!)")
 
 # ------------------------------------------------------------
@@ -142,3 +154,8 @@ if not os.path.exists(output_path):
 df.to_csv(os.path.join(output_path, "titanic_clusters.csv"), index=False)
 
 print(f"\n✅ Clustered Data Successfully Saved: {output_path}/titanic_clusters.csv")
+
+# Save scaler + centroids so new passengers can be assigned without re-running this script
+bundle_path = os.path.join(output_path, "segment_bundle.joblib")
+SegmentBundle.from_fit(scaler, kmeans, features, fill_values).save(bundle_path)
+print(f"✅ Segment bundle saved: {bundle_path}")
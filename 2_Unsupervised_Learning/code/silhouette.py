@@ -0,0 +1,184 @@
+# ------------------------------------------------------------
+# Blockwise and Sampled Silhouette Scores
+# ------------------------------------------------------------
+# Drop-in replacement for sklearn's silhouette_score that never
+# builds the full n × n distance matrix:
+#
+# - Exact mode: the pairwise distances are computed one
+#   (block_size × block_size) tile at a time and immediately
+#   reduced to per-cluster distance sums, so memory stays at a
+#   few tiles per thread whatever the number of rows. Row blocks
+#   are processed by a thread pool (NumPy releases the GIL in the
+#   distance kernels), so all cores are used without spawning
+#   processes.
+# - Estimator mode: a stratified random sample of rows is drawn
+#   from every cluster (proportional allocation, with a minimum
+#   per cluster) and the silhouette of each sampled row is
+#   computed exactly against ALL rows. The mean silhouette is
+#   estimated per stratum and reported with a normal confidence
+#   interval. Cost grows linearly with the number of rows.
+#
+# silhouette() picks the exact mode up to max_exact_rows rows and
+# the estimator above it.
+# ------------------------------------------------------------
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+# Rows up to which silhouette() computes the exact score
+MAX_EXACT_ROWS = 50_000
+
+# ------------------------------------------------------------
+# 📌 Blockwise Kernel
+# ------------------------------------------------------------
+
+def _encode_labels(labels):
+    """Returns (cluster codes 0..K-1, rows per cluster); raises like sklearn for K outside 2..n-1."""
+    _, codes, counts = np.unique(np.asarray(labels), return_inverse=True, return_counts=True)
+    if not 2 <= len(counts) <= len(codes) - 1:
+        raise ValueError(f"Number of labels is {len(counts)}. Valid values are 2 to n_samples - 1 (inclusive)")
+    return codes.ravel(), counts
+
+def _cluster_distance_sums(X, norms, codes, n_clusters, rows, block_size):
+    """Sums of the distances from each of `rows` to every cluster (len(rows) × K), one tile at a time."""
+    X_rows = X[rows]
+    norms_rows = norms[rows]
+    sums = np.zeros((len(rows), n_clusters))
+    for start in range(0, len(X), block_size):
+        stop = min(start + block_size, len(X))
+        # Euclidean distances from the squared norms, |x|² + |y|² - 2x·y, updated in place
+        distances = X_rows @ X[start:stop].T
+        distances *= -2
+        distances += norms_rows[:, None]
+        distances += norms[None, start:stop]
+        np.sqrt(np.maximum(distances, 0, out=distances), out=distances)
+        members = (codes[start:stop][:, None] == np.arange(n_clusters)).astype(np.float64)
+        sums += distances @ members
+    return sums
+
+def _silhouette_of_rows(X, norms, codes, counts, rows, block_size):
+    """Silhouette values of `rows` (0 for rows of single-row clusters, as in sklearn)."""
+    sums = _cluster_distance_sums(X, norms, codes, len(counts), rows, block_size)
+    own = codes[rows]
+    own_size = counts[own]
+
+    # a: mean distance to the other rows of the own cluster (the row itself adds 0 to the sum)
+    a = sums[np.arange(len(rows)), own] / np.maximum(own_size - 1, 1)
+    # b: mean distance to the nearest other cluster
+    means = sums / counts
+    means[np.arange(len(rows)), own] = np.inf
+    b = means.min(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values = np.nan_to_num((b - a) / np.maximum(a, b))
+    values[own_size == 1] = 0.0
+    return values
+
+def silhouette_values(X, labels, rows=None, block_size=2048, n_jobs=None):
+    """
+    Computes the silhouette value of selected rows against the full dataset.
+
+    Parameters:
+    - X (np.array): Data matrix (n_samples × n_features).
+    - labels (array-like): Cluster label of every row.
+    - rows (array-like, optional): Row indices to score (default: all rows).
+    - block_size (int): Rows per distance tile; peak memory is about
+      block_size² × 8 bytes per thread.
+    - n_jobs (int, optional): Threads (default: CPU count).
+
+    Returns:
+    - np.array: Silhouette value of each requested row.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    codes, counts = _encode_labels(labels)
+    norms = np.einsum("ij,ij->i", X, X)
+    rows = np.arange(len(X)) if rows is None else np.asarray(rows)
+
+    blocks = [rows[start:start + block_size] for start in range(0, len(rows), block_size)]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(blocks))
+    if n_jobs <= 1:
+        parts = [_silhouette_of_rows(X, norms, codes, counts, block, block_size) for block in blocks]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(lambda block: _silhouette_of_rows(X, norms, codes, counts, block, block_size),
+                                  blocks))
+    return np.concatenate(parts) if parts else np.empty(0)
+
+# ------------------------------------------------------------
+# 📌 Public API
+# ------------------------------------------------------------
+
+def exact_silhouette(X, labels, block_size=2048, n_jobs=None):
+    """
+    Exact mean silhouette score (same value as sklearn's silhouette_score) in bounded memory.
+
+    Returns:
+    - float: Mean silhouette over all rows.
+    """
+    return float(silhouette_values(X, labels, block_size=block_size, n_jobs=n_jobs).mean())
+
+def estimate_silhouette(X, labels, sample_size=10_000, confidence=0.95, min_per_cluster=50,
+                        random_state=42, block_size=2048, n_jobs=None):
+    """
+    Estimates the mean silhouette score from a stratified per-cluster sample.
+
+    Parameters:
+    - X (np.array), labels (array-like): Data matrix and cluster labels.
+    - sample_size (int): Total rows to score (split across clusters by size).
+    - confidence (float): Coverage of the reported confidence interval.
+    - min_per_cluster (int): Minimum rows sampled from every cluster (all rows of smaller clusters).
+    - random_state (int): Seed of the row sampling.
+
+    Returns:
+    - dict: "score" (estimate), "ci_low", "ci_high", "std_error", "rows_scored".
+    """
+    codes, counts = _encode_labels(labels)
+    rng = np.random.default_rng(random_state)
+    weights = counts / counts.sum()
+    allocation = np.minimum(counts, np.maximum(np.round(weights * sample_size).astype(int), min_per_cluster))
+
+    # Stratified sample: allocation[c] rows drawn without replacement from cluster c
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    strata = [order[start + rng.choice(count, size=m, replace=False)]
+              for start, count, m in zip(starts, counts, allocation)]
+    values = silhouette_values(X, labels, rows=np.concatenate(strata), block_size=block_size, n_jobs=n_jobs)
+    values = np.split(values, np.cumsum(allocation)[:-1])
+
+    # Stratified mean and its variance (with finite-population correction)
+    score = sum(w * v.mean() for w, v in zip(weights, values))
+    variance = sum(
+        w ** 2 * (1 - m / n) * v.var(ddof=1) / m
+        for w, v, m, n in zip(weights, values, allocation, counts) if m > 1
+    )
+    std_error = float(np.sqrt(variance))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    return {
+        "score": float(score),
+        "ci_low": float(score - z * std_error),
+        "ci_high": float(score + z * std_error),
+        "std_error": std_error,
+        "rows_scored": int(allocation.sum()),
+    }
+
+def silhouette(X, labels, max_exact_rows=MAX_EXACT_ROWS, sample_size=10_000, confidence=0.95,
+               random_state=42, block_size=2048, n_jobs=None):
+    """
+    Silhouette score that stays usable on large datasets: exact up to
+    max_exact_rows rows, stratified estimate with a confidence interval above.
+
+    Returns:
+    - dict: "score", "ci_low", "ci_high" (equal to the score when exact),
+      "exact" (bool), "rows_scored".
+    """
+    if len(X) <= max_exact_rows:
+        score = exact_silhouette(X, labels, block_size=block_size, n_jobs=n_jobs)
+        return {"score": score, "ci_low": score, "ci_high": score, "exact": True, "rows_scored": len(X)}
+
+    estimate = estimate_silhouette(X, labels, sample_size=sample_size, confidence=confidence,
+                                   random_state=random_state, block_size=block_size, n_jobs=n_jobs)
+    return {"score": estimate["score"], "ci_low": estimate["ci_low"], "ci_high": estimate["ci_high"],
+            "exact": False, "rows_scored": estimate["rows_scored"]}
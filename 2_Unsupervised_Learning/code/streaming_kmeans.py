@@ -0,0 +1,214 @@
+# ---------------------------------------------------
+# Streaming Mini-Batch K-Means for Large Passenger Files
+# ---------------------------------------------------
+# Out-of-core version of clustering.py for CSV files that do
+# not fit in memory. The file is read in chunks, three times:
+#
+# 1. Scaler pass: per-feature count, mean and variance are
+#    merged chunk by chunk (Chan's parallel update), and the
+#    Age median used to fill missing ages is read off counts of
+#    the distinct ages seen.
+# 2. Training pass: every chunk is scaled, shuffled and fed in
+#    mini-batches to one MiniBatchKMeans per K, so all K values
+#    of the elbow curve train on the same read of the file.
+# 3. Labeling pass: each chunk is assigned to the clusters of
+#    the chosen K and appended to the output CSV; the WCSS of
+#    every K is summed on the way for the elbow plot.
+#
+# Only one chunk is in memory at a time, so memory use depends
+# on chunksize, not on the file size. Preprocessing matches
+# clustering.py (Sex → 0/1, missing Age → median).
+# ---------------------------------------------------
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+# Clustering features (same as clustering.py)
+FEATURES = ["Pclass", "Sex", "Age", "Fare", "SibSp", "Parch"]
+
+# Columns whose missing values are filled with the column median
+FILL_COLUMNS = ["Age"]
+
+# Rows of the first chunk used to seed the mini-batch centers
+SEED_ROWS = 10_000
+
+# ---------------------------------------------------
+# 📌 Chunked Input
+# ---------------------------------------------------
+
+def read_chunks(file_path, chunksize=100_000):
+    """Yields the clustering features of a passenger CSV in chunks of `chunksize` rows."""
+    for chunk in pd.read_csv(file_path, usecols=FEATURES, chunksize=chunksize):
+        chunk = chunk[FEATURES]
+        chunk["Sex"] = chunk["Sex"].map({"male": 0, "female": 1})
+        yield chunk
+
+# ---------------------------------------------------
+# 📌 Streaming Scaler
+# ---------------------------------------------------
+
+class StreamingScaler:
+    """
+    StandardScaler fitted chunk by chunk, with median imputation of FILL_COLUMNS.
+
+    partial_fit() merges each chunk's per-column count, mean and sum of squared
+    deviations into running totals (missing values are skipped), and counts the
+    distinct values of the fill columns. finalize() derives the medians and
+    adds the imputed values to the statistics, so transform() gives the same
+    result as filling the whole file and then running StandardScaler on it.
+    """
+
+    def __init__(self, columns=FEATURES, fill_columns=FILL_COLUMNS):
+        self.columns = list(columns)
+        self.fill_columns = list(fill_columns)
+        self.n_rows_ = 0
+        self.n_ = np.zeros(len(self.columns))
+        self.mean_ = np.zeros(len(self.columns))
+        self.m2_ = np.zeros(len(self.columns))
+        self.value_counts_ = {column: pd.Series(dtype=np.float64) for column in self.fill_columns}
+        self.fill_values_ = None
+        self.scale_ = None
+
+    def _merge(self, n, mean, m2):
+        """Chan et al. update of the running (count, mean, M2) with a batch's statistics."""
+        total = self.n_ + n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean_
+            self.mean_ = np.where(total > 0, self.mean_ + delta * n / total, 0.0)
+            self.m2_ = np.where(total > 0, self.m2_ + m2 + delta ** 2 * self.n_ * n / total, 0.0)
+        self.n_ = total
+
+    def partial_fit(self, chunk):
+        """Adds a chunk of (unscaled, unfilled) features to the statistics."""
+        values = chunk[self.columns].to_numpy(dtype=np.float64)
+        self.n_rows_ += len(values)
+        observed = ~np.isnan(values)
+        n = observed.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, np.nansum(values, axis=0) / n, 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self._merge(n, mean, m2)
+
+        for column in self.fill_columns:
+            counts = chunk[column].value_counts()
+            self.value_counts_[column] = self.value_counts_[column].add(counts, fill_value=0)
+        return self
+
+    def finalize(self):
+        """Computes the fill medians and the final mean / scale including the imputed values."""
+        self.fill_values_ = {}
+        for column in self.fill_columns:
+            counts = self.value_counts_[column].sort_index()
+            cumulative = counts.cumsum().to_numpy()
+            n = cumulative[-1]
+            # Middle value(s) of the sorted column, as in Series.median()
+            lower = counts.index[np.searchsorted(cumulative, (n - 1) // 2, side="right")]
+            upper = counts.index[np.searchsorted(cumulative, n // 2, side="right")]
+            self.fill_values_[column] = (lower + upper) / 2
+
+        # The filled values join the statistics as a batch of identical rows
+        missing = np.array([self.n_rows_ - n if column in self.fill_values_ else 0 for column, n in
+                            zip(self.columns, self.n_)])
+        fill = np.array([self.fill_values_.get(column, 0.0) for column in self.columns])
+        self._merge(missing, fill, np.zeros(len(self.columns)))
+
+        scale = np.sqrt(self.m2_ / self.n_)
+        self.scale_ = np.where(scale > 0, scale, 1.0)
+        return self
+
+    def fill(self, chunk):
+        """Returns the chunk with the fill columns imputed."""
+        return chunk.fillna(self.fill_values_)
+
+    def transform(self, chunk):
+        """Fills and standardizes a chunk; returns a float64 array."""
+        values = self.fill(chunk)[self.columns].to_numpy(dtype=np.float64)
+        return (values - self.mean_) / self.scale_
+
+# ---------------------------------------------------
+# 📌 Streaming Passes
+# ---------------------------------------------------
+
+def fit_scaler(file_path, chunksize=100_000):
+    """Pass 1: fits a StreamingScaler over all chunks of the file."""
+    scaler = StreamingScaler()
+    for chunk in read_chunks(file_path, chunksize):
+        scaler.partial_fit(chunk)
+    return scaler.finalize()
+
+def fit_minibatch(file_path, scaler, k_range, chunksize=100_000, batch_size=1024, n_epochs=1, random_state=42):
+    """
+    Pass 2: trains one MiniBatchKMeans per K on the streamed, scaled chunks.
+
+    The centers of each K are seeded from a full KMeans fit on the first
+    SEED_ROWS rows of the first chunk; every chunk is then shuffled and fed
+    to all models in mini-batches of batch_size rows.
+
+    Returns:
+    - dict: K → fitted MiniBatchKMeans.
+    """
+    rng = np.random.default_rng(random_state)
+    models = {}
+    for _ in range(n_epochs):
+        for chunk in read_chunks(file_path, chunksize):
+            X = scaler.transform(chunk)[rng.permutation(len(chunk))]
+            if not models:
+                seed = X[:SEED_ROWS]
+                for k in k_range:
+                    centers = KMeans(n_clusters=k, random_state=random_state, n_init=3).fit(seed).cluster_centers_
+                    models[k] = MiniBatchKMeans(n_clusters=k, init=centers, n_init=1, batch_size=batch_size,
+                                                compute_labels=False, random_state=random_state)
+            for start in range(0, len(X), batch_size):
+                batch = X[start:start + batch_size]
+                for model in models.values():
+                    model.partial_fit(batch)
+    return models
+
+def write_labels(file_path, output_path, scaler, models, optimal_k, chunksize=100_000):
+    """
+    Pass 3: appends every chunk with its cluster label (for optimal_k) to output_path.
+
+    Returns:
+    - list: WCSS of every model over the whole file, in models order.
+    """
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    wcss = {k: 0.0 for k in models}
+    with open(output_path, "w", newline="") as output:
+        for i, chunk in enumerate(read_chunks(file_path, chunksize)):
+            X = scaler.transform(chunk)
+            for k, model in models.items():
+                wcss[k] -= model.score(X)  # score() is the negative WCSS of the chunk
+            labeled = scaler.fill(chunk)
+            labeled["Cluster"] = models[optimal_k].predict(X)
+            labeled.to_csv(output, header=(i == 0), index=False)
+    return [wcss[k] for k in models]
+
+def stream_clustering(file_path, output_path, k_range=range(1, 11), optimal_k=3, chunksize=100_000,
+                      batch_size=1024, n_epochs=1, random_state=42):
+    """
+    Clusters a passenger CSV of any size in three streaming passes.
+
+    Parameters:
+    - file_path (str): Raw passenger CSV (titanic.csv columns).
+    - output_path (str): CSV written with the features and their Cluster label.
+    - k_range (range): K values trained for the elbow curve (must include optimal_k).
+    - optimal_k (int): K whose labels are written.
+    - chunksize (int): Rows read per chunk (bounds memory use).
+    - batch_size (int): Mini-batch size of the K-Means updates.
+    - n_epochs (int): Training passes over the file.
+
+    Returns:
+    - tuple: (fitted StreamingScaler, dict K → MiniBatchKMeans, list of WCSS per K).
+    """
+    scaler = fit_scaler(file_path, chunksize)
+    print(f"✅ Scaler pass completed ({scaler.n_rows_:,} rows, Age median {scaler.fill_values_['Age']:.1f}).")
+
+    models = fit_minibatch(file_path, scaler, k_range, chunksize, batch_size, n_epochs, random_state)
+    print(f"✅ Mini-batch K-Means trained for K={min(k_range)}..{max(k_range)}.")
+
+    wcss = write_labels(file_path, output_path, scaler, models, optimal_k, chunksize)
+    print(f"✅ Cluster labels (K={optimal_k}) streamed to: {output_path}")
+    return scaler, models, wcss
@@ -5,15 +5,17 @@
 # - Loading and preprocessing data
 # - Scaling features for clustering
 # - Determining the optimal number of clusters using Silhouette Scores
+#   (parallel / warm-started K sweep, see k_sweep.py)
 # - Reducing dimensions for visualization using PCA
 # ------------------------------------------------------------
 
 import pandas as pd
 import numpy as np
-from sklearn.metrics import silhouette_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
+
+from k_sweep import sweep_k
+from silhouette import MAX_EXACT_ROWS
 
 # ------------------------------------------------------------
 # 📌 Step 1: Load Dataset
@@ -91,32 +93,48 @@ def scale_features(df, feature_columns):
 # 📌 Step 4: Finding the Optimal Number of Clusters (K)
 # ------------------------------------------------------------
 
-def find_optimal_k(data, k_range):
+def find_optimal_k(data, k_range, warm_start=False, n_jobs=None, return_details=False,
+                   max_exact_rows=MAX_EXACT_ROWS, sample_size=10_000):
     """
     Determines the optimal number of clusters (K) using silhouette scores.
+    All K values are fitted and scored in parallel worker processes.
 
     Parameters:
     - data (np.array): Scaled dataset for clustering.
     - k_range (range): Range of K values to test.
+    - warm_start (bool): Seed each K from the (K-1) solution plus one cluster split
+      (a few single-run refinements per K instead of 10 restarts).
+    - n_jobs (int, optional): Worker processes (default: CPU count; 1 runs in-process).
+    - return_details (bool): Also return the per-K results.
+    - max_exact_rows (int): Above this many rows the silhouette score is estimated
+      from a stratified sample of sample_size rows (with a 95% confidence interval).
 
     Returns:
     - int: Optimal number of clusters.
+    - pd.DataFrame (only with return_details=True): K, silhouette score and interval,
+      inertia, fit and scoring time per K.
     """
+    results = sweep_k(data, k_range, warm_start=warm_start, n_jobs=n_jobs,
+                      max_exact_rows=max_exact_rows, sample_size=sample_size)
     best_k = None
     best_score = -1
 
-    for k in k_range:
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(data)
-        score = silhouette_score(data, labels)
-
-        print(f"🔍 Tested K={k}, Silhouette Score={score:.2f}")
+    for result in results:
+        k, score = result["k"], result["silhouette"]
+        interval = ""
+        if result["silhouette_low"] != result["silhouette_high"]:
+            interval = f" [{result['silhouette_low']:.3f}, {result['silhouette_high']:.3f}]"
+        print(f"🔍 Tested K={k}, Silhouette Score={score:.2f}{interval} "
+              f"(fit {result['fit_seconds']:.2f}s, score {result['score_seconds']:.2f}s)")
 
         if score > best_score:
             best_score = score
             best_k = k
 
     print(f"\n✅ Optimal K found: {best_k} with Silhouette Score: {best_score:.2f}")
+    if return_details:
+        details = pd.DataFrame(results).drop(columns="model")
+        return best_k, details
     return best_k
 
 # ------------------------------------------------------------